@@ -0,0 +1,82 @@
+import contextlib
+import io
+import time
+
+from benchmarks.common import report
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+SIZE = 100000
+
+# Each aggregate as a hand-written loop over get, and with the bulk builtins.
+# Both versions run on the same list, built by SETUP.
+SETUP = """
+(define l (list))
+(for i 0 {n} (set l (push (mod (* i 7919) 1000) l)))
+(define n (length l))
+"""
+
+PROGRAMS = [
+    ("sum", """
+(define total 0)
+(for i 0 n (set total (+ total (get l i))))
+(print total)
+""", """
+(print (sum l))
+"""),
+    ("max", """
+(define m 0)
+(for i 0 n (if (> (get l i) m) (set m (get l i)) 0))
+(print m)
+""", """
+(print (fold (lambda (m x) (if (> x m) x m)) 0 l))
+"""),
+    ("count", """
+(define c 0)
+(for i 0 n (if (< (get l i) 500) (set c (+ c 1)) 0))
+(print c)
+""", """
+(print (length (filter (lambda (x) (< x 500)) l)))
+"""),
+    ("element-wise add", """
+(define r (list))
+(for i 0 n (set r (push (+ (get l i) (get l i)) r)))
+(print (length (reverse r)))
+""", """
+(print (length (map + l l)))
+"""),
+    ("squares of a range", """
+(define r (list))
+(for i 0 n (set r (push (* i i) r)))
+(print (head r))
+""", """
+(print (head (reverse (map * (range n) (range n)))))
+"""),
+]
+
+
+def run(setup, program, repeat=3):
+    # Best time of `program` run after `setup`, which is not timed.
+    best = float("inf")
+    for _ in range(repeat):
+        interpreter = Interpreter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            interpreter.interpret(setup)
+            start = time.perf_counter()
+            interpreter.interpret(program)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    setup = Parser(Scanner(SETUP.format(n=SIZE))).parse()
+    for name, loop, bulk in PROGRAMS:
+        loop_time = run(setup, Parser(Scanner(loop)).parse())
+        bulk_time = run(setup, Parser(Scanner(bulk)).parse())
+        report(f"{name} of {SIZE}, Nelox loop", loop_time)
+        report(f"{name} of {SIZE}, bulk builtins", bulk_time, baseline=loop_time)
+
+
+if __name__ == "__main__":
+    main()
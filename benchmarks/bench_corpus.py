@@ -0,0 +1,53 @@
+import os
+import random
+import tempfile
+
+from benchmarks.common import best_of, report
+from dataset_generator.Fuzzer import save_dataset
+from nelox.corpus import CorpusReader, write_corpus
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+NUM_SAMPLES = 5000
+
+
+def parse_samples(directory):
+    programs = []
+    for i in range(NUM_SAMPLES):
+        with open(os.path.join(directory, f"sample_{i + 1}.txt")) as f:
+            programs.append(Parser(Scanner(f.read())).parse())
+    return programs
+
+
+def load_corpus(path):
+    with CorpusReader(path) as reader:
+        return [reader.expressions(i) for i in range(len(reader))]
+
+
+def load_flat(path):
+    with CorpusReader(path) as reader:
+        return list(reader)
+
+
+def main():
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as directory:
+        save_dataset(directory, NUM_SAMPLES)
+        path = os.path.join(directory, "corpus.bin")
+        write_corpus(path, parse_samples(directory))
+        text_size = sum(os.path.getsize(os.path.join(directory, f"sample_{i + 1}.txt"))
+                        for i in range(NUM_SAMPLES))
+        print(f"{NUM_SAMPLES} programs: {text_size} bytes of text, {os.path.getsize(path)} bytes of corpus")
+
+        baseline = best_of(lambda: parse_samples(directory), repeat=3)
+        report("re-parse .txt samples", baseline)
+        report("CorpusReader -> Expr", best_of(lambda: load_corpus(path), repeat=3), baseline)
+        report("CorpusReader -> FlatProgram", best_of(lambda: load_flat(path), repeat=3), baseline)
+
+        indices = [random.randrange(NUM_SAMPLES) for _ in range(1000)]
+        with CorpusReader(path) as reader:
+            report("1000 random programs", best_of(lambda: [reader.expressions(i) for i in indices]))
+
+
+if __name__ == "__main__":
+    main()
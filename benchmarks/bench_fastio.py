@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+
+from benchmarks.common import best_of, report
+from nelox.fastio import ConsoleIO, FastIO
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+LINES = 10 ** 5
+
+# Judge-style: a count, then one line of input and one of output per case.
+PROGRAM = """
+(define solve (lambda ()
+    (read-ints a b)
+    (print (+ a b))))
+(read-int n)
+(for i 0 n (solve))
+"""
+
+
+def judge_input(path):
+    lines = [str(LINES)] + [f"{i} {i * 3}" for i in range(LINES)]
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def run(program, input_path, io_class):
+    # Standard streams on files, as a judge runs programs: input() flushes
+    # stdout before each read, so every printed line is a write to the file.
+    original_stdin, original_stdout = sys.stdin, sys.stdout
+    with open(input_path) as stdin, open(os.devnull, "w") as stdout:
+        sys.stdin, sys.stdout = stdin, stdout
+        try:
+            Interpreter(io=io_class()).interpret(program)
+        finally:
+            sys.stdin, sys.stdout = original_stdin, original_stdout
+
+
+def run_io(input_path, io_class):
+    # The same reads and prints without the interpreter.
+    original_stdin, original_stdout = sys.stdin, sys.stdout
+    with open(input_path) as stdin, open(os.devnull, "w") as stdout:
+        sys.stdin, sys.stdout = stdin, stdout
+        try:
+            streams = io_class()
+            for _ in range(streams.read_int()):
+                a, b = streams.read_ints()
+                streams.print(a + b)
+            streams.flush()
+        finally:
+            sys.stdin, sys.stdout = original_stdin, original_stdout
+
+
+def main():
+    program = Parser(Scanner(PROGRAM)).parse()
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "input")
+        judge_input(input_path)
+        baseline = best_of(lambda: run(program, input_path, ConsoleIO), repeat=3)
+        report(f"{LINES} lines, input() and print()", baseline)
+        report(f"{LINES} lines, FastIO", best_of(lambda: run(program, input_path, FastIO), repeat=3),
+               baseline)
+        baseline = best_of(lambda: run_io(input_path, ConsoleIO), repeat=3)
+        report(f"{LINES} lines, I/O only, input() and print()", baseline)
+        report(f"{LINES} lines, I/O only, FastIO", best_of(lambda: run_io(input_path, FastIO), repeat=3),
+               baseline)
+
+
+if __name__ == "__main__":
+    main()
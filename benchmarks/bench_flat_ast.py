@@ -0,0 +1,34 @@
+import time
+import tracemalloc
+
+from benchmarks.common import fuzzer_corpus
+from nelox.flat_ast import flatten
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+
+def measure(name, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<24} {size / 2 ** 20:8.2f} MiB {elapsed * 1000:10.2f} ms (traced)")
+    return result
+
+
+def main():
+    sources = fuzzer_corpus()
+    print(f"{len(sources)} programs")
+    # Tokens are parsed outside the measurement so only the trees are counted.
+    tokens = [Scanner(source) for source in sources]
+    for scanner in tokens:
+        scanner.scan_tokens()
+    trees = measure("Expr trees", lambda: [Parser(scanner).parse() for scanner in tokens])
+    measure("FlatProgram per program", lambda: [flatten(exprs) for exprs in trees])
+    measure("one FlatProgram", lambda: flatten(exprs for program in trees for exprs in program))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import contextlib
+import io
+
+from benchmarks.common import best_of, fuzzer_corpus, report
+from nelox.compiler import CompilingInterpreter
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+from nelox.translator import TranslatingInterpreter
+
+LOOP_PROGRAM = """
+(func square (x) (* x x))
+(define total 0)
+(for i 0 200000 (set total (+ total (square (mod i 10)))))
+(print total)
+"""
+
+# A batch of fuzzer programs with a few that never stop.
+INFINITE_PROGRAMS = [
+    "(define i 0) (while true (set i (+ i 1)))",
+    "(func f (n) (f (+ n 1))) (f 0)",
+]
+BATCH_FUEL = 10 ** 5
+
+
+def run(interpreter_class, program, fuel=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            interpreter_class(fuel=fuel).interpret(program)
+        except Exception:
+            pass
+
+
+def main():
+    program = Parser(Scanner(LOOP_PROGRAM)).parse()
+    for interpreter_class in (Interpreter, CompilingInterpreter, TranslatingInterpreter):
+        name = interpreter_class.__name__
+        baseline = best_of(lambda: run(interpreter_class, program), repeat=3)
+        report(f"{name}, no fuel", baseline)
+        report(f"{name}, with fuel", best_of(lambda: run(interpreter_class, program, 10 ** 9), repeat=3),
+               baseline)
+
+    batch = [Parser(Scanner(source)).parse() for source in fuzzer_corpus(500)]
+    batch += [Parser(Scanner(source)).parse() for source in INFINITE_PROGRAMS] * 5
+
+    def run_batch():
+        for program in batch:
+            run(Interpreter, program, BATCH_FUEL)
+    report(f"{len(batch)} programs, {len(INFINITE_PROGRAMS) * 5} infinite, fuel {BATCH_FUEL}",
+           best_of(run_batch, repeat=1))
+
+
+if __name__ == "__main__":
+    main()
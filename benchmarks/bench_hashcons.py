@@ -0,0 +1,45 @@
+import random
+import tracemalloc
+
+from benchmarks.common import fuzzer_corpus
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.hashcons import HashConsFactory
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+NUM_PROGRAMS = 5000
+
+
+def measure(name, build):
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<36} {size / 2 ** 20:8.2f} MiB")
+    return size
+
+
+def generate(factory=None):
+    random.seed(0)
+    # The factory (and its table) is part of the result, so it is counted too.
+    return factory, [Fuzzer(factory).generate_program() for _ in range(NUM_PROGRAMS)]
+
+
+def parse(sources, factory=None):
+    return factory, [Parser(Scanner(source), factory).parse() for source in sources]
+
+
+def main():
+    print(f"{NUM_PROGRAMS} programs")
+    plain = measure("Fuzzer", generate)
+    shared = measure("Fuzzer + HashConsFactory", lambda: generate(HashConsFactory()))
+    print(f"{'reduction':<36} {1 - shared / plain:8.1%}")
+
+    sources = fuzzer_corpus(NUM_PROGRAMS)
+    plain = measure("Parser", lambda: parse(sources))
+    shared = measure("Parser + HashConsFactory", lambda: parse(sources, HashConsFactory()))
+    print(f"{'reduction':<36} {1 - shared / plain:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
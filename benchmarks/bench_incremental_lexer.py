@@ -0,0 +1,43 @@
+import random
+import time
+
+from benchmarks.common import fuzzer_corpus, report
+from nelox.fast_scanner import FastScanner
+from nelox.incremental_lexer import IncrementalLexer
+
+
+def main():
+    source = "\n".join(fuzzer_corpus(500))
+    print(f"source {len(source)} characters")
+    rng = random.Random(0)
+    edits = []
+    offset = len(source) // 2
+    for _ in range(200):
+        # Typing: a cursor that mostly moves forward and inserts characters.
+        offset = min(len(source), max(0, offset + rng.randint(-3, 6)))
+        edits.append((offset, 0, rng.choice(" ab1")))
+
+    lexer = IncrementalLexer(source)
+    start = time.perf_counter()
+    for offset, deleted, inserted in edits:
+        lexer.edit(offset, deleted, inserted)
+    incremental = (time.perf_counter() - start) / len(edits)
+
+    text = source
+    start = time.perf_counter()
+    for offset, deleted, inserted in edits[:20]:
+        text = text[:offset] + inserted + text[offset + deleted:]
+        FastScanner(text).scan_tokens()
+    full = (time.perf_counter() - start) / 20
+
+    report("full rescan per edit", full)
+    report("IncrementalLexer.edit", incremental, full)
+
+    start = time.perf_counter()
+    for c in "(define appended (+ 1 2))\n" * 20:
+        lexer.edit(len(lexer.source), 0, c)
+    report("append one character", (time.perf_counter() - start) / 540, full)
+
+
+if __name__ == "__main__":
+    main()
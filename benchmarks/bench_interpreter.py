@@ -0,0 +1,92 @@
+import contextlib
+import io
+import os
+import sys
+
+from benchmarks.common import fuzzer_corpus, best_of, report
+from nelox.compiler import CompilingInterpreter
+from nelox.interpreter import Interpreter
+from nelox.resolver import ResolvingInterpreter
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+from nelox.translator import TranslatingInterpreter
+
+CASES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "cases")
+
+LOOP_PROGRAM = """
+(define i 0)
+(define total 0)
+(while (< i 200000)
+    (if (= (mod i 3) 0)
+        (set total (+ total i))
+        (set total (- total 1)))
+    (set i (+ i 1)))
+(print total)
+"""
+
+CALL_PROGRAM = """
+(func fib (n)
+    (if (< n 2)
+        n
+        (+ (fib (- n 1)) (fib (- n 2)))))
+(print (fib 20))
+"""
+
+
+def parse(source):
+    return Parser(Scanner(source)).parse()
+
+
+def load_cases():
+    cases = []
+    for name in sorted(os.listdir(CASES_DIR)):
+        if name.endswith(".code"):
+            base = os.path.join(CASES_DIR, name[:-len(".code")])
+            with open(base + ".code") as f:
+                program = parse(f.read())
+            with open(base + ".input") as f:
+                cases.append((program, f.read()))
+    return cases
+
+
+def run(program, input_data="", interpreter_class=Interpreter):
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(input_data)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                interpreter_class().interpret(program)
+            except Exception:
+                # Fuzzer programs may fail at run time (a division by zero);
+                # that is a result like any other.
+                pass
+    finally:
+        sys.stdin = stdin
+
+
+def main():
+    cases = load_cases()
+    programs = [parse(source) for source in fuzzer_corpus(1000)]
+    loop = parse(LOOP_PROGRAM)
+    calls = parse(CALL_PROGRAM)
+
+    def run_cases(interpreter_class):
+        for _ in range(200):
+            for program, input_data in cases:
+                run(program, input_data, interpreter_class)
+
+    def run_fuzzer(interpreter_class):
+        for program in programs:
+            run(program, "", interpreter_class)
+
+    for interpreter_class in (Interpreter, CompilingInterpreter, ResolvingInterpreter,
+                              TranslatingInterpreter):
+        print(interpreter_class.__name__)
+        report("tests/cases x200", best_of(lambda: run_cases(interpreter_class)))
+        report("1000 fuzzer programs", best_of(lambda: run_fuzzer(interpreter_class)))
+        report("while loop, 200000 iterations",
+               best_of(lambda: run(loop, "", interpreter_class), repeat=3))
+        report("recursive fib 20", best_of(lambda: run(calls, "", interpreter_class), repeat=3))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import contextlib
+import io
+
+from benchmarks.common import best_of, report
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+ITERATIONS = 10 ** 6
+
+FOR_PROGRAM = """
+(define total 0)
+(for i 0 {n} (set total (+ total i)))
+(print total)
+"""
+
+# (length l) and (* k 3) do not change in the loop.
+WHILE_PROGRAM = """
+(define l (list 1 2 3 4 5))
+(define k 7)
+(define i 0)
+(define total 0)
+(while (< i (* (length l) {m}))
+    (set total (+ total (* k 3)))
+    (set i (+ i 1)))
+(print total)
+"""
+
+NESTED_PROGRAM = """
+(define total 0)
+(for i 0 1000 (for j 0 {inner} (set total (+ total (mod (* i j) 7)))))
+(print total)
+"""
+
+
+def run(program):
+    with contextlib.redirect_stdout(io.StringIO()):
+        Interpreter().interpret(program)
+
+
+def main():
+    programs = [
+        (f"for loop, {ITERATIONS} iterations", FOR_PROGRAM.format(n=ITERATIONS)),
+        (f"while loop with invariants, {ITERATIONS} iterations", WHILE_PROGRAM.format(m=ITERATIONS // 5)),
+        (f"nested for loops, {ITERATIONS} iterations", NESTED_PROGRAM.format(inner=ITERATIONS // 1000)),
+    ]
+    for name, source in programs:
+        program = Parser(Scanner(source)).parse()
+        report(name, best_of(lambda: run(program), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
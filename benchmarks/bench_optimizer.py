@@ -0,0 +1,58 @@
+import contextlib
+import io
+
+from benchmarks.common import fuzzer_corpus, best_of, report
+from nelox.flat_ast import flatten
+from nelox.interpreter import Interpreter
+from nelox.optimizer import optimize
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+NUM_PROGRAMS = 2000
+
+LOOP_PROGRAM = """
+(define limit (* 1000 200))
+(define step (- 3 2))
+(define i 0)
+(define total 0)
+(while (< i limit)
+    (if (> (* 4 5) (+ 10 5))
+        (set total (+ total (* 60 60)))
+        (set total 0))
+    (set i (+ i step)))
+(print total)
+"""
+
+
+def run_all(programs):
+    for program in programs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                Interpreter().interpret(program)
+            except Exception:
+                # Fuzzer programs may fail at run time; so do their optimized copies.
+                pass
+
+
+def node_count(programs):
+    return sum(len(flatten(program).kinds) for program in programs)
+
+
+def main():
+    programs = [Parser(Scanner(source)).parse() for source in fuzzer_corpus(NUM_PROGRAMS)]
+    optimized = [optimize(program) for program in programs]
+    print(f"nodes: {node_count(programs)} -> {node_count(optimized)}")
+    report(f"optimize {NUM_PROGRAMS} fuzzer programs",
+           best_of(lambda: [optimize(program) for program in programs]))
+    baseline = best_of(lambda: run_all(programs))
+    report(f"run {NUM_PROGRAMS} fuzzer programs", baseline)
+    report(f"run {NUM_PROGRAMS} optimized programs", best_of(lambda: run_all(optimized)), baseline)
+
+    loop = Parser(Scanner(LOOP_PROGRAM)).parse()
+    baseline = best_of(lambda: run_all([loop]), repeat=3)
+    report("while loop with constant expressions", baseline)
+    report("optimized while loop", best_of(lambda: run_all([optimize(loop)]), repeat=3), baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+from benchmarks.common import fuzzer_corpus, best_of, report
+from nelox.parse_cache import ParseCache
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+CASES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "cases")
+
+
+def load_sources():
+    sources = []
+    for name in sorted(os.listdir(CASES_DIR)):
+        if name.endswith(".code"):
+            with open(os.path.join(CASES_DIR, name)) as f:
+                sources.append(f.read())
+    return sources
+
+
+def main():
+    # Ten rounds over the test cases plus 500 sampled programs that repeat,
+    # like identical model outputs across sampling rounds.
+    sources = load_sources() * 10 + fuzzer_corpus(100) * 5
+
+    def uncached():
+        for source in sources:
+            Parser(Scanner(source)).parse()
+
+    def cached(cache):
+        for source in sources:
+            cache.parse(source)
+
+    baseline = best_of(uncached)
+    report(f"Scanner + Parser, {len(sources)} sources", baseline)
+    report("ParseCache, cold", best_of(lambda: cached(ParseCache())), baseline)
+    warm = ParseCache(maxsize=1024)
+    cached(warm)
+    report("ParseCache, warm", best_of(lambda: cached(warm)), baseline)
+    with tempfile.TemporaryDirectory() as directory:
+        cached(ParseCache(directory=directory))
+        report("ParseCache, disk tier only", best_of(lambda: cached(ParseCache(0, directory))), baseline)
+    print(warm.cache_info())
+
+
+if __name__ == "__main__":
+    main()
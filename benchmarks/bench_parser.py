@@ -0,0 +1,45 @@
+import sys
+
+from benchmarks.common import fuzzer_corpus, best_of, report
+from nelox.fast_scanner import FastScanner
+from nelox.parser import Parser, IterativeParser
+
+
+def scanned(source):
+    scanner = FastScanner(source)
+    scanner.scan_tokens()
+    return scanner
+
+
+def parse_scanned(parser_class, scanner):
+    # Parse tokens scanned up front, so only parsing is timed.
+    scanner.token_index = 0
+    parser = parser_class.__new__(parser_class)
+    parser.scanner = scanner
+    return parser.parse()
+
+
+def compare(name, scanners, repeat=5):
+    def run(parser_class):
+        for scanner in scanners:
+            parse_scanned(parser_class, scanner)
+
+    try:
+        baseline = best_of(lambda: run(Parser), repeat)
+        report(f"{name}: Parser", baseline)
+    except RecursionError:
+        baseline = None
+        print(f"{name + ': Parser':<44} RecursionError")
+    report(f"{name}: IterativeParser", best_of(lambda: run(IterativeParser), repeat), baseline)
+
+
+def main():
+    print(f"recursion limit {sys.getrecursionlimit()}")
+    compare("fuzzer corpus", [scanned(source) for source in fuzzer_corpus()])
+    for depth in (300, 100000):
+        compare(f"depth {depth}", [scanned("(f " * depth + "1" + ")" * depth)], repeat=3)
+        compare(f"depth {depth} (empty lists)", [scanned("(" * depth + ")" * depth)], repeat=3)
+
+
+if __name__ == "__main__":
+    main()
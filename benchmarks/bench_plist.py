@@ -0,0 +1,35 @@
+import contextlib
+import io
+
+from benchmarks.common import best_of, report
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+SIZES = (1000, 10000, 50000)
+
+# Idiomatic list processing: build with push, consume with head/tail.
+PROGRAM = """
+(define l (list))
+(for i 0 {size} (set l (push i l)))
+(define total 0)
+(while (not (empty? l))
+    (set total (+ total (head l)))
+    (set l (tail l)))
+(print total)
+"""
+
+
+def run(program):
+    with contextlib.redirect_stdout(io.StringIO()):
+        Interpreter().interpret(program)
+
+
+def main():
+    for size in SIZES:
+        program = Parser(Scanner(PROGRAM.format(size=size))).parse()
+        report(f"push/head/tail over {size} elements", best_of(lambda: run(program), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import contextlib
+import io
+
+from benchmarks.common import best_of, report
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.profiler import ProfilingInterpreter
+from nelox.scanner import Scanner
+
+PROGRAM = """
+(func fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))
+(define l (list))
+(for i 0 20000 (set l (push (mod (* i 7) 10) l)))
+(print (fib 18) (length l))
+"""
+
+
+def run(interpreter_class, program):
+    interpreter = interpreter_class()
+    with contextlib.redirect_stdout(io.StringIO()):
+        interpreter.interpret(program)
+    return interpreter
+
+
+def main():
+    program = Parser(Scanner(PROGRAM)).parse()
+    baseline = best_of(lambda: run(Interpreter, program), repeat=3)
+    report("Interpreter", baseline)
+    report("ProfilingInterpreter", best_of(lambda: run(ProfilingInterpreter, program), repeat=3), baseline)
+    print()
+    print(run(ProfilingInterpreter, program).report(limit=5), end="")
+
+
+if __name__ == "__main__":
+    main()
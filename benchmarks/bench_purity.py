@@ -0,0 +1,53 @@
+import contextlib
+import io
+
+from benchmarks.common import fuzzer_corpus, best_of, report
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.purity import MemoizingInterpreter
+from nelox.scanner import Scanner
+
+FIB_PROGRAM = """
+(func fib (n)
+    (if (< n 2)
+        n
+        (+ (fib (- n 1)) (fib (- n 2)))))
+(print (fib 22))
+"""
+
+# Counts lattice paths; exponential without memoization.
+PATHS_PROGRAM = """
+(func paths (r c)
+    (if (or (= r 0) (= c 0))
+        1
+        (+ (paths (- r 1) c) (paths r (- c 1)))))
+(print (paths 10 10))
+"""
+
+
+def run(programs, interpreter_class):
+    for program in programs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                interpreter_class().interpret(program)
+            except Exception:
+                # Fuzzer programs may fail at run time.
+                pass
+
+
+def main():
+    for name, source in (("fib 22", FIB_PROGRAM), ("lattice paths 10x10", PATHS_PROGRAM)):
+        program = [Parser(Scanner(source)).parse()]
+        baseline = best_of(lambda: run(program, Interpreter), repeat=3)
+        report(name, baseline)
+        report(f"{name}, memoized", best_of(lambda: run(program, MemoizingInterpreter)), baseline)
+
+    # Programs without anything to memoize only pay for the analysis.
+    programs = [Parser(Scanner(source)).parse() for source in fuzzer_corpus(1000)]
+    baseline = best_of(lambda: run(programs, Interpreter))
+    report("1000 fuzzer programs", baseline)
+    report("1000 fuzzer programs, memoizing", best_of(lambda: run(programs, MemoizingInterpreter)), baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+from benchmarks.common import fuzzer_corpus, best_of, report
+from nelox.fast_scanner import FastScanner
+from nelox.scanner import Scanner
+
+
+def scan_corpus(scanner_class, corpus):
+    for source in corpus:
+        scanner_class(source).scan_tokens()
+
+
+def main():
+    corpus = fuzzer_corpus()
+    print(f"{len(corpus)} programs, {sum(map(len, corpus))} characters")
+
+    baseline = best_of(lambda: scan_corpus(Scanner, corpus))
+    report("Scanner", baseline)
+    report("FastScanner", best_of(lambda: scan_corpus(FastScanner, corpus)), baseline)
+
+    joined = "\n".join(corpus)
+    baseline = best_of(lambda: Scanner(joined).scan_tokens())
+    report("Scanner (one source)", baseline)
+    report("FastScanner (one source)", best_of(lambda: FastScanner(joined).scan_tokens()), baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import contextlib
+import io
+from collections import Counter
+
+from benchmarks.common import best_of, fuzzer_corpus, report
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+from nelox.specializer import Specializer, SpecializingInterpreter
+from nelox.symbols import symbol_name
+
+PROGRAM = """
+(define total 0)
+(define s "")
+(for i 0 100000 (set total (+ total (mod (* i i) 7))))
+(for i 0 2000 (if (< (mod i 3) 1) (set s (+ s "a")) (set s s)))
+(print total (< s "b"))
+"""
+
+
+def run(interpreter_class, program):
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            interpreter_class().interpret(program)
+        except Exception:
+            pass
+
+
+def main():
+    calls, specialized = Counter(), Counter()
+    for source in fuzzer_corpus(1000):
+        program = Parser(Scanner(source)).parse()
+        specializer = Specializer(program)
+        specializer.specialize_program(program)
+        calls.update(specializer.calls)
+        specialized.update(specializer.specialized)
+    print(f"fuzzer corpus: {sum(specialized.values())} of {sum(calls.values())} call sites specialized")
+    for symbol, count in calls.most_common():
+        print(f"  {symbol_name(symbol):<6} {specialized[symbol]:>6} of {count:>6}")
+    print()
+
+    program = Parser(Scanner(PROGRAM)).parse()
+    baseline = best_of(lambda: run(Interpreter, program), repeat=3)
+    report("Interpreter", baseline)
+    report("SpecializingInterpreter", best_of(lambda: run(SpecializingInterpreter, program), repeat=3), baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import mmap
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import fuzzer_corpus
+from nelox.fast_scanner import FastScanner
+from nelox.stream_scanner import stream_tokens
+
+
+def measure(name, fn):
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<24} {count:>9} tokens {elapsed * 1000:10.2f} ms   peak {peak / 2 ** 20:8.2f} MiB")
+
+
+def main():
+    corpus = fuzzer_corpus(2000)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dump.txt")
+        with open(path, "w") as f:
+            for _ in range(5):
+                f.write("\n".join(corpus))
+                f.write("\n")
+        print(f"dump size {os.path.getsize(path) / 2 ** 20:.2f} MiB")
+
+        def whole_file():
+            with open(path) as f:
+                return len(FastScanner(f.read()).scan_tokens())
+
+        def streamed_text():
+            with open(path) as f:
+                return sum(1 for _ in stream_tokens(f))
+
+        def streamed_mmap():
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return sum(1 for _ in stream_tokens(mm))
+
+        measure("FastScanner(f.read())", whole_file)
+        measure("stream_tokens(file)", streamed_text)
+        measure("stream_tokens(mmap)", streamed_mmap)
+
+
+if __name__ == "__main__":
+    main()
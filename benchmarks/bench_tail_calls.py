@@ -0,0 +1,44 @@
+from benchmarks.common import best_of, report
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+DEPTHS = (1000, 10000, 100000)
+
+LOOP_PROGRAM = """
+(func sum-to (n acc)
+    (if (= n 0)
+        acc
+        (sum-to (- n 1) (+ acc n))))
+(sum-to {depth} 0)
+"""
+
+MUTUAL_PROGRAM = """
+(func even? (n) (if (= n 0) true (odd? (- n 1))))
+(func odd? (n) (if (= n 0) false (even? (- n 1))))
+(even? {depth})
+"""
+
+# Not a tail call: must still work, and not get slower, below the stack limit.
+COUNT_PROGRAM = """
+(func count (n) (if (= n 0) 0 (+ 1 (count (- n 1)))))
+(count 150)
+"""
+
+
+def run(source):
+    Interpreter().interpret(Parser(Scanner(source)).parse())
+
+
+def main():
+    for depth in DEPTHS:
+        loop = LOOP_PROGRAM.format(depth=depth)
+        mutual = MUTUAL_PROGRAM.format(depth=depth)
+        report(f"tail-recursive sum-to, depth {depth}", best_of(lambda: run(loop), repeat=3))
+        report(f"mutual recursion, depth {depth}", best_of(lambda: run(mutual), repeat=3))
+    report("non-tail recursion, depth 150 x100",
+           best_of(lambda: [run(COUNT_PROGRAM) for _ in range(100)]))
+
+
+if __name__ == "__main__":
+    main()
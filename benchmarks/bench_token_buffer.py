@@ -0,0 +1,32 @@
+import time
+import tracemalloc
+
+from benchmarks.common import fuzzer_corpus
+from nelox.fast_scanner import FastScanner
+from nelox.scanner import Scanner
+from nelox.token_buffer import TokenBuffer
+
+
+def measure(name, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<24} {len(tokens):>8} tokens {size / 2 ** 20:8.2f} MiB "
+          f"{size / len(tokens):8.1f} B/token {elapsed * 1000:10.2f} ms (traced)")
+    return tokens
+
+
+def main():
+    source = "\n".join(fuzzer_corpus())
+    print(f"source {len(source)} characters")
+    # Keep each result alive until it has been measured.
+    measure("Scanner: List[Token]", lambda: Scanner(source).scan_tokens())
+    measure("FastScanner: List[Token]", lambda: FastScanner(source).scan_tokens())
+    measure("TokenBuffer", lambda: TokenBuffer(source).scan_tokens())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import random
+import time
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.pretty_printer import pretty_program
+
+
+def fuzzer_corpus(num_programs=5000, seed=0):
+    random.seed(seed)
+    return [pretty_program(Fuzzer().generate_program()) for _ in range(num_programs)]
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name, seconds, baseline=None):
+    line = f"{name:<44} {seconds * 1000:10.2f} ms"
+    if baseline is not None:
+        line += f"   x{baseline / seconds:.2f}"
+    print(line)
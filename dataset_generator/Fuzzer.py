@@ -2,7 +2,8 @@ import random
 import os
 
 from typing import Union
-from nelox.Expr import Variable, Literal, List
+from nelox.Expr import Variable, List
+from nelox.hashcons import NodeFactory
 from nelox.nelox_token import Token
 from nelox.token_type import TokenType
 from dataset_generator.EnvStack import EnvStack
@@ -33,7 +34,9 @@ def make_var_token(name):
     return make_token(TokenType.IDENTIFIER, name)
 
 class Fuzzer:
-    def __init__(self):
+    def __init__(self, factory: NodeFactory = None):
+        # Pass a HashConsFactory to share identical subtrees between programs.
+        self.factory = factory if factory is not None else NodeFactory()
         # An expression is a construct evaluated to yield a value
         # A statement is a construct denoting a complete instruction for execution
         # Expression returns a value while statements performs actions and are not themselves values
@@ -69,12 +72,12 @@ class Fuzzer:
         vars_available = self.env.all_vars()
         if depth >= 1 or (vars_available and random.random() < 0.5):
             return random.choice(
-                [Variable(make_var_token(v)) for v in vars_available] +
-                [Literal(n) for n in nums]
+                [self.factory.variable(make_var_token(v)) for v in vars_available] +
+                [self.factory.literal(n) for n in nums]
             )
         op = random.choice(ops)
-        return List([
-            Variable(make_op_token(op)),
+        return self.factory.list([
+            self.factory.variable(make_op_token(op)),
             self.generate_expr(depth + 1),
             self.generate_expr(depth + 1)
         ])
@@ -83,31 +86,31 @@ class Fuzzer:
     def var_replacer(self,expr, var_name):
         if isinstance(expr, Variable):
             if expr.name.lexeme == var_name:
-                return Literal(random.choice(nums))
+                return self.factory.literal(random.choice(nums))
             return expr
         if isinstance(expr, List):
-            return List([self.var_replacer(e, var_name) for e in expr.elements])
+            return self.factory.list([self.var_replacer(e, var_name) for e in expr.elements])
         return expr
 
     def generate_define(self) ->List:
         var = self.fresh_var()
         expr = self.generate_expr()
         expr = self.var_replacer(expr, var)
-        return List([
-            Variable(make_var_token("define")),
-            Variable(make_var_token(var)),
+        return self.factory.list([
+            self.factory.variable(make_var_token("define")),
+            self.factory.variable(make_var_token(var)),
             expr
         ])
 
 
     def generate_print(self) -> Union[List, None]:
         if not self.env.all_vars():
-            return List([
-            Variable(make_var_token("print")),
-            Literal(random.choice(nums))
+            return self.factory.list([
+            self.factory.variable(make_var_token("print")),
+            self.factory.literal(random.choice(nums))
         ])
-        return List([
-            Variable(make_var_token("print")),
+        return self.factory.list([
+            self.factory.variable(make_var_token("print")),
             self.generate_expr()
         ])
 
@@ -120,10 +123,10 @@ class Fuzzer:
         self.env.set_var(param)
         body = [self.generate_statement(self.func_statements) for _ in range(num_statements)]
         self.env.pop()
-        return List([
-            Variable(make_var_token("func")),
-            Variable(make_var_token(func_name)),
-            List([Variable(make_var_token(param))]),
+        return self.factory.list([
+            self.factory.variable(make_var_token("func")),
+            self.factory.variable(make_var_token(func_name)),
+            self.factory.list([self.factory.variable(make_var_token(param))]),
             *body
         ])
 
@@ -133,15 +136,15 @@ class Fuzzer:
             return self.generate_func()
         arg = self.generate_expr()
         func_name = random.choice(funcs_available)
-        return List([
-            Variable(make_var_token(func_name)),
+        return self.factory.list([
+            self.factory.variable(make_var_token(func_name)),
             arg
         ])
 
     def choose_var_or_expr(self):
         vars_available = list(self.env.current_env())
         if vars_available:
-            return Variable(make_var_token(random.choice(vars_available)))
+            return self.factory.variable(make_var_token(random.choice(vars_available)))
         else:
             return self.generate_expr()
 
@@ -149,8 +152,8 @@ class Fuzzer:
         cond_op = random.choice(conditions)
         expr = self.generate_expr()
         arg = self.choose_var_or_expr()
-        return List([
-            Variable(make_var_token(cond_op)),
+        return self.factory.list([
+            self.factory.variable(make_var_token(cond_op)),
             arg,
             expr
         ])
@@ -168,8 +171,8 @@ class Fuzzer:
         cond = self.generate_condition()
         body_true = self.generate_body(depth-1)
         body_false = self.generate_body(depth-1)
-        return List([
-            Variable(make_var_token("if")),
+        return self.factory.list([
+            self.factory.variable(make_var_token("if")),
             cond,
             body_true,
             body_false
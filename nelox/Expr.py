@@ -1,3 +1,6 @@
+from nelox.symbols import intern
+
+
 class Expr:
     def accept(self, visitor):
         raise NotImplementedError()
@@ -25,6 +28,7 @@ class Literal(Expr):
 class Variable(Expr):
     def __init__(self, name):
         self.name = name
+        self.symbol = intern(name.lexeme)
 
     def accept(self, visitor):
         return visitor.visit_Variable_Expr(self)
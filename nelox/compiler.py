@@ -0,0 +1,285 @@
+from nelox.Expr import Literal, Variable, List
+from nelox.interpreter import (Interpreter, Environment, Hoisted, Specialized, FUNC, DEFINE, SET,
+                               IF, LAMBDA, WHILE, AND, OR, HEAD, TAIL, APPEND, REVERSE, PUSH,
+                               EMPTY, FOR,
+                               _head, _tail, _append, _reverse, _push, _empty)
+from nelox.symbols import symbol_name
+
+REPEATED_FORMS = frozenset({WHILE, FOR, FUNC, LAMBDA})
+
+
+class CompilingInterpreter(Interpreter):
+    """Interpreter that turns loops and functions into Python closures once.
+
+    A compiled node is a function of the environment, so executing it again
+    (a loop body, a function called many times) skips the type checks and
+    special-form dispatch of `Interpreter.evaluate`. Results and errors are
+    the same as the tree walker's: a form whose shape the compiler does not
+    expect (missing arguments, a literal where a name should be) is compiled
+    into a call to the tree walker, which then fails or succeeds exactly as
+    it would have. Compiled functions do not eliminate tail calls, so deep
+    tail recursion that the tree walker runs raises RecursionError here.
+    """
+
+    def __init__(self, io=None, fuel=None):
+        super().__init__(io, fuel)
+        self.compiled = {}
+
+    def evaluate(self, expr, env):
+        # Only code that can run repeatedly is worth compiling: loops and
+        # function definitions. Everything else is walked once as before.
+        if isinstance(expr, List) and expr.elements:
+            head = expr.elements[0]
+            if isinstance(head, Variable) and head.symbol in REPEATED_FORMS:
+                return self.compile(expr)(env)
+        return Interpreter.evaluate(self, expr, env)
+
+    def compile(self, expr):
+        # Caches the loops and definitions reached by evaluate, keyed by
+        # identity; the node is kept alive so its id is not reused.
+        entry = self.compiled.get(id(expr))
+        if entry is None:
+            entry = self.compiled[id(expr)] = (expr, self.compile_node(expr))
+        return entry[1]
+
+    def compile_node(self, expr):
+        if isinstance(expr, Literal):
+            value = expr.value
+            return lambda env: value
+
+        elif isinstance(expr, Variable):
+            return self.compile_variable(expr.symbol)
+
+        elif isinstance(expr, List):
+            if not expr.elements:
+                return lambda env: None
+
+            head = expr.elements[0]
+            args = expr.elements[1:]
+
+            if isinstance(head, Variable):
+                compiler = COMPILERS.get(head.symbol)
+                if compiler is not None:
+                    try:
+                        return compiler(self, args)
+                    except (IndexError, AttributeError):
+                        return self.compile_tree_walk(expr)
+                special_form = self.special_forms.get(head.symbol)
+                if special_form is not None:
+                    return lambda env: special_form(args, env)
+
+            return self.compile_call(head, args)
+
+        elif isinstance(expr, (Hoisted, Specialized)):
+            # Part of a loop the tree walker is running with hoisted
+            # invariants, or of a program SpecializingInterpreter rewrote.
+            return self.compile_tree_walk(expr)
+
+        else:
+            raise RuntimeError("Unknown expression type")
+
+    def compile_tree_walk(self, expr):
+        return lambda env: Interpreter.evaluate(self, expr, env)
+
+    def metered(self, code):
+        # `code`, using a unit of fuel each time it runs if there is fuel.
+        if self.fuel is None:
+            return code
+        burn = self.burn
+
+        def metered_code(env):
+            burn()
+            return code(env)
+        return metered_code
+
+    def compile_variable(self, symbol):
+        def variable(env):
+            while env is not None:
+                values = env.values
+                if symbol in values:
+                    return values[symbol]
+                env = env.parent
+            raise RuntimeError(f"Undefined variable '{symbol_name(symbol)}'")
+        return variable
+
+    def compile_call(self, head, args):
+        function = self.compile_node(head)
+        arguments = [self.compile_node(arg) for arg in args]
+        if len(arguments) == 0:
+            return lambda env: function(env)()
+        if len(arguments) == 1:
+            (first,) = arguments
+            return lambda env: function(env)(first(env))
+        if len(arguments) == 2:
+            first, second = arguments
+            return lambda env: function(env)(first(env), second(env))
+
+        def call(env):
+            f = function(env)
+            return f(*[argument(env) for argument in arguments])
+        return call
+
+    def compile_body(self, body):
+        # A sequence of forms evaluated for the value of the last one (or None).
+        forms = [self.compile_node(expr) for expr in body]
+        if not forms:
+            return lambda env: None
+        if len(forms) == 1:
+            return forms[0]
+
+        def sequence(env):
+            result = None
+            for form in forms:
+                result = form(env)
+            return result
+        return sequence
+
+    def compile_func(self, args):
+        lambda_args = [args[1], args[2]]
+        symbol = args[0].symbol
+        make_function = self.compile_lambda(lambda_args)
+
+        def func(env):
+            value = make_function(env)
+            env.define(symbol, value)
+            return value
+        return func
+
+    def compile_define(self, args):
+        symbol = args[0].symbol
+        value_code = self.compile_node(args[1])
+
+        def define(env):
+            value = value_code(env)
+            env.define(symbol, value)
+            return value
+        return define
+
+    def compile_set(self, args):
+        symbol = args[0].symbol
+        value_code = self.compile_node(args[1])
+
+        def set_(env):
+            value = value_code(env)
+            scope = env
+            while scope is not None:
+                values = scope.values
+                if symbol in values:
+                    values[symbol] = value
+                    return value
+                scope = scope.parent
+            raise RuntimeError(f"Undefined variable '{symbol_name(symbol)}'")
+        return set_
+
+    def compile_if(self, args):
+        condition = self.compile_node(args[0])
+        then_branch = self.compile_node(args[1])
+        else_branch = self.compile_node(args[2])
+        return lambda env: then_branch(env) if condition(env) else else_branch(env)
+
+    def compile_lambda(self, args):
+        param_names = [tok.symbol for tok in args[0].elements]
+        body_exprs = args[1:]
+        # The body is compiled on the first call; many functions never run.
+        body = None
+
+        def make_function(env):
+            def fn(*call_args):
+                nonlocal body
+                if body is None:
+                    body = self.metered(self.compile_body(body_exprs))
+                local = Environment(parent=env)
+                for pname, param_val in zip(param_names, call_args):
+                    local.define(pname, param_val)
+                return body(local)
+            return fn
+        return make_function
+
+    def compile_while(self, args):
+        condition = self.compile_node(args[0])
+        body = [self.compile_node(expr) for expr in args[1:]]
+        if self.fuel is not None:
+            body.insert(0, self.metered(lambda env: None))
+        if len(body) == 1:
+            (single,) = body
+
+            def while_single(env):
+                result = None
+                while condition(env):
+                    result = single(env)
+                return result
+            return while_single
+
+        def while_(env):
+            result = None
+            while condition(env):
+                for form in body:
+                    result = form(env)
+            return result
+        return while_
+
+    def compile_and(self, args):
+        operands = [self.compile_node(arg) for arg in args]
+
+        def and_(env):
+            for operand in operands:
+                if not operand(env):
+                    return False
+            return True
+        return and_
+
+    def compile_or(self, args):
+        operands = [self.compile_node(arg) for arg in args]
+
+        def or_(env):
+            for operand in operands:
+                if operand(env):
+                    return True
+            return False
+        return or_
+
+    def compile_unary(self, operation, args):
+        operand = self.compile_node(args[0])
+        return lambda env: operation(operand(env))
+
+    def compile_binary(self, operation, args):
+        first = self.compile_node(args[0])
+        second = self.compile_node(args[1])
+        return lambda env: operation(first(env), second(env))
+
+    def compile_for(self, args):
+        symbol = args[0].symbol
+        start_code = self.compile_node(args[1])
+        end_code = self.compile_node(args[2])
+        body = self.metered(self.compile_node(args[3]))
+
+        def for_(env):
+            start = start_code(env)
+            end = end_code(env)
+            result = None
+            for i in range(start, end):
+                loop_env = Environment(parent=env)
+                loop_env.define(symbol, i)
+                result = body(loop_env)
+            return result
+        return for_
+
+
+# Looked up through `self` so subclasses can override individual forms.
+COMPILERS = {
+    FUNC: lambda self, args: self.compile_func(args),
+    DEFINE: lambda self, args: self.compile_define(args),
+    SET: lambda self, args: self.compile_set(args),
+    IF: lambda self, args: self.compile_if(args),
+    LAMBDA: lambda self, args: self.compile_lambda(args),
+    WHILE: lambda self, args: self.compile_while(args),
+    AND: lambda self, args: self.compile_and(args),
+    OR: lambda self, args: self.compile_or(args),
+    HEAD: lambda self, args: self.compile_unary(_head, args),
+    TAIL: lambda self, args: self.compile_unary(_tail, args),
+    REVERSE: lambda self, args: self.compile_unary(_reverse, args),
+    EMPTY: lambda self, args: self.compile_unary(_empty, args),
+    APPEND: lambda self, args: self.compile_binary(_append, args),
+    PUSH: lambda self, args: self.compile_binary(_push, args),
+    FOR: lambda self, args: self.compile_for(args),
+}
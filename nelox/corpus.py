@@ -0,0 +1,247 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from nelox.flat_ast import FlatProgram, flatten, VARIABLE
+from nelox.symbols import intern, symbol_name
+
+MAGIC = b"NELOXAST"
+VERSION = 1
+
+# Node data is stored as 32-bit unsigned integers and widened when a program
+# is loaded; per-program indices and line numbers stay well below 2**32.
+UINT32 = 'I' if array('I').itemsize == 4 else 'L'
+
+# Sections in file order, with the array typecode of their items. Per-program
+# offsets have one more entry than there are programs; program i owns items
+# [offsets[i], offsets[i + 1]) of the matching section. Node, child and
+# constant indices inside a program are local to it, symbols are shared.
+SECTIONS = (
+    ("node_offsets", 'q'),
+    ("child_offsets", 'q'),
+    ("root_offsets", 'q'),
+    ("constant_offsets", 'q'),
+    ("kinds", 'B'),
+    ("payloads", UINT32),
+    ("extras", UINT32),
+    ("children", UINT32),
+    ("roots", UINT32),
+    ("constant_kinds", 'B'),
+    ("constant_ends", 'q'),
+    ("constant_data", 'B'),
+    ("symbol_ends", 'q'),
+    ("symbol_data", 'B'),
+)
+HEADER = struct.Struct("<8sIQ" + "QQ" * len(SECTIONS))
+
+INT_CONSTANT = 0
+STRING_CONSTANT = 1
+
+
+def _to_file_order(values: array) -> array:
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _encode_constant(value):
+    # bool is an int subclass but is not something the parser produces.
+    if type(value) is int:
+        return INT_CONSTANT, str(value).encode()
+    if type(value) is str:
+        return STRING_CONSTANT, value.encode()
+    raise TypeError(f"Cannot store constant of type {type(value).__name__}")
+
+
+class CorpusWriter:
+    """Collects parsed programs and writes them as one binary corpus file.
+
+    Each program is stored as the arrays of its FlatProgram, so a reader can
+    rebuild program i from a few slices without scanning or parsing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sections = {name: array(typecode) for name, typecode in SECTIONS}
+        for name in ("node_offsets", "child_offsets", "root_offsets", "constant_offsets"):
+            self.sections[name].append(0)
+        self.constant_data = bytearray()
+        self.symbol_data = bytearray()
+        self.symbol_index = {}
+        self.closed = False
+
+    def __len__(self):
+        return len(self.sections["node_offsets"]) - 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, expressions) -> int:
+        """Append a program given as a list of expressions (or a FlatProgram)."""
+        if self.closed:
+            raise ValueError("Corpus has already been written")
+        program = expressions if isinstance(expressions, FlatProgram) else flatten(expressions)
+        sections = self.sections
+
+        payloads = array(UINT32, program.payloads)
+        kinds = program.kinds
+        for index in range(len(kinds)):
+            if kinds[index] == VARIABLE:
+                payloads[index] = self._symbol(payloads[index])
+
+        sections["kinds"].extend(kinds)
+        sections["payloads"].extend(payloads)
+        sections["extras"].extend(array(UINT32, program.extras))
+        sections["children"].extend(array(UINT32, program.children))
+        sections["roots"].extend(array(UINT32, program.roots))
+        for value in program.constants:
+            kind, data = _encode_constant(value)
+            self.constant_data += data
+            sections["constant_kinds"].append(kind)
+            sections["constant_ends"].append(len(self.constant_data))
+
+        sections["node_offsets"].append(len(sections["kinds"]))
+        sections["child_offsets"].append(len(sections["children"]))
+        sections["root_offsets"].append(len(sections["roots"]))
+        sections["constant_offsets"].append(len(sections["constant_kinds"]))
+        return len(self) - 1
+
+    def _symbol(self, symbol) -> int:
+        index = self.symbol_index.get(symbol)
+        if index is None:
+            index = self.symbol_index[symbol] = len(self.symbol_index)
+            self.symbol_data += symbol_name(symbol).encode()
+            self.sections["symbol_ends"].append(len(self.symbol_data))
+        return index
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.sections["constant_data"] = array('B', self.constant_data)
+        self.sections["symbol_data"] = array('B', self.symbol_data)
+
+        blobs = [_to_file_order(self.sections[name]).tobytes() for name, _ in SECTIONS]
+        spans = []
+        offset = HEADER.size
+        for blob in blobs:
+            spans += [offset, len(blob)]
+            offset += len(blob)
+        with open(self.path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(self), *spans))
+            for blob in blobs:
+                f.write(blob)
+
+
+class CorpusReader:
+    """Memory-mapped view of a file written by CorpusWriter.
+
+    `reader[i]` returns program i as a FlatProgram and `reader.expressions(i)`
+    as ordinary Expr objects; either way only that program's bytes are read.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self.map) < HEADER.size:
+                raise ValueError(f"{path} is not a Nelox corpus file")
+            magic, version, count, *spans = HEADER.unpack_from(self.map)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a Nelox corpus file")
+            if version != VERSION:
+                raise ValueError(f"Unsupported corpus version {version}")
+        except Exception:
+            self.map.close()
+            raise
+        self.count = count
+        self.spans = {name: (spans[2 * i], spans[2 * i + 1]) for i, (name, _) in enumerate(SECTIONS)}
+        self.typecodes = dict(SECTIONS)
+
+        self.node_offsets = self._read("node_offsets")
+        self.child_offsets = self._read("child_offsets")
+        self.root_offsets = self._read("root_offsets")
+        self.constant_offsets = self._read("constant_offsets")
+        self.symbols = self._decode_symbols()
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def close(self):
+        self.map.close()
+
+    def _read(self, name, start=0, stop=None) -> array:
+        values = array(self.typecodes[name])
+        offset, length = self.spans[name]
+        if stop is None:
+            stop = length // values.itemsize
+        values.frombytes(self.map[offset + start * values.itemsize:offset + stop * values.itemsize])
+        return _to_file_order(values)
+
+    def _decode_symbols(self):
+        ends = self._read("symbol_ends")
+        offset, length = self.spans["symbol_data"]
+        data = self.map[offset:offset + length]
+        symbols = []
+        start = 0
+        for end in ends:
+            symbols.append(intern(data[start:end].decode()))
+            start = end
+        return symbols
+
+    def __getitem__(self, index) -> FlatProgram:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("Program index out of range")
+        program = FlatProgram()
+        first_node, last_node = self.node_offsets[index], self.node_offsets[index + 1]
+        program.kinds = self._read("kinds", first_node, last_node)
+        program.payloads = array('q', self._read("payloads", first_node, last_node))
+        program.extras = array('q', self._read("extras", first_node, last_node))
+        program.children = array('q', self._read("children", self.child_offsets[index],
+                                                  self.child_offsets[index + 1]))
+        program.roots = array('q', self._read("roots", self.root_offsets[index], self.root_offsets[index + 1]))
+
+        kinds, payloads, symbols = program.kinds, program.payloads, self.symbols
+        for node in range(len(kinds)):
+            if kinds[node] == VARIABLE:
+                payloads[node] = symbols[payloads[node]]
+
+        first, last = self.constant_offsets[index], self.constant_offsets[index + 1]
+        if first < last:
+            constant_kinds = self._read("constant_kinds", first, last)
+            ends = self._read("constant_ends", first - 1 if first else 0, last)
+            if first == 0:
+                ends.insert(0, 0)
+            offset, _ = self.spans["constant_data"]
+            data = self.map[offset + ends[0]:offset + ends[-1]]
+            base = ends[0]
+            for position, kind in enumerate(constant_kinds):
+                text = data[ends[position] - base:ends[position + 1] - base].decode()
+                program.add_constant(int(text) if kind == INT_CONSTANT else text)
+        return program
+
+    def expressions(self, index):
+        return self[index].to_exprs()
+
+
+def write_corpus(path: str, programs):
+    with CorpusWriter(path) as writer:
+        for expressions in programs:
+            writer.add(expressions)
@@ -0,0 +1,146 @@
+import re
+from typing import List
+
+from nelox.nelox_token import Token
+from nelox.scanner import Scanner
+from nelox.token_type import TokenType
+
+
+# One match = leading whitespace/comments followed by exactly one token. Each
+# token kind has its own group so `lastindex` tells us which one matched.
+# Tokens that involve non-ASCII characters land in the last group and are
+# finished by hand, following the str.isdigit()/isalpha() rules of Scanner.
+TOKEN_PATTERN = re.compile(r'''
+    (?>[ \t\r\n]*(?:\$[^\n]*[ \t\r\n]*)*)
+    (?:
+        (\()
+      | (\))
+      | ([0-9]++)(?![^\x00-\x7f])
+      | ([A-Za-z_+\-*/<>=!][^\s()"]*)
+      | ("[^"]*")
+      | ([0-9]*+[^\x00-\x7f])
+    )''', re.VERBOSE)
+
+TRIVIA_PATTERN = re.compile(r'(?>[ \t\r\n]|\$[^\n]*)*')
+TRIVIA_ITEM_PATTERN = re.compile(r'[ \t\r\n]|\$[^\n]*')
+IDENTIFIER_REST_PATTERN = re.compile(r'[^\s()"]*')
+
+GROUP_TYPES = (
+    None,
+    TokenType.LEFT_PAREN,
+    TokenType.RIGHT_PAREN,
+    TokenType.NUMBER,
+    TokenType.IDENTIFIER,
+    TokenType.STRING,
+    None,
+)
+
+NUMBER_GROUP = 3
+IDENTIFIER_GROUP = 4
+STRING_GROUP = 5
+UNICODE_GROUP = 6
+
+
+def scan_chunk(source: str, pos: int = 0, line: int = 1, final: bool = True):
+    """Scan `source` from `pos` and return (tokens, pos, line).
+
+    With `final=False` the source is treated as a prefix of a longer text: a
+    token touching the end of the buffer is left unscanned, since more input
+    could still extend it, and the returned position is where to resume.
+    """
+    tokens = []
+    append = tokens.append
+    match = TOKEN_PATTERN.match
+    count = source.count
+    end_of_source = len(source)
+    types = GROUP_TYPES
+
+    while True:
+        m = match(source, pos)
+        if m is None:
+            break
+        group = m.lastindex
+        if group == UNICODE_GROUP:
+            start = m.start(group)
+            group, end = finish_unicode_token(source, start, line + count('\n', pos, start))
+            text = source[start:end]
+        else:
+            end = m.end()
+            text = m.group(group)
+        if not final and end == end_of_source:
+            return tokens, pos, line
+        line += count('\n', pos, end)
+        if group == NUMBER_GROUP:
+            append(Token(TokenType.NUMBER, text, int(text), line))
+        elif group == STRING_GROUP:
+            append(Token(TokenType.STRING, text, text[1:-1], line))
+        else:
+            append(Token(types[group], text, None, line))
+        pos = end
+
+    eof_spans, pos, line = scan_tail(source, pos, line, final)
+    for start, end in eof_spans:
+        append(Token(TokenType.EOF, source[start:end], None, line))
+    return tokens, pos, line
+
+
+def scan_tail(source: str, pos: int, line: int, final: bool):
+    """Deal with what follows the last complete token at `pos`.
+
+    Raises the scanner errors, and returns (eof_spans, pos, line) where
+    eof_spans are the (start, end) lexeme spans of the EOF tokens to emit; it
+    is empty unless `final`.
+    """
+    count = source.count
+    end_of_source = len(source)
+    trivia_end = TRIVIA_PATTERN.match(source, pos).end()
+    if trivia_end < end_of_source:
+        c = source[trivia_end]
+        if c != '"':
+            line += count('\n', pos, trivia_end)
+            raise SyntaxError(f"[line {line}] Unexpected character: '{c}'")
+        if final:
+            line += count('\n', pos)
+            raise SyntaxError(f"[line {line}] Unterminated string.")
+        return [], pos, line
+
+    if final:
+        eof_spans = []
+        if trivia_end > pos:
+            # Scanner.scan_tokens emits an extra EOF token carrying the last
+            # piece of trailing whitespace or comment; keep the stream identical.
+            last = None
+            for last in TRIVIA_ITEM_PATTERN.finditer(source, pos):
+                pass
+            eof_spans.append(last.span())
+        eof_spans.append((end_of_source, end_of_source))
+        line += count('\n', pos)
+        return eof_spans, end_of_source, line
+
+    # Keep the trailing trivia for the next call, minus the complete lines,
+    # so a long run of blank lines or comments does not pile up in the buffer.
+    last_newline = source.rfind('\n', pos, trivia_end)
+    if last_newline > pos:
+        line += count('\n', pos, last_newline)
+        pos = last_newline
+    return [], pos, line
+
+
+def finish_unicode_token(source, start, line):
+    c = source[start]
+    end = start + 1
+    if c.isdigit():
+        while end < len(source) and source[end].isdigit():
+            end += 1
+        return NUMBER_GROUP, end
+    if c.isalpha():
+        return IDENTIFIER_GROUP, IDENTIFIER_REST_PATTERN.match(source, end).end()
+    raise SyntaxError(f"[line {line}] Unexpected character: '{c}'")
+
+
+class FastScanner(Scanner):
+
+    def scan_tokens(self) -> List[Token]:
+        tokens, self.current, self.line = scan_chunk(self.source, self.current, self.line)
+        self.tokens.extend(tokens)
+        return self.tokens
@@ -0,0 +1,87 @@
+import sys
+
+# Lines printed between two writes to the output stream.
+FLUSH_LINES = 4096
+
+
+class ConsoleIO:
+    """Input and output of a Nelox program through input() and print()."""
+
+    def read_line(self):
+        return input()
+
+    def read_int(self):
+        return int(input())
+
+    def read_ints(self):
+        return list(map(int, input().split()))
+
+    def print(self, *args):
+        print(*args)
+
+    def flush(self):
+        pass
+
+
+class FastIO(ConsoleIO):
+    """Buffered input and output, for programs that read or print many lines.
+
+    All of stdin is read as bytes and split into lines on the first read;
+    integers are then parsed from the bytes of a line, only read-line
+    decodes it. Printed lines are collected and written together every
+    FLUSH_LINES lines and on flush(), which Interpreter.interpret calls when
+    the program ends. Lines end at "\\n", with "\\r\\n" read as "\\n" like the
+    text mode of sys.stdin does. `stdin` and `stdout` default to sys.stdin
+    and sys.stdout at the time they are first used.
+    """
+
+    def __init__(self, stdin=None, stdout=None):
+        self.stdin = stdin
+        self.stdout = stdout
+        self.encoding = "utf-8"
+        self.input = self.load()
+        self.output = []
+
+    def load(self):
+        # Generates the lines of stdin, which it reads when first asked for one.
+        stream = self.stdin if self.stdin is not None else sys.stdin
+        self.encoding = getattr(stream, "encoding", None) or "utf-8"
+        buffer = getattr(stream, "buffer", None)
+        if buffer is not None:
+            data = buffer.read().replace(b"\r\n", b"\n")
+        else:
+            # A text stream, e.g. io.StringIO, has translated its newlines already.
+            data = stream.read().encode(self.encoding)
+        lines = data.split(b"\n")
+        if not lines[-1]:
+            lines.pop()
+        yield from lines
+
+    def next_line(self):
+        try:
+            return next(self.input)
+        except StopIteration:
+            raise EOFError("EOF when reading a line") from None
+
+    def read_line(self):
+        return self.next_line().decode(self.encoding)
+
+    def read_int(self):
+        return int(self.next_line())
+
+    def read_ints(self):
+        return list(map(int, self.next_line().split()))
+
+    def print(self, *args):
+        output = self.output
+        output.append(" ".join(map(str, args)))
+        if len(output) >= FLUSH_LINES:
+            self.flush()
+
+    def flush(self):
+        if self.output:
+            stream = self.stdout if self.stdout is not None else sys.stdout
+            self.output.append("")
+            stream.write("\n".join(self.output))
+            self.output = []
+            stream.flush()
@@ -0,0 +1,160 @@
+from array import array
+
+from nelox.Expr import Literal, Variable, List
+from nelox.nelox_token import Token
+from nelox.symbols import symbol_name
+from nelox.token_type import TokenType
+
+LITERAL = 0
+VARIABLE = 1
+LIST = 2
+
+
+class FlatProgram:
+    """A sequence of top-level forms stored as flat arrays.
+
+    Nodes are numbered in pre-order. For node i, kinds[i] says what it is and
+    payloads[i]/extras[i] hold:
+      literal:  index into `constants`, unused
+      variable: symbol id, source line
+      list:     offset of its child indices in `children`, number of children
+    """
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.payloads = array('q')
+        self.extras = array('q')
+        self.children = array('q')
+        self.constants = []
+        self.constant_index = {}
+        self.roots = array('q')
+
+    def __len__(self):
+        return len(self.roots)
+
+    def __iter__(self):
+        for root in self.roots:
+            yield self.node(root)
+
+    def __getitem__(self, index):
+        return self.node(self.roots[index])
+
+    def add(self, expr) -> int:
+        kinds, payloads, extras, children = self.kinds, self.payloads, self.extras, self.children
+        root = len(kinds)
+        stack = [(expr, -1)]
+        while stack:
+            node, slot = stack.pop()
+            index = len(kinds)
+            if slot >= 0:
+                children[slot] = index
+            if isinstance(node, List):
+                elements = node.elements
+                base = len(children)
+                kinds.append(LIST)
+                payloads.append(base)
+                extras.append(len(elements))
+                children.frombytes(bytes(children.itemsize * len(elements)))
+                for position in range(len(elements) - 1, -1, -1):
+                    stack.append((elements[position], base + position))
+            elif isinstance(node, Variable):
+                kinds.append(VARIABLE)
+                payloads.append(node.symbol)
+                extras.append(node.name.line)
+            elif isinstance(node, Literal):
+                kinds.append(LITERAL)
+                payloads.append(self.add_constant(node.value))
+                extras.append(0)
+            else:
+                raise RuntimeError("Unknown expression type")
+        self.roots.append(root)
+        return root
+
+    def add_constant(self, value) -> int:
+        try:
+            key = (type(value), value)
+            index = self.constant_index.get(key)
+        except TypeError:
+            key = index = None
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            if key is not None:
+                self.constant_index[key] = index
+        return index
+
+    def node(self, index):
+        return VIEW_CLASSES[self.kinds[index]](self, index)
+
+    def child_indices(self, index):
+        base = self.payloads[index]
+        return self.children[base:base + self.extras[index]]
+
+    def to_exprs(self):
+        # Children always come after their parent, so building from the last
+        # node backwards finds every child already built.
+        built = [None] * len(self.kinds)
+        kinds, payloads, extras, children = self.kinds, self.payloads, self.extras, self.children
+        for index in range(len(kinds) - 1, -1, -1):
+            kind = kinds[index]
+            if kind == LIST:
+                base = payloads[index]
+                built[index] = List([built[child] for child in children[base:base + extras[index]]])
+            elif kind == VARIABLE:
+                built[index] = Variable(Token(TokenType.IDENTIFIER, symbol_name(payloads[index]), None, extras[index]))
+            else:
+                built[index] = Literal(self.constants[payloads[index]])
+        return [built[root] for root in self.roots]
+
+
+class FlatLiteral(Literal):
+    def __init__(self, program, index):
+        self.program = program
+        self.index = index
+
+    @property
+    def value(self):
+        return self.program.constants[self.program.payloads[self.index]]
+
+
+class FlatVariable(Variable):
+    def __init__(self, program, index):
+        self.program = program
+        self.index = index
+
+    @property
+    def symbol(self):
+        return self.program.payloads[self.index]
+
+    @property
+    def name(self):
+        return Token(TokenType.IDENTIFIER, symbol_name(self.symbol), None, self.program.extras[self.index])
+
+
+class FlatList(List):
+    def __init__(self, program, index):
+        self.program = program
+        self.index = index
+        self._elements = None
+
+    @property
+    def elements(self):
+        # Children views are built on first access and kept by this view only.
+        if self._elements is None:
+            node = self.program.node
+            self._elements = tuple(node(child) for child in self.program.child_indices(self.index))
+        return self._elements
+
+
+VIEW_CLASSES = (FlatLiteral, FlatVariable, FlatList)
+
+
+def flatten(expressions) -> FlatProgram:
+    program = FlatProgram()
+    for expr in expressions:
+        program.add(expr)
+    return program
+
+
+def unflatten(program: FlatProgram):
+    return program.to_exprs()
@@ -0,0 +1,81 @@
+from nelox.Expr import Literal, Variable, List
+
+
+class NodeFactory:
+    """Creates Expr nodes for Parser and Fuzzer; a fresh node on every call."""
+
+    def literal(self, value) -> Literal:
+        return Literal(value)
+
+    def variable(self, token) -> Variable:
+        return Variable(token)
+
+    def list(self, elements) -> List:
+        return List(elements)
+
+
+class HashConsFactory(NodeFactory):
+    """NodeFactory that returns one shared node per distinct subtree.
+
+    Children of a list are themselves shared, so a list is identified by the
+    identities of its elements and structurally equal nodes from the same
+    factory are the same object: `a is b` is the O(1) equality test and the
+    default identity hash is the matching hash. Shared lists hold a tuple, and
+    a shared variable keeps the token (and line) of its first occurrence.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def literal(self, value) -> Literal:
+        key = (Literal, type(value), value)
+        try:
+            node = self.nodes.get(key)
+        except TypeError:
+            return Literal(value)
+        if node is None:
+            node = self.nodes[key] = Literal(value)
+        return node
+
+    def variable(self, token) -> Variable:
+        key = (Variable, token.lexeme)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = Variable(token)
+        return node
+
+    def list(self, elements) -> List:
+        elements = tuple(elements)
+        key = (List, elements)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = List(elements)
+        return node
+
+    def share(self, expr):
+        """Return the shared node structurally equal to the tree `expr`."""
+        # Post-order walk with an explicit stack; `done` collects finished children.
+        done = []
+        stack = [(expr, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if isinstance(node, List):
+                if expanded:
+                    count = len(node.elements)
+                    elements = done[len(done) - count:]
+                    del done[len(done) - count:]
+                    done.append(self.list(elements))
+                else:
+                    stack.append((node, True))
+                    for element in reversed(node.elements):
+                        stack.append((element, False))
+            elif isinstance(node, Variable):
+                done.append(self.variable(node.name))
+            elif isinstance(node, Literal):
+                done.append(self.literal(node.value))
+            else:
+                raise RuntimeError("Unknown expression type")
+        return done[0]
@@ -0,0 +1,186 @@
+from array import array
+from typing import List
+
+from nelox.fast_scanner import (TOKEN_PATTERN, UNICODE_GROUP,
+                                finish_unicode_token, scan_tail)
+from nelox.nelox_token import Token
+from nelox.token_buffer import TOKEN_TYPES, GROUP_CODES, EOF_CODE, NUMBER_CODE, STRING_CODE
+
+
+class IncrementalLexer:
+    """Token list of a source text that is kept up to date under edits.
+
+    Token spans and lines live in a gap buffer: entries before `gap` are
+    absolute, entries from `gap` on are stored relative to the end of the
+    source (characters and lines remaining after them). An edit rescans from
+    the token before it until the new tokens line up with old ones again;
+    everything after that point is reused untouched, so the work is
+    proportional to the edit plus the distance the gap moves.
+    """
+
+    def __init__(self, source: str):
+        self.source = ""
+        self.line_count = 1
+        self.types = array('B')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.lines = array('q')
+        self.gap = 0
+        self.valid = True
+        self._rescan(source)
+
+    def __len__(self):
+        return len(self.types)
+
+    def start(self, index) -> int:
+        if index < self.gap:
+            return self.starts[index]
+        return len(self.source) - self.starts[index]
+
+    def end(self, index) -> int:
+        if index < self.gap:
+            return self.ends[index]
+        return len(self.source) - self.ends[index]
+
+    def line(self, index) -> int:
+        if index < self.gap:
+            return self.lines[index]
+        return self.line_count - self.lines[index]
+
+    def token(self, index) -> Token:
+        code = self.types[index]
+        lexeme = self.source[self.start(index):self.end(index)]
+        if code == NUMBER_CODE:
+            literal = int(lexeme)
+        elif code == STRING_CODE:
+            literal = lexeme[1:-1]
+        else:
+            literal = None
+        return Token(TOKEN_TYPES[code], lexeme, literal, self.line(index))
+
+    def tokens(self) -> List[Token]:
+        if not self.valid:
+            raise RuntimeError("Source has lexical errors, no tokens available")
+        return [self.token(index) for index in range(len(self))]
+
+    def edit(self, offset: int, deleted: int, inserted: str):
+        """Replace `deleted` characters at `offset` with `inserted`.
+
+        Returns (first, removed, added): tokens [first, first + removed) of the
+        old list were replaced by tokens [first, first + added) of the new one.
+        Raises SyntaxError if the edited source does not scan; the edit is
+        still applied and the next successful edit rescans everything.
+        """
+        if offset < 0 or deleted < 0 or offset + deleted > len(self.source):
+            raise ValueError("Edit is out of range of the source")
+        source = self.source[:offset] + inserted + self.source[offset + deleted:]
+        if not self.valid:
+            return self._rescan(source)
+
+        # Tokens that end before the edit cannot change: the character that
+        # terminated them is untouched too.
+        first = self._first_affected(offset)
+        self._move_gap(first)
+        if first > 0:
+            pos, line = self.ends[first - 1], self.lines[first - 1]
+        else:
+            pos, line = 0, 1
+
+        delta_lines = inserted.count('\n') - self.source.count('\n', offset, offset + deleted)
+        self.source = source
+        self.line_count += delta_lines
+        try:
+            new_tokens, resync = self._scan_until_resync(pos, line, offset + len(inserted))
+        except SyntaxError:
+            self.valid = False
+            raise
+
+        types, starts, ends, lines = new_tokens
+        self.types[first:resync] = types
+        self.starts[first:resync] = starts
+        self.ends[first:resync] = ends
+        self.lines[first:resync] = lines
+        self.gap = first + len(types)
+        return first, resync - first, len(types)
+
+    def _first_affected(self, offset):
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.end(middle) < offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _move_gap(self, index):
+        length, line_count = len(self.source), self.line_count
+        starts, ends, lines = self.starts, self.ends, self.lines
+        for i in range(index, self.gap):
+            starts[i] = length - starts[i]
+            ends[i] = length - ends[i]
+            lines[i] = line_count - lines[i]
+        for i in range(self.gap, index):
+            starts[i] = length - starts[i]
+            ends[i] = length - ends[i]
+            lines[i] = line_count - lines[i]
+        self.gap = index
+
+    def _scan_until_resync(self, pos, line, edit_end):
+        # Scan from `pos` until a new token starts exactly where a surviving
+        # old token (stored relative to the end) starts; the rest is reused.
+        source = self.source
+        length = len(source)
+        match = TOKEN_PATTERN.match
+        count = source.count
+        types, starts, ends, lines = array('B'), array('q'), array('q'), array('q')
+        old_index = self.gap
+        old_count = len(self.types)
+        old_types, old_starts = self.types, self.starts
+
+        while True:
+            m = match(source, pos)
+            if m is None:
+                break
+            group = m.lastindex
+            if group == UNICODE_GROUP:
+                start = m.start(group)
+                group, end = finish_unicode_token(source, start, line + count('\n', pos, start))
+            else:
+                start, end = m.span(group)
+
+            if start >= edit_end:
+                from_end = length - start
+                while old_index < old_count and old_starts[old_index] > from_end:
+                    old_index += 1
+                if old_index < old_count and old_starts[old_index] == from_end \
+                        and old_types[old_index] != EOF_CODE:
+                    return (types, starts, ends, lines), old_index
+
+            line += count('\n', pos, end)
+            types.append(GROUP_CODES[group])
+            starts.append(start)
+            ends.append(end)
+            lines.append(line)
+            pos = end
+
+        eof_spans, _, line = scan_tail(source, pos, line, True)
+        for start, end in eof_spans:
+            types.append(EOF_CODE)
+            starts.append(start)
+            ends.append(end)
+            lines.append(line)
+        return (types, starts, ends, lines), old_count
+
+    def _rescan(self, source):
+        self.source = source
+        self.line_count = 1 + source.count('\n')
+        removed = len(self.types)
+        self.types, self.starts, self.ends, self.lines = array('B'), array('q'), array('q'), array('q')
+        self.gap = 0
+        self.valid = False
+        new_tokens, _ = self._scan_until_resync(0, 1, len(source) + 1)
+        self.types, self.starts, self.ends, self.lines = new_tokens
+        self.gap = len(self.types)
+        self.valid = True
+        return 0, removed, len(self.types)
@@ -1,8 +1,15 @@
-from nelox.Expr import Literal, Variable, List
+from nelox.Expr import Expr, Literal, Variable, List
+import functools
 import operator
 
-from nelox.nelox_token import Token
-from nelox.token_type import TokenType
+from nelox.fastio import ConsoleIO
+from nelox.numlist import NumList, compact
+from nelox.plist import PList
+from nelox.symbols import intern, symbol_name
+
+# Nelox list values: PList, NumList from the bulk builtins, or a Python list
+# from read-ints.
+LIST_TYPES = (PList, NumList, list)
 
 
 class Environment:
@@ -11,10 +18,11 @@ class Environment:
         self.parent = parent
 
     def find_env(self, name):
-        if name in self.values:
-            return self
-        elif self.parent:
-            return self.parent.find_env(name)
+        env = self
+        while env is not None:
+            if name in env.values:
+                return env
+            env = env.parent
         return None
 
     def get(self, name):
@@ -22,11 +30,11 @@ class Environment:
         if env:
             return env.values[name]
         else:
-            raise RuntimeError(f"Undefined variable '{name}'")
+            raise RuntimeError(f"Undefined variable '{symbol_name(name)}'")
 
     def define(self, name, value):
         if name in self.values:
-            raise RuntimeError(f"Variable '{name}' is already defined")
+            raise RuntimeError(f"Variable '{symbol_name(name)}' is already defined")
         self.values[name] = value
 
     def set(self, name, value):
@@ -34,11 +42,11 @@ class Environment:
         if env:
             env.values[name] = value
         else:
-            raise RuntimeError(f"Undefined variable '{name}'")
+            raise RuntimeError(f"Undefined variable '{symbol_name(name)}'")
 
 
 def _builtin_get(seq, index):
-    if not isinstance(seq, (list, str)):
+    if not isinstance(seq, (*LIST_TYPES, str)):
         raise RuntimeError(f"'get': expected list or string, got {type(seq)}")
     if not isinstance(index, int):
         raise RuntimeError(f"'get': expected integer index, got {type(index)}")
@@ -49,7 +57,7 @@ def _builtin_get(seq, index):
 
 
 def _builtin_length(lst):
-    if not isinstance(lst, list):
+    if not isinstance(lst, LIST_TYPES):
         raise RuntimeError(f"'length': expected list, got {type(lst)}")
     return len(lst)
 
@@ -80,59 +88,349 @@ def _builtin_get_ascii(c):
     return ord(c)
 
 
+def _as_plist(lst):
+    return lst if type(lst) is PList else PList(lst)
+
+
+def _head(lst):
+    if not isinstance(lst, LIST_TYPES):
+        raise RuntimeError(f"'head' expects a list, got {type(lst)}")
+    return lst[0] if lst else None
+
+
+def _tail(lst):
+    if not isinstance(lst, LIST_TYPES):
+        raise RuntimeError(f"'tail' expects a list, got {type(lst)}")
+    return _as_plist(lst).tail()
+
+
+def _append(val1, val2):
+    if isinstance(val1, LIST_TYPES) and isinstance(val2, LIST_TYPES):
+        return _as_plist(val1) + val2
+    elif isinstance(val1, str) and isinstance(val2, str):
+        return val1 + val2
+    else:
+        raise RuntimeError("'append' expects two lists or two strings")
+
+
+def _reverse(lst):
+    if not isinstance(lst, LIST_TYPES):
+        raise RuntimeError("'reverse' expects a list")
+    return _as_plist(lst).reverse()
+
+
+def _push(element, lst):
+    if not isinstance(lst, LIST_TYPES):
+        raise RuntimeError("'push' expects a list as the second argument")
+    return _as_plist(lst).push(element)
+
+
+def _empty(lst):
+    if not isinstance(lst, LIST_TYPES):
+        raise RuntimeError("'empty?' expects a list")
+    return len(lst) == 0
+
+
 def raise_(msg):
     raise RuntimeError(msg)
 
 
-def _define_builtins(env):
-    env.define("true", True)
-    env.define("false", False)
-    env.define("+", lambda *args: _apply(operator.add, *args))
-    env.define("-", lambda *args: _apply(operator.sub, *args))
-    env.define("*", lambda *args: _apply(operator.mul, *args))
-    env.define("/", lambda *args: _apply(operator.truediv, *args))
-    env.define("mod", lambda a, b: operator.mod(a, b))
-    env.define("div", lambda *args: _apply(operator.floordiv, *args))
-    env.define(">", _comparison(operator.gt))
-    env.define("<", _comparison(operator.lt))
-    env.define(">=", _comparison(operator.ge))
-    env.define("<=", _comparison(operator.le))
-    env.define("=", _comparison(operator.eq))
-    env.define("not", lambda x: not x)
-    env.define("!=", _comparison(operator.ne))
-    env.define("print", lambda *args: print(*args))
-    env.define("list", lambda *args: list(args))
-    env.define("get", _builtin_get)
-    env.define("length", _builtin_length)
-    env.define("str", lambda *args: str(args))
-    env.define("all-unique", lambda lst: list(set(lst)))
-    env.define("to-list", lambda s: list(s))
-    env.define("to-lower", lambda s: s.lower())
-    env.define("to-upper", lambda s: s.upper())
-    env.define("get-ascii", _builtin_get_ascii)
+def _define_builtins(env, io=None):
+    env.define(intern("true"), True)
+    env.define(intern("false"), False)
+    env.define(intern("+"), lambda *args: _apply(operator.add, *args))
+    env.define(intern("-"), lambda *args: _apply(operator.sub, *args))
+    env.define(intern("*"), lambda *args: _apply(operator.mul, *args))
+    env.define(intern("/"), lambda *args: _apply(operator.truediv, *args))
+    env.define(intern("mod"), lambda a, b: operator.mod(a, b))
+    env.define(intern("div"), lambda *args: _apply(operator.floordiv, *args))
+    env.define(intern(">"), _comparison(operator.gt))
+    env.define(intern("<"), _comparison(operator.lt))
+    env.define(intern(">="), _comparison(operator.ge))
+    env.define(intern("<="), _comparison(operator.le))
+    env.define(intern("="), _comparison(operator.eq))
+    env.define(intern("not"), lambda x: not x)
+    env.define(intern("!="), _comparison(operator.ne))
+    env.define(intern("print"), io.print if io is not None else lambda *args: print(*args))
+    env.define(intern("list"), lambda *args: PList(args))
+    env.define(intern("get"), _builtin_get)
+    env.define(intern("length"), _builtin_length)
+    env.define(intern("str"), lambda *args: str(args))
+    env.define(intern("all-unique"), lambda lst: PList(set(lst)))
+    env.define(intern("to-list"), lambda s: PList(s))
+    env.define(intern("to-lower"), lambda s: s.lower())
+    env.define(intern("to-upper"), lambda s: s.upper())
+    env.define(intern("get-ascii"), _builtin_get_ascii)
+
+
+def _expect_lists(name, lists):
+    for lst in lists:
+        if not isinstance(lst, LIST_TYPES):
+            raise RuntimeError(f"'{name}' expects a list, got {type(lst)}")
+
+
+def _builtin_range(*args):
+    if not 1 <= len(args) <= 2 or not all(type(arg) is int for arg in args):
+        raise RuntimeError("'range' expects one or two integers")
+    try:
+        return NumList(range(*args))
+    except OverflowError:
+        return PList(range(*args))
+
+
+def _builtin_sum(lst):
+    _expect_lists("sum", [lst])
+    try:
+        return sum(lst)
+    except TypeError:
+        raise RuntimeError("'sum' expects a list of numbers") from None
+
+
+def _builtin_sort(lst):
+    _expect_lists("sort", [lst])
+    try:
+        return compact(sorted(lst))
+    except TypeError:
+        raise RuntimeError("'sort' expects a list of comparable values") from None
+
+
+def _builtin_map(operators, function, *lists):
+    # (map f l1 l2) with an arithmetic builtin is element-wise arithmetic,
+    # done with the operator itself.
+    if not lists:
+        raise RuntimeError("'map' expects a function and at least one list")
+    _expect_lists("map", lists)
+    if len(lists) == 2:
+        function = operators.get(function, function)
+    return compact(list(map(function, *lists)))
+
+
+def _builtin_filter(function, lst):
+    _expect_lists("filter", [lst])
+    return compact(list(filter(function, lst)))
+
+
+def _builtin_fold(operators, function, initial, lst):
+    _expect_lists("fold", [lst])
+    return functools.reduce(operators.get(function, function), lst, initial)
+
+
+def _define_library(env, builtins):
+    # Bulk list builtins. They are defined in a scope around the global one,
+    # so programs may define these names for themselves. `builtins` is the
+    # global scope's values, whose arithmetic functions map and fold apply
+    # as Python operators.
+    operators = {builtins[intern(name)]: op for name, op in (
+        ("+", operator.add), ("-", operator.sub), ("*", operator.mul),
+        ("/", operator.truediv), ("div", operator.floordiv), ("mod", operator.mod))}
+    env.define(intern("range"), _builtin_range)
+    env.define(intern("sum"), _builtin_sum)
+    env.define(intern("sort"), _builtin_sort)
+    env.define(intern("map"), functools.partial(_builtin_map, operators))
+    env.define(intern("filter"), _builtin_filter)
+    env.define(intern("fold"), functools.partial(_builtin_fold, operators))
+
+
+class FuelExhausted(RuntimeError):
+    """A program ran longer than the fuel its interpreter was given."""
+
+
+class TailCall:
+    # A call of a Function in tail position, returned instead of made so
+    # that Function.__call__ can run it without growing the Python stack.
+    __slots__ = ("function", "args")
+
+    def __init__(self, function, args):
+        self.function = function
+        self.args = args
+
+
+class Function:
+    """A Nelox lambda: parameters, body and defining environment.
+
+    Calls in tail position of the body are trampolined through __call__,
+    so tail recursion runs in constant Python stack.
+    """
+
+    __slots__ = ("interpreter", "params", "body", "env")
+
+    def __init__(self, interpreter, params, body, env):
+        self.interpreter = interpreter
+        self.params = params
+        self.body = body
+        self.env = env
+
+    def __call__(self, *args):
+        result = self.interpreter.call_body(self, args)
+        while type(result) is TailCall:
+            function = result.function
+            result = function.interpreter.call_body(function, result.args)
+        return result
+
+    def tail_call(self, args):
+        # What a call in tail position evaluates to. The caller's trampoline
+        # runs each TailCall through function.interpreter.call_body.
+        return TailCall(self, args)
+
+
+FUNC = intern("func")
+DEFINE = intern("define")
+SET = intern("set")
+IF = intern("if")
+LAMBDA = intern("lambda")
+WHILE = intern("while")
+AND = intern("and")
+OR = intern("or")
+HEAD = intern("head")
+TAIL = intern("tail")
+APPEND = intern("append")
+REVERSE = intern("reverse")
+PUSH = intern("push")
+EMPTY = intern("empty?")
+READ_LINE = intern("read-line")
+FOR = intern("for")
+READ_INT = intern("read-int")
+READ_INTS = intern("read-ints")
+UNDERSCORE = intern("_")
+
+# Special forms that only compute a new list or flag from their arguments.
+LIST_FORMS = frozenset({HEAD, TAIL, APPEND, REVERSE, PUSH, EMPTY})
+# Builtins whose result depends only on their arguments and that have no side effects.
+PURE_BUILTINS = frozenset(intern(name) for name in (
+    "+", "-", "*", "/", "div", "mod", "<", ">", "<=", ">=", "=", "!=", "not",
+    "list", "get", "length", "str", "all-unique", "to-list", "to-lower", "to-upper",
+    "get-ascii"))
+
+
+class Unevaluated:
+    def __repr__(self):
+        return "UNEVALUATED"
+
+
+UNEVALUATED = Unevaluated()
+
+
+class Hoisted(Expr):
+    # A loop-invariant subexpression of a loop: evaluated on its first use
+    # in a run of the loop, reused for the rest of that run.
+
+    def __init__(self, expr):
+        self.expr = expr
+        self.value = UNEVALUATED
+
+
+class Specialized(Expr):
+    """A call of a binary builtin specialized for the types of its operands.
+
+    `operation` is applied directly when the operands have exactly the
+    types `left_type` and `right_type`; otherwise the call is made as
+    written, through `head`. The operands are literals, variables or
+    other Specialized nodes.
+    """
+
+    def __init__(self, head, left, right, operation, left_type, right_type, result_type):
+        self.head = head
+        self.left = left
+        self.right = right
+        self.operation = operation
+        self.left_type = left_type
+        self.right_type = right_type
+        self.result_type = result_type
+
+
+def _computes(expr):
+    # Whether evaluating expr does more than look up a value.
+    return isinstance(expr, Specialized) or (isinstance(expr, List) and bool(expr.elements))
+
+
+class LoopPlan:
+    """How the tree walker runs one while or for loop.
+
+    `reuse_frame`: the body of a for loop neither defines names nor makes
+    closures, so all iterations can share one Environment. `forms` is the
+    loop (condition and body, or for body) with its invariant calls
+    replaced by the Hoisted nodes in `hoisted`; it is only valid while the
+    names in `builtins` are the builtins, which is checked when the loop
+    starts, and `original_forms` is run otherwise.
+    """
+
+    __slots__ = ("reuse_frame", "original_forms", "forms", "hoisted", "builtins")
+
+    def __init__(self, reuse_frame, original_forms, forms, hoisted, builtins):
+        self.reuse_frame = reuse_frame
+        self.original_forms = original_forms
+        self.forms = forms
+        self.hoisted = hoisted
+        self.builtins = builtins
 
 
 class Interpreter:
-    def __init__(self):
-        self.global_env = Environment()
-        _define_builtins(self.global_env)
+    """Tree-walking interpreter of Nelox programs.
+
+    Programs read and print through `io`, a ConsoleIO by default; pass a
+    fastio.FastIO for buffered input and output.
+
+    With `fuel`, every loop iteration and function call uses one unit and
+    the one after the last raises FuelExhausted. `fuel` is what is left of
+    it; without it (None) nothing is counted.
+    """
+
+    def __init__(self, io=None, fuel=None):
+        self.io = io if io is not None else ConsoleIO()
+        self.fuel = fuel
+        self.global_env = Environment(parent=Environment())
+        _define_builtins(self.global_env, self.io)
+        _define_library(self.global_env.parent, self.global_env.values)
+        self.builtins = dict(self.global_env.values)
+        self.loop_plans = {}
+        self.special_forms = {
+            FUNC: self.eval_func,
+            DEFINE: self.eval_define,
+            SET: self.eval_set,
+            IF: self.eval_if,
+            LAMBDA: self.eval_lambda,
+            WHILE: self.eval_while,
+            AND: self.eval_and,
+            OR: self.eval_or,
+            HEAD: self.eval_head,
+            TAIL: self.eval_tail,
+            APPEND: self.eval_append,
+            REVERSE: self.eval_reverse,
+            PUSH: self.eval_push,
+            EMPTY: self.eval_empty,
+            READ_LINE: self.eval_read_line,
+            FOR: self.eval_for,
+            READ_INT: self.eval_read_int,
+            READ_INTS: self.eval_read_ints,
+        }
 
     def interpret(self, expressions):
         result = None
-        for expr in expressions:
-            result = self.evaluate(expr, self.global_env)
-            if "_" in self.global_env.values:
-                self.global_env.set("_", result)
-            else:
-                self.global_env.define("_", result)
+        for result in self.interpret_iter(expressions):
+            pass
         return result
 
+    def interpret_iter(self, expressions):
+        # Evaluates forms as the iterable produces them (e.g. Parser.parse_iter())
+        # and yields each result, so execution starts before parsing is done.
+        # Buffered output is flushed when the iteration ends, fails or is closed.
+        try:
+            for expr in expressions:
+                result = self.evaluate(expr, self.global_env)
+                if UNDERSCORE in self.global_env.values:
+                    self.global_env.set(UNDERSCORE, result)
+                else:
+                    self.global_env.define(UNDERSCORE, result)
+                yield result
+        finally:
+            self.io.flush()
+
     def evaluate(self, expr, env):
         if isinstance(expr, Literal):
             return expr.value
 
         elif isinstance(expr, Variable):
-            return env.get(expr.name.lexeme)
+            return env.get(expr.symbol)
 
         elif isinstance(expr, List):
             if not expr.elements:
@@ -142,167 +440,311 @@ class Interpreter:
             args = expr.elements[1:]
 
             if isinstance(head, Variable):
-                name = head.name.lexeme
-
-                if name == "func":
-                    fn_name = args[0]
-                    lambda_expr = List([
-                        Variable(Token(TokenType.IDENTIFIER, "lambda", None, 0)),
-                        args[1],
-                        args[2]
-                    ])
-                    define_expr = List([
-                        Variable(Token(TokenType.IDENTIFIER, "define", None, 0)),
-                        fn_name,
-                        lambda_expr
-                    ])
-                    return self.evaluate(define_expr, env)
-
-                elif name == "define":
-                    var_name = args[0].name.lexeme
-                    value = self.evaluate(args[1], env)
-                    env.define(var_name, value)
-                    return value
-
-                elif name == "set":
-                    var_name = args[0].name.lexeme
-                    value = self.evaluate(args[1], env)
-                    env.set(var_name, value)
-                    return value
-
-                elif name == "if":
-                    condition = self.evaluate(args[0], env)
-                    branch = args[1] if condition else args[2]
-                    return self.evaluate(branch, env)
-
-                elif name == "lambda":
-                    param_tokens = args[0].elements
-                    body_expres = args[1:]
-                    param_names = [tok.name.lexeme for tok in param_tokens]
-
-                    def fn(*call_args):
-                        local = Environment(parent=env)
-                        for pname, param_val in zip(param_names, call_args):
-                            local.define(pname, param_val)
-                        result_ = None
-                        for express in body_expres:
-                            result_ = self.evaluate(express, local)
-                        return result_
-                    return fn
-
-                elif name == "while":
-                    condition = args[0]
-                    body__expr = args[1:]
-                    result = None
-                    while self.evaluate(condition, env):
-                        for expr in body__expr:
-                            result = self.evaluate(expr, env)
-                    return result
-
-                elif name == "and":
-                    for arg in args:
-                        if not self.evaluate(arg, env):
-                            return False
-                    return True
-
-                elif name == "or":
-                    for arg in args:
-                        if self.evaluate(arg, env):
-                            return True
-                    return False
-
-                elif name == "head":
-                    lst = self.evaluate(args[0], env)
-                    if not isinstance(lst, list):
-                        raise RuntimeError(f"'head' expects a list, got {type(lst)}")
-                    return lst[0] if lst else None
-
-                elif name == "tail":
-                    lst = self.evaluate(args[0], env)
-                    if not isinstance(lst, list):
-                        raise RuntimeError(f"'tail' expects a list, got {type(lst)}")
-                    return lst[1:] if len(lst) > 0 else []
-
-                elif name == "append":
-                    val1 = self.evaluate(args[0], env)
-                    val2 = self.evaluate(args[1], env)
-                    if isinstance(val1, list) and isinstance(val2, list):
-                        return val1 + val2
-                    elif isinstance(val1, str) and isinstance(val2, str):
-                        return val1 + val2
-                    else:
-                        raise RuntimeError("'append' expects two lists or two strings")
-
-                elif name == "reverse":
-                    lst = self.evaluate(args[0], env)
-                    if not isinstance(lst, list):
-                        raise RuntimeError("'reverse' expects a list")
-                    return list(reversed(lst))
-
-                elif name == "push":
-                    element = self.evaluate(args[0], env)
-                    lst = self.evaluate(args[1], env)
-                    if not isinstance(lst, list):
-                        raise RuntimeError("'push' expects a list as the second argument")
-                    return [element] + lst
-
-                elif name == "empty?":
-                    lst = self.evaluate(args[0], env)
-                    if not isinstance(lst, list):
-                        raise RuntimeError("'empty?' expects a list")
-                    return len(lst) == 0
-
-                elif name == "read-line":
-                    var_name = args[0].name.lexeme
-                    value = input()
-                    env.set(var_name, value)
-                    return value
-
-                elif name == "for":
-                    var_token = args[0].name
-                    start = self.evaluate(args[1], env)
-                    end = self.evaluate(args[2], env)
-                    body = args[3]
-
-                    result = None
-                    for i in range(start, end):
-                        loop_env = Environment(parent=env)
-                        loop_env.define(var_token.lexeme, i)
-                        result = self.evaluate(body, loop_env)
-                    return result
-
-                elif name == "read-int":
-                    if len(args) != 1:
-                        raise RuntimeError("'read-int' expects exactly one variable")
-                    var_name = args[0].name.lexeme
-                    try:
-                        value = int(input())
-                    except ValueError:
-                        raise RuntimeError("'read-int' expects a single integer input")
-                    if env.find_env(var_name):
-                        env.set(var_name, value)
-                    else:
-                        env.define(var_name, value)
-                    return value
-
-                elif name == "read-ints":
-                    var_tokens = [arg.name.lexeme for arg in args]
-                    try:
-                        values = list(map(int, input().split()))
-                    except ValueError:
-                        raise RuntimeError("'read-ints' expects integer input")
-                    if len(values) != len(var_tokens):
-                        raise RuntimeError(f"'read-ints' expected {len(var_tokens)} values, got {len(values)}")
-                    for var_name, val in zip(var_tokens, values):
-                        if env.find_env(var_name):
-                            env.set(var_name, val)
-                        else:
-                            env.define(var_name, val)
-                    return values
+                special_form = self.special_forms.get(head.symbol)
+                if special_form is not None:
+                    return special_form(args, env)
 
             func = self.evaluate(head, env)
             evaluated_args = [self.evaluate(arg, env) for arg in args]
             return func(*evaluated_args)
 
+        elif isinstance(expr, Specialized):
+            left = self.evaluate(expr.left, env)
+            right = self.evaluate(expr.right, env)
+            if type(left) is expr.left_type and type(right) is expr.right_type:
+                return expr.operation(left, right)
+            return self.evaluate(expr.head, env)(left, right)
+
+        elif isinstance(expr, Hoisted):
+            if expr.value is UNEVALUATED:
+                expr.value = self.evaluate(expr.expr, env)
+            return expr.value
+
         else:
             raise RuntimeError("Unknown expression type")
+
+    def evaluate_tail(self, expr, env):
+        # evaluate() for an expression in tail position of a function body:
+        # `if` continues into the chosen branch and a call of a Function is
+        # returned as a TailCall.
+        while isinstance(expr, List) and expr.elements:
+            head = expr.elements[0]
+            args = expr.elements[1:]
+            if isinstance(head, Variable):
+                if head.symbol == IF:
+                    condition = self.evaluate(args[0], env)
+                    expr = args[1] if condition else args[2]
+                    continue
+                if head.symbol in self.special_forms:
+                    break
+
+            func = self.evaluate(head, env)
+            evaluated_args = [self.evaluate(arg, env) for arg in args]
+            if isinstance(func, Function):
+                return func.tail_call(evaluated_args)
+            return func(*evaluated_args)
+        return self.evaluate(expr, env)
+
+    def burn(self):
+        self.fuel -= 1
+        if self.fuel < 0:
+            self.fuel = 0
+            raise FuelExhausted("Out of fuel")
+
+    def call_body(self, function, call_args):
+        if self.fuel is not None:
+            self.burn()
+        local = Environment(parent=function.env)
+        for pname, param_val in zip(function.params, call_args):
+            local.define(pname, param_val)
+        body = function.body
+        if not body:
+            return None
+        for express in body[:-1]:
+            self.evaluate(express, local)
+        return self.evaluate_tail(body[-1], local)
+
+    def eval_func(self, args, env):
+        # (func name (params) body) is (define name (lambda (params) body))
+        lambda_args = [args[1], args[2]]
+        var_name = args[0].symbol
+        value = self.eval_lambda(lambda_args, env)
+        env.define(var_name, value)
+        return value
+
+    def eval_define(self, args, env):
+        var_name = args[0].symbol
+        value = self.evaluate(args[1], env)
+        env.define(var_name, value)
+        return value
+
+    def eval_set(self, args, env):
+        var_name = args[0].symbol
+        value = self.evaluate(args[1], env)
+        env.set(var_name, value)
+        return value
+
+    def eval_if(self, args, env):
+        condition = self.evaluate(args[0], env)
+        branch = args[1] if condition else args[2]
+        return self.evaluate(branch, env)
+
+    def eval_lambda(self, args, env):
+        param_tokens = args[0].elements
+        body_expres = args[1:]
+        param_names = [tok.symbol for tok in param_tokens]
+        return Function(self, param_names, body_expres, env)
+
+    def eval_while(self, args, env):
+        forms = self.loop_forms(self.loop_plan(args), env)
+        condition = forms[0]
+        body__expr = forms[1:]
+        metered = self.fuel is not None
+        result = None
+        while self.evaluate(condition, env):
+            if metered:
+                self.burn()
+            for expr in body__expr:
+                result = self.evaluate(expr, env)
+        return result
+
+    def eval_and(self, args, env):
+        for arg in args:
+            if not self.evaluate(arg, env):
+                return False
+        return True
+
+    def eval_or(self, args, env):
+        for arg in args:
+            if self.evaluate(arg, env):
+                return True
+        return False
+
+    def eval_head(self, args, env):
+        return _head(self.evaluate(args[0], env))
+
+    def eval_tail(self, args, env):
+        return _tail(self.evaluate(args[0], env))
+
+    def eval_append(self, args, env):
+        val1 = self.evaluate(args[0], env)
+        val2 = self.evaluate(args[1], env)
+        return _append(val1, val2)
+
+    def eval_reverse(self, args, env):
+        return _reverse(self.evaluate(args[0], env))
+
+    def eval_push(self, args, env):
+        element = self.evaluate(args[0], env)
+        lst = self.evaluate(args[1], env)
+        return _push(element, lst)
+
+    def eval_empty(self, args, env):
+        return _empty(self.evaluate(args[0], env))
+
+    def eval_read_line(self, args, env):
+        var_name = args[0].symbol
+        value = self.io.read_line()
+        env.set(var_name, value)
+        return value
+
+    def eval_for(self, args, env):
+        var_name = args[0].symbol
+        start = self.evaluate(args[1], env)
+        end = self.evaluate(args[2], env)
+        body = args[3]
+        plan = self.loop_plan([body], var_name)
+        (body,) = self.loop_forms(plan, env)
+
+        metered = self.fuel is not None
+        result = None
+        if plan.reuse_frame:
+            loop_env = Environment(parent=env)
+            values = loop_env.values
+            for i in range(start, end):
+                if metered:
+                    self.burn()
+                values[var_name] = i
+                result = self.evaluate(body, loop_env)
+            return result
+
+        for i in range(start, end):
+            if metered:
+                self.burn()
+            loop_env = Environment(parent=env)
+            loop_env.define(var_name, i)
+            result = self.evaluate(body, loop_env)
+        return result
+
+    def loop_forms(self, plan, env):
+        # The forms to run for one run of a loop: with hoisted invariants,
+        # reset, if the calls in the loop still reach the builtins.
+        if plan.hoisted:
+            for name in plan.builtins:
+                scope = env.find_env(name)
+                if scope is None or scope.values[name] is not self.builtins[name]:
+                    return plan.original_forms
+            for hoisted in plan.hoisted:
+                hoisted.value = UNEVALUATED
+        return plan.forms
+
+    def loop_plan(self, forms, loop_variable=None):
+        # Plans are cached per loop, keyed by its nodes (which the key keeps alive).
+        key = (loop_variable, *forms)
+        plan = self.loop_plans.get(key)
+        if plan is None:
+            plan = self.loop_plans[key] = self.plan_loop(list(forms), loop_variable)
+        return plan
+
+    def plan_loop(self, forms, loop_variable):
+        assigned = {loop_variable}
+        calls = set()
+        closed = True
+        defines = False
+        stack = list(forms)
+        while stack:
+            expr = stack.pop()
+            if not isinstance(expr, List) or not expr.elements:
+                continue
+            stack.extend(expr.elements)
+            head, args = expr.elements[0], expr.elements[1:]
+            if not isinstance(head, Variable):
+                closed = False
+                continue
+            symbol = head.symbol
+            if symbol in (FUNC, LAMBDA):
+                closed = False
+            if symbol in (DEFINE, FUNC, LAMBDA, READ_INT, READ_INTS):
+                defines = True
+            if symbol in (DEFINE, SET, READ_LINE, READ_INT, READ_INTS, FOR):
+                targets = args if symbol == READ_INTS else args[:1]
+                assigned.update(arg.symbol for arg in targets if isinstance(arg, Variable))
+            elif symbol not in self.special_forms:
+                calls.add(symbol)
+
+        # Calls of anything but builtins may run code that changes any variable.
+        closed = closed and all(name in self.builtins and name not in assigned for name in calls)
+        hoisted = []
+        hoisted_forms = forms
+        if closed:
+            hoisted_forms = [self.hoist_form(form, assigned, hoisted) for form in forms]
+        return LoopPlan(not defines, forms, hoisted_forms, hoisted, frozenset(calls))
+
+    def hoist_form(self, expr, assigned, hoisted):
+        expr, invariant = self.hoist(expr, assigned, hoisted)
+        if invariant and _computes(expr):
+            expr = Hoisted(expr)
+            hoisted.append(expr)
+        return expr
+
+    def hoist(self, expr, assigned, hoisted):
+        """Return (expr with its maximal invariant calls hoisted, whether expr is invariant).
+
+        An invariant expression is a literal, a variable the loop does not
+        assign, or a pure builtin call or list form on invariant arguments.
+        """
+        if isinstance(expr, Literal):
+            return expr, True
+        if isinstance(expr, Variable):
+            return expr, expr.symbol not in assigned
+        if isinstance(expr, Specialized):
+            # Its operands are literals, variables and Specialized nodes.
+            return expr, all(self.hoist(operand, assigned, hoisted)[1] for operand in (expr.left, expr.right))
+        if not isinstance(expr, List) or not expr.elements:
+            return expr, False
+
+        head = expr.elements[0]
+        symbol = head.symbol
+        if symbol in (DEFINE, SET):
+            start, stop = 2, 3
+        elif symbol == FOR:
+            start, stop = 2, 5
+        elif symbol in (READ_LINE, READ_INT, READ_INTS):
+            return expr, False
+        else:
+            start, stop = 1, len(expr.elements)
+
+        elements = expr.elements
+        results = [self.hoist(element, assigned, hoisted) for element in elements[start:stop]]
+        pure = symbol in LIST_FORMS or (symbol in PURE_BUILTINS and symbol not in self.special_forms)
+        if pure and all(invariant for _, invariant in results):
+            return expr, True
+
+        children = []
+        for child, invariant in results:
+            if invariant and _computes(child):
+                child = Hoisted(child)
+                hoisted.append(child)
+            children.append(child)
+        if all(new is old for new, old in zip(children, elements[start:stop])):
+            return expr, False
+        return List([*elements[:start], *children, *elements[stop:]]), False
+
+    def eval_read_int(self, args, env):
+        if len(args) != 1:
+            raise RuntimeError("'read-int' expects exactly one variable")
+        var_name = args[0].symbol
+        try:
+            value = self.io.read_int()
+        except ValueError:
+            raise RuntimeError("'read-int' expects a single integer input")
+        if env.find_env(var_name):
+            env.set(var_name, value)
+        else:
+            env.define(var_name, value)
+        return value
+
+    def eval_read_ints(self, args, env):
+        var_names = [arg.symbol for arg in args]
+        try:
+            values = self.io.read_ints()
+        except ValueError:
+            raise RuntimeError("'read-ints' expects integer input")
+        if len(values) != len(var_names):
+            raise RuntimeError(f"'read-ints' expected {len(var_names)} values, got {len(values)}")
+        for var_name, val in zip(var_names, values):
+            if env.find_env(var_name):
+                env.set(var_name, val)
+            else:
+                env.define(var_name, val)
+        return values
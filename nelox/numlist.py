@@ -0,0 +1,98 @@
+import operator
+from array import array
+
+from nelox.plist import PList
+
+INTEGERS = frozenset({int})
+
+
+class NumList:
+    """Immutable list of integers in a compact array('q') buffer.
+
+    The bulk builtins return one when every element of their result is an
+    int that fits in 64 bits, so that summing, sorting, comparing and
+    concatenating such lists runs over the buffer in C. Printing, equality
+    and ordering are those of the Python list with the same elements; the
+    list special forms treat it like any other list and return PLists.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, iterable=()):
+        self._values = array("q", iterable)
+
+    @classmethod
+    def _from_array(cls, values):
+        numlist = cls.__new__(cls)
+        numlist._values = values
+        return numlist
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __getitem__(self, index):
+        return self._values[operator.index(index)]
+
+    def __add__(self, other):
+        if isinstance(other, NumList):
+            return NumList._from_array(self._values + other._values)
+        if isinstance(other, (PList, list)):
+            return PList(self) + other
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, (PList, list)):
+            return PList([*other, *self._values])
+        return NotImplemented
+
+    def __mul__(self, count):
+        if not isinstance(count, int):
+            return NotImplemented
+        return NumList._from_array(self._values * count)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        if isinstance(other, NumList):
+            return self._values == other._values
+        if isinstance(other, (PList, list)):
+            return len(self._values) == len(other) and self._values.tolist() == list(other)
+        return NotImplemented
+
+    def _compare(self, other, op):
+        if isinstance(other, NumList):
+            return op(self._values, other._values)
+        if isinstance(other, (PList, list)):
+            return op(self._values.tolist(), list(other))
+        return NotImplemented
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    # Unhashable, like the other list values.
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._values.tolist())
+
+
+def compact(values):
+    """A NumList of `values` (a Python list) if they are all ints that fit, else a PList."""
+    if set(map(type, values)) <= INTEGERS:
+        try:
+            return NumList(values)
+        except OverflowError:
+            pass
+    return PList(values)
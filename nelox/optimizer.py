@@ -0,0 +1,152 @@
+from collections import Counter
+
+from nelox.Expr import Literal, Variable, List
+from nelox.interpreter import (Environment, _define_builtins, FUNC, DEFINE, SET, IF, LAMBDA,
+                               WHILE, AND, OR, HEAD, TAIL, APPEND, REVERSE, PUSH, EMPTY,
+                               READ_LINE, FOR, READ_INT, READ_INTS, UNDERSCORE)
+from nelox.symbols import intern
+
+# Builtins without side effects, folded when all their arguments are constants.
+FOLDABLE_BUILTINS = frozenset(intern(name) for name in (
+    "+", "-", "*", "/", "div", "mod", "<", ">", "<=", ">=", "=", "!=", "not"))
+# Builtins that are values rather than functions.
+CONSTANT_BUILTINS = frozenset({intern("true"), intern("false")})
+
+BINDING_FORMS = frozenset({DEFINE, FUNC, SET, READ_LINE, READ_INT, READ_INTS})
+# Special forms whose arguments are all evaluated, like a call's.
+EVALUATING_FORMS = frozenset({WHILE, AND, OR, HEAD, TAIL, APPEND, REVERSE, PUSH, EMPTY})
+
+
+def bound_names(expr):
+    """Variables a single form binds or assigns, not counting nested forms."""
+    if not isinstance(expr, List) or not expr.elements:
+        return []
+    head, args = expr.elements[0], expr.elements[1:]
+    symbol = head.symbol if isinstance(head, Variable) else None
+    names = []
+    if symbol in BINDING_FORMS or symbol == FOR:
+        names = args if symbol == READ_INTS else args[:1]
+    if symbol in (LAMBDA, FUNC):
+        params = args[1 if symbol == FUNC else 0:][:1]
+        if params and isinstance(params[0], List):
+            names = [*names, *params[0].elements]
+    return [name for name in names if isinstance(name, Variable)]
+
+
+def binding_counts(expressions):
+    """Count, per name, the places in a program that may bind or assign it."""
+    counts = Counter()
+    stack = list(expressions)
+    while stack:
+        expr = stack.pop()
+        if isinstance(expr, List):
+            counts.update(name.symbol for name in bound_names(expr))
+            stack.extend(expr.elements)
+    return counts
+
+
+class Optimizer:
+    """Constant folding and partial evaluation of a Nelox program.
+
+    Calls of pure builtins on constants are evaluated, `if` with a constant
+    condition is replaced by the branch it takes, and a global `define` of a
+    constant whose name is never bound anywhere else is propagated into the
+    forms after it. A fold that raises is left in place, so the program still
+    fails when, and how, it did. Builtins the program may rebind are never
+    folded. Unchanged subtrees are shared with the input, which is not
+    modified.
+    """
+
+    def __init__(self, expressions):
+        self.bindings = binding_counts(expressions)
+        env = Environment()
+        _define_builtins(env)
+        self.builtins = env.values
+        self.constants = {}
+
+    def optimize_program(self, expressions):
+        result = []
+        for expr in expressions:
+            expr = self.optimize(expr)
+            result.append(expr)
+            self.propagate(expr)
+        return result
+
+    def propagate(self, expr):
+        # A top-level (define name constant) that is the only binding of name.
+        if not (isinstance(expr, List) and len(expr.elements) >= 3):
+            return
+        head, name, value = expr.elements[:3]
+        if (isinstance(head, Variable) and head.symbol == DEFINE
+                and isinstance(name, Variable) and isinstance(value, Literal)
+                and self.bindings[name.symbol] == 1
+                and name.symbol not in self.builtins and name.symbol != UNDERSCORE):
+            self.constants[name.symbol] = value.value
+
+    def optimize(self, expr):
+        if isinstance(expr, Variable):
+            symbol = expr.symbol
+            if symbol in self.constants:
+                return Literal(self.constants[symbol])
+            if symbol in CONSTANT_BUILTINS and not self.bindings[symbol]:
+                return Literal(self.builtins[symbol])
+            return expr
+        if not isinstance(expr, List) or not expr.elements:
+            return expr
+
+        head = expr.elements[0]
+        symbol = head.symbol if isinstance(head, Variable) else None
+        if symbol in (DEFINE, SET):
+            return self.optimize_elements(expr, 2, 3)
+        if symbol == FUNC:
+            # Only the first body form of a func is ever evaluated.
+            return self.optimize_elements(expr, 3, 4)
+        if symbol == LAMBDA:
+            return self.optimize_elements(expr, 2)
+        if symbol == FOR:
+            return self.optimize_elements(expr, 2, 5)
+        if symbol in (READ_LINE, READ_INT, READ_INTS):
+            return expr
+        if symbol == IF:
+            return self.optimize_if(expr)
+        if symbol in EVALUATING_FORMS:
+            return self.optimize_elements(expr, 1)
+
+        expr = self.optimize_elements(expr, 0)
+        return self.fold(expr)
+
+    def optimize_elements(self, expr, start, stop=None):
+        elements = expr.elements
+        stop = len(elements) if stop is None else min(stop, len(elements))
+        optimized = [self.optimize(element) for element in elements[start:stop]]
+        if all(new is old for new, old in zip(optimized, elements[start:stop])):
+            return expr
+        return List([*elements[:start], *optimized, *elements[stop:]])
+
+    def optimize_if(self, expr):
+        # (if c a b) evaluates a or b depending on c and ignores anything after.
+        expr = self.optimize_elements(expr, 1)
+        elements = expr.elements
+        if len(elements) >= 2 and isinstance(elements[1], Literal):
+            branch = 2 if elements[1].value else 3
+            if branch < len(elements):
+                return elements[branch]
+        return expr
+
+    def fold(self, expr):
+        head, args = expr.elements[0], expr.elements[1:]
+        if not (isinstance(head, Variable) and head.symbol in FOLDABLE_BUILTINS
+                and not self.bindings[head.symbol]
+                and all(isinstance(arg, Literal) for arg in args)):
+            return expr
+        try:
+            value = self.builtins[head.symbol](*[arg.value for arg in args])
+        except Exception:
+            return expr
+        return Literal(value)
+
+
+def optimize(expressions):
+    """Return an optimized copy of a program (a list of Exprs)."""
+    expressions = list(expressions)
+    return Optimizer(expressions).optimize_program(expressions)
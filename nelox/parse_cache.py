@@ -0,0 +1,102 @@
+import hashlib
+import os
+import struct
+import tempfile
+from collections import OrderedDict, namedtuple
+
+from nelox.corpus import CorpusReader, CorpusWriter
+from nelox.flat_ast import flatten
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "disk_hits", "misses", "maxsize", "currsize"])
+
+
+def source_key(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class ParseCache:
+    """Scanner + Parser with results cached by the SHA-256 of the source.
+
+    Programs are kept as FlatPrograms in an in-memory LRU of `maxsize`
+    entries and, if `directory` is given, also as one corpus file per source
+    there. Every `parse` builds fresh Expr objects from the cached arrays, so
+    callers may mutate what they get back without affecting later hits.
+    Sources that fail to parse are not cached.
+    """
+
+    def __init__(self, maxsize: int = 128, directory: str = None):
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative")
+        self.maxsize = maxsize
+        self.directory = directory
+        self.programs = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def parse(self, source: str):
+        return self._lookup(source).to_exprs()
+
+    def _lookup(self, source: str):
+        key = source_key(source)
+        program = self.programs.get(key)
+        if program is not None:
+            self.programs.move_to_end(key)
+            self.hits += 1
+            return program
+
+        program = self._load(key)
+        if program is not None:
+            self.disk_hits += 1
+        else:
+            program = flatten(Parser(Scanner(source)).parse())
+            self.misses += 1
+            self._store(key, program)
+        self._remember(key, program)
+        return program
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.disk_hits, self.misses, self.maxsize, len(self.programs))
+
+    def clear(self):
+        """Forget the in-memory entries and reset the counters; files on disk are kept."""
+        self.programs.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def _remember(self, key, program):
+        if self.maxsize == 0:
+            return
+        self.programs[key] = program
+        if len(self.programs) > self.maxsize:
+            self.programs.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".nlxc")
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with CorpusReader(self._path(key)) as reader:
+                return reader[0]
+        except (OSError, ValueError, IndexError, struct.error):
+            # Missing or damaged entries are simply parsed again.
+            return None
+
+    def _store(self, key, program):
+        if self.directory is None:
+            return
+        # Write to a temporary file first so readers never see a partial entry.
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            with CorpusWriter(temporary) as writer:
+                writer.add(program)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
@@ -4,15 +4,23 @@ from nelox.scanner import Scanner
 
 
 class Parser:
-    def __init__(self, scanner: Scanner):
+    def __init__(self, scanner: Scanner, factory=None):
         self.scanner = scanner
+        # Nodes are built by `factory` (see nelox.hashcons) if one is given.
+        if factory is None:
+            self.literal, self.variable, self.list = Literal, Variable, List
+        else:
+            self.literal, self.variable, self.list = factory.literal, factory.variable, factory.list
         self.scanner.scan_tokens()
 
     def parse(self):
-        expressions = []
+        return list(self.parse_iter())
+
+    def parse_iter(self):
+        # Yields top-level forms one at a time; with a StreamScanner the input
+        # is only read as far as the form being returned.
         while not self.scanner.is_at_end():
-            expressions.append(self.expression())
-        return expressions
+            yield self.expression()
 
     def expression(self):
         token = self.advance()
@@ -20,9 +28,9 @@ class Parser:
             case TokenType.LEFT_PAREN:
                 return self.list_expr()
             case TokenType.NUMBER | TokenType.STRING:
-                return Literal(token.literal)
+                return self.literal(token.literal)
             case TokenType.IDENTIFIER:
-                return Variable(token)
+                return self.variable(token)
             case _:
                 raise Exception(f"[line {token.line}] Unexpected token: {token.type}")
 
@@ -33,7 +41,7 @@ class Parser:
             if self.scanner.is_at_end():
                 raise Exception("Unterminated list")
         self.consume(TokenType.RIGHT_PAREN, "Expect ')' after list.")
-        return List(items)
+        return self.list(items)
 
     def consume(self, token_type, message):
         if self.check(token_type):
@@ -49,3 +57,42 @@ class Parser:
 
     def peek(self):
         return self.scanner.peek()
+
+
+class IterativeParser(Parser):
+    # Same grammar and errors as Parser, but open lists are kept on an explicit
+    # stack, so nesting depth is not limited by Python's recursion limit.
+
+    def expression(self):
+        scanner = self.scanner
+        advance, peek, is_at_end = scanner.advance, scanner.peek, scanner.is_at_end
+        left_paren, right_paren = TokenType.LEFT_PAREN, TokenType.RIGHT_PAREN
+        number, string, identifier = TokenType.NUMBER, TokenType.STRING, TokenType.IDENTIFIER
+        make_literal, make_variable, make_list = self.literal, self.variable, self.list
+        stack = []
+        while True:
+            token = advance()
+            token_type = token.type
+            if token_type is left_paren:
+                stack.append([])
+            else:
+                if token_type is identifier:
+                    value = make_variable(token)
+                elif token_type is number or token_type is string:
+                    value = make_literal(token.literal)
+                else:
+                    raise Exception(f"[line {token.line}] Unexpected token: {token.type}")
+                if not stack:
+                    return value
+                stack[-1].append(value)
+                if is_at_end():
+                    raise Exception("Unterminated list")
+
+            while peek().type is right_paren:
+                advance()
+                value = make_list(stack.pop())
+                if not stack:
+                    return value
+                stack[-1].append(value)
+                if is_at_end():
+                    raise Exception("Unterminated list")
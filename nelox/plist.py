@@ -0,0 +1,123 @@
+import operator
+from itertools import islice
+
+
+class PList:
+    """Immutable list value with O(1) head, tail, push, indexing and length.
+
+    The elements are stored in reverse order in a Python list that is shared
+    between a list, its tails and the lists pushed onto it: a PList sees the
+    first `length` items of the store, so its tail is the same store with one
+    item less and a push appends to the store, when no other list has done so
+    already, or copies it. Printing, equality and ordering are those of the
+    Python list with the same elements.
+    """
+
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, iterable=()):
+        items = list(iterable)
+        items.reverse()
+        self._items = items
+        self._length = len(items)
+
+    @classmethod
+    def _from_store(cls, items, length):
+        plist = cls.__new__(cls)
+        plist._items = items
+        plist._length = length
+        return plist
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        items = self._items
+        return islice(reversed(items), len(items) - self._length, None)
+
+    def __getitem__(self, index):
+        index = operator.index(index)
+        length = self._length
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("list index out of range")
+        return self._items[length - 1 - index]
+
+    def _reversed_items(self):
+        # The elements, last first, as a fresh Python list.
+        return self._items[:self._length]
+
+    def tail(self):
+        """The list without its first element (the empty list stays empty)."""
+        if not self._length:
+            return self
+        return PList._from_store(self._items, self._length - 1)
+
+    def push(self, element):
+        """The list with `element` added in front."""
+        items = self._items
+        length = self._length
+        if len(items) != length:
+            items = items[:length]
+        items.append(element)
+        return PList._from_store(items, length + 1)
+
+    def reverse(self):
+        """The list with its elements in reverse order."""
+        items = self._reversed_items()
+        items.reverse()
+        return PList._from_store(items, self._length)
+
+    def __add__(self, other):
+        if isinstance(other, PList):
+            return PList._from_store(other._reversed_items() + self._reversed_items(),
+                                     self._length + other._length)
+        if isinstance(other, list):
+            return PList._from_store(other[::-1] + self._reversed_items(), self._length + len(other))
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, list):
+            return PList(other) + self
+        return NotImplemented
+
+    def __mul__(self, count):
+        if not isinstance(count, int):
+            return NotImplemented
+        return PList._from_store(self._reversed_items() * count, max(count, 0) * self._length)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        if isinstance(other, PList):
+            return self._length == other._length and self._reversed_items() == other._reversed_items()
+        if isinstance(other, list):
+            return self._length == len(other) and list(self) == other
+        return NotImplemented
+
+    def __lt__(self, other):
+        if not isinstance(other, (PList, list)):
+            return NotImplemented
+        return list(self) < list(other)
+
+    def __le__(self, other):
+        if not isinstance(other, (PList, list)):
+            return NotImplemented
+        return list(self) <= list(other)
+
+    def __gt__(self, other):
+        if not isinstance(other, (PList, list)):
+            return NotImplemented
+        return list(self) > list(other)
+
+    def __ge__(self, other):
+        if not isinstance(other, (PList, list)):
+            return NotImplemented
+        return list(self) >= list(other)
+
+    # Unhashable, like the Python lists it replaces.
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,111 @@
+from nelox.scanner import is_alpha
+from nelox.token_type import TokenType
+
+# Lexer modes: between tokens, or inside an identifier, number, string or comment.
+BETWEEN = 0
+IDENTIFIER = 1
+NUMBER = 2
+STRING = 3
+COMMENT = 4
+
+ATOM_TOKENS = frozenset({TokenType.LEFT_PAREN, TokenType.IDENTIFIER, TokenType.NUMBER, TokenType.STRING})
+TOP_LEVEL_TOKENS = ATOM_TOKENS | {TokenType.EOF}
+NESTED_TOKENS = ATOM_TOKENS | {TokenType.RIGHT_PAREN}
+
+
+def _step(mode, depth, c):
+    """Return (mode, depth) after reading `c`, or None if `c` makes the prefix invalid."""
+    if mode == STRING:
+        return (BETWEEN, depth) if c == '"' else (STRING, depth)
+    if mode == COMMENT:
+        return (BETWEEN, depth) if c == '\n' else (COMMENT, depth)
+    if mode == IDENTIFIER:
+        if not (c.isspace() or c in '()"'):
+            return IDENTIFIER, depth
+    elif mode == NUMBER:
+        if c.isdigit():
+            return (NUMBER, depth) if c.isdecimal() else None
+
+    # Between tokens, or the identifier/number just ended and `c` starts over.
+    if c == '(':
+        return BETWEEN, depth + 1
+    if c == ')':
+        return (BETWEEN, depth - 1) if depth > 0 else None
+    if c in ' \r\t\n':
+        return BETWEEN, depth
+    if c == '$':
+        return COMMENT, depth
+    if c == '"':
+        return STRING, depth
+    if c in "+-*/<>=!" or is_alpha(c):
+        return IDENTIFIER, depth
+    if c.isdigit():
+        return (NUMBER, depth) if c.isdecimal() else None
+    return None
+
+
+class PrefixParser:
+    """Resumable recognizer for prefixes of Nelox programs.
+
+    Follows the rules of Scanner and Parser, but keeps only the lexer mode and
+    the number of open lists, so feeding a character or token is O(1) and
+    copying the state is cheap. Meant for pruning sampled programs as soon as
+    their prefix can no longer be completed into a valid program.
+    """
+
+    def __init__(self):
+        self.mode = BETWEEN
+        self.depth = 0
+        self.line = 1
+
+    def copy(self):
+        clone = PrefixParser.__new__(PrefixParser)
+        clone.mode = self.mode
+        clone.depth = self.depth
+        clone.line = self.line
+        return clone
+
+    def feed(self, text: str):
+        mode, depth, line = self.mode, self.depth, self.line
+        for c in text:
+            state = _step(mode, depth, c)
+            if state is None:
+                if c == ')' and mode not in (STRING, COMMENT):
+                    raise SyntaxError(f"[line {line}] Unexpected token: {TokenType.RIGHT_PAREN}")
+                raise SyntaxError(f"[line {line}] Unexpected character: '{c}'")
+            mode, depth = state
+            if c == '\n':
+                line += 1
+        self.mode, self.depth, self.line = mode, depth, line
+
+    def feed_token(self, token_type: TokenType):
+        if self.mode not in (BETWEEN, COMMENT):
+            raise ValueError("Cannot feed a token in the middle of a token")
+        if token_type not in self.expected_tokens():
+            raise SyntaxError(f"[line {self.line}] Unexpected token: {token_type}")
+        if token_type == TokenType.LEFT_PAREN:
+            self.depth += 1
+        elif token_type == TokenType.RIGHT_PAREN:
+            self.depth -= 1
+        self.mode = BETWEEN
+
+    def accepts(self, text: str) -> bool:
+        mode, depth = self.mode, self.depth
+        for c in text:
+            state = _step(mode, depth, c)
+            if state is None:
+                return False
+            mode, depth = state
+        return True
+
+    def accepts_char(self, c: str) -> bool:
+        return _step(self.mode, self.depth, c) is not None
+
+    def can_end(self) -> bool:
+        return self.depth == 0 and self.mode != STRING
+
+    def expected_tokens(self):
+        # Token types that may follow the tokens completed so far.
+        if self.mode == STRING:
+            return frozenset()
+        return NESTED_TOKENS if self.depth > 0 else TOP_LEVEL_TOKENS
@@ -0,0 +1,216 @@
+import time
+
+from nelox.Expr import Variable, List
+from nelox.interpreter import (Interpreter, Function, LAMBDA, FUNC, TAIL, APPEND, REVERSE, PUSH,
+                               READ_INTS)
+from nelox.symbols import intern, symbol_name
+
+PROGRAM = "<program>"
+
+# Forms and builtins, by name, whose result is a new list or function.
+ALLOCATING = frozenset({TAIL, APPEND, REVERSE, PUSH, READ_INTS, LAMBDA, FUNC}) | frozenset(
+    intern(name) for name in ("list", "to-list", "all-unique", "range", "map", "filter", "sort"))
+
+
+class Stats:
+    __slots__ = ("calls", "total_ns", "self_ns", "allocations")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.self_ns = 0
+        self.allocations = 0
+
+
+class ProfiledFunction(Function):
+    # A Function that carries the name the profiler reports it under.
+
+    __slots__ = ("name",)
+
+    def __init__(self, interpreter, params, body, env, name):
+        super().__init__(interpreter, params, body, env)
+        self.name = name
+
+
+class CallNode:
+    # A node of the call tree: one function reached through one chain of callers.
+    __slots__ = ("name", "children", "self_ns")
+
+    def __init__(self, name):
+        self.name = name
+        self.children = {}
+        self.self_ns = 0
+
+
+def line_of(expr):
+    """The source line of a form: that of its first name, or 0 if it has none."""
+    stack = [expr]
+    while stack:
+        expr = stack.pop()
+        if isinstance(expr, Variable):
+            return expr.name.line
+        if isinstance(expr, List):
+            stack.extend(reversed(expr.elements))
+    return 0
+
+
+class ProfilingInterpreter(Interpreter):
+    """Tree walker that measures where a Nelox program spends its time.
+
+    Time is charged to the function running (named by the `func`, `define`
+    or `set` that first bound it, or <lambda:line> of the form that made
+    it), to the source line of
+    the innermost form being evaluated, and to the chain of calls leading
+    to it. For every function it counts calls, total time (outermost
+    recursive call only) and self time; for every line, the evaluations of
+    forms that start on it. Allocations are call frames and the forms and
+    builtins in ALLOCATING that make a new list or function. Tail calls are
+    trampolined as in the tree walker, each bounce charged as a call of its
+    own. report() and collapsed_stacks() export the results.
+    """
+
+    def __init__(self, io=None, fuel=None):
+        super().__init__(io, fuel)
+        self.by_function = {PROGRAM: Stats()}
+        self.by_line = {}
+        self.root = CallNode(PROGRAM)
+        self.node = self.root
+        self.current = self.by_function[PROGRAM]
+        self.line = 0
+        self.line_stats = None
+        self.active = {}
+        self.form_lines = {}
+        self.last = time.perf_counter_ns()
+
+    def charge(self):
+        now = time.perf_counter_ns()
+        elapsed = now - self.last
+        self.last = now
+        self.node.self_ns += elapsed
+        self.current.self_ns += elapsed
+        if self.line_stats is not None:
+            self.line_stats.self_ns += elapsed
+
+    def interpret(self, expressions):
+        program = self.by_function[PROGRAM]
+        program.calls += 1
+        self.last = start = time.perf_counter_ns()
+        try:
+            return super().interpret(expressions)
+        finally:
+            self.charge()
+            program.total_ns += self.last - start
+
+    def evaluate(self, expr, env):
+        if type(expr) is not List or not expr.elements:
+            return Interpreter.evaluate(self, expr, env)
+        line = self.form_lines.get(expr)
+        if line is None:
+            line = self.form_lines[expr] = line_of(expr)
+        stats = self.by_line.get(line)
+        if stats is None:
+            stats = self.by_line[line] = Stats()
+        stats.calls += 1
+        head = expr.elements[0]
+        if type(head) is Variable and head.symbol in ALLOCATING:
+            stats.allocations += 1
+            self.current.allocations += 1
+        if stats is self.line_stats:
+            return Interpreter.evaluate(self, expr, env)
+
+        self.charge()
+        outer = self.line, self.line_stats
+        self.line, self.line_stats = line, stats
+        try:
+            return Interpreter.evaluate(self, expr, env)
+        finally:
+            self.charge()
+            self.line, self.line_stats = outer
+
+    def call_body(self, function, call_args):
+        name = self.function_name(function)
+        self.charge()
+        stats = self.by_function.get(name)
+        if stats is None:
+            stats = self.by_function[name] = Stats()
+        stats.calls += 1
+        stats.allocations += 1
+        caller_node, caller_stats, caller_line = self.node, self.current, (self.line, self.line_stats)
+        node = caller_node.children.get(name)
+        if node is None:
+            node = caller_node.children[name] = CallNode(name)
+        self.node, self.current = node, stats
+        depth = self.active.get(name, 0)
+        self.active[name] = depth + 1
+        start = self.last
+        try:
+            return Interpreter.call_body(self, function, call_args)
+        finally:
+            self.charge()
+            self.active[name] = depth
+            if not depth:
+                stats.total_ns += self.last - start
+            self.node, self.current = caller_node, caller_stats
+            self.line, self.line_stats = caller_line
+
+    # Function names
+
+    @staticmethod
+    def function_name(function):
+        return getattr(function, "name", "<lambda>")
+
+    @staticmethod
+    def name_function(value, name):
+        if isinstance(value, ProfiledFunction) and value.name.startswith("<"):
+            value.name = symbol_name(name.symbol)
+
+    def eval_lambda(self, args, env):
+        param_names = [tok.symbol for tok in args[0].elements]
+        # The line of the lambda form, which evaluate is running.
+        return ProfiledFunction(self, param_names, args[1:], env, f"<lambda:{self.line}>")
+
+    def eval_func(self, args, env):
+        value = super().eval_func(args, env)
+        self.name_function(value, args[0])
+        return value
+
+    def eval_define(self, args, env):
+        value = super().eval_define(args, env)
+        self.name_function(value, args[0])
+        return value
+
+    def eval_set(self, args, env):
+        value = super().eval_set(args, env)
+        self.name_function(value, args[0])
+        return value
+
+    # Reports
+
+    def report(self, limit=20) -> str:
+        """Text tables of the functions and lines with the most self time."""
+        rows = ["function                         calls    total ms     self ms    allocs"]
+        functions = sorted(self.by_function.items(), key=lambda item: -item[1].self_ns)
+        for name, stats in functions[:limit]:
+            rows.append(f"{name:<28} {stats.calls:>9} {stats.total_ns / 1e6:>11.3f} "
+                        f"{stats.self_ns / 1e6:>11.3f} {stats.allocations:>9}")
+        rows.append("")
+        rows.append("line                             evals     self ms    allocs")
+        lines = sorted(self.by_line.items(), key=lambda item: -item[1].self_ns)
+        for line, stats in lines[:limit]:
+            rows.append(f"{line:<28} {stats.calls:>9} {stats.self_ns / 1e6:>11.3f} {stats.allocations:>9}")
+        return "\n".join(rows) + "\n"
+
+    def collapsed_stacks(self) -> str:
+        """Self time per call chain in microseconds, one "a;b;c 123" line each,
+        the input format of flamegraph.pl and compatible tools."""
+        rows = []
+        stack = [(self.root, self.root.name)]
+        while stack:
+            node, path = stack.pop()
+            microseconds = node.self_ns // 1000
+            if microseconds:
+                rows.append(f"{path} {microseconds}")
+            for name, child in node.children.items():
+                stack.append((child, f"{path};{name}"))
+        rows.sort()
+        return "".join(row + "\n" for row in rows)
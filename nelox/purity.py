@@ -0,0 +1,271 @@
+from collections import Counter, OrderedDict, namedtuple
+
+from nelox.Expr import Literal, Variable, List
+from nelox.interpreter import (Interpreter, Function, TailCall, FUNC, DEFINE, SET, IF, LAMBDA, WHILE,
+                               AND, OR, HEAD, TAIL, APPEND, REVERSE, PUSH, EMPTY, READ_LINE,
+                               FOR, READ_INT, READ_INTS, UNDERSCORE, PURE_BUILTINS)
+from nelox.optimizer import bound_names
+
+ASSIGNING_FORMS = frozenset({SET, READ_LINE, READ_INT, READ_INTS})
+# Forms that bind names or make functions, the ones PurityAnalysis.collect looks at.
+NAMING_FORMS = ASSIGNING_FORMS | {DEFINE, FUNC, LAMBDA, FOR}
+# Special forms that evaluate all their arguments and have no effect of their own.
+EVALUATING_FORMS = frozenset({IF, AND, OR, WHILE, HEAD, TAIL, APPEND, REVERSE, PUSH, EMPTY})
+
+MemoInfo = namedtuple("MemoInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def lambda_key(args):
+    """Identify a lambda by the nodes it is made of: (params, *body).
+
+    This is what Interpreter.eval_lambda receives, for `lambda` forms and
+    for `func` forms (whose body is only their first body form).
+    """
+    return tuple(args)
+
+
+class PurityAnalysis:
+    """Finds the lambdas of a program whose calls can be memoized.
+
+    A lambda is pure when its body only sets its own locals (parameters,
+    names defined earlier in the body, `for` variables), does not print,
+    read or create functions, reads no variable that can change after it
+    is bound, and calls only pure builtins and pure functions. Functions
+    are known by name when the name is bound exactly once, by a `func` or a
+    `define` of a lambda; mutual recursion is handled by assuming functions
+    pure until a callee turns out not to be.
+
+    `pure` holds the lambda_key of every pure lambda.
+    """
+
+    def __init__(self, expressions):
+        self.bindings = Counter()
+        self.assignments = Counter()
+        self.lambdas = {}
+        self.functions = {}
+        self.collect(expressions)
+
+        self.callees = {}
+        candidates = set()
+        for key, (params, body) in self.lambdas.items():
+            self.callees[key] = set()
+            if self.visit_body(body, set(params), self.callees[key]):
+                candidates.add(key)
+        self.pure = self.fixpoint(candidates)
+
+    def collect(self, expressions):
+        # One walk over the program: bindings, assignments, lambdas, and the
+        # names functions are bound to.
+        functions = []
+        stack = list(expressions)
+        while stack:
+            expr = stack.pop()
+            if not isinstance(expr, List) or not expr.elements:
+                continue
+            stack.extend(expr.elements)
+            head, args = expr.elements[0], expr.elements[1:]
+            symbol = head.symbol if isinstance(head, Variable) else None
+            if symbol not in NAMING_FORMS:
+                continue
+            names = [name.symbol for name in bound_names(expr)]
+            self.bindings.update(names)
+            if symbol in ASSIGNING_FORMS:
+                self.assignments.update(names)
+            elif symbol == FUNC and len(args) >= 3:
+                functions.append((args[0], self.add_lambda([args[1], args[2]])))
+            elif symbol == LAMBDA and args:
+                self.add_lambda(args)
+            elif symbol == DEFINE and len(args) >= 2 and isinstance(args[1], List):
+                value = args[1].elements
+                if value and isinstance(value[0], Variable) and value[0].symbol == LAMBDA:
+                    functions.append((args[0], self.add_lambda(value[1:])))
+        for name, key in functions:
+            self.add_function(name, key)
+
+    def add_lambda(self, args):
+        params = args[0]
+        if not isinstance(params, List) or not all(isinstance(p, Variable) for p in params.elements):
+            return None
+        key = lambda_key(args)
+        self.lambdas[key] = ([p.symbol for p in params.elements], args[1:])
+        return key
+
+    def add_function(self, name, key):
+        if key is not None and isinstance(name, Variable) and self.immutable(name.symbol):
+            self.functions[name.symbol] = key
+
+    def immutable(self, symbol):
+        # Bound at most once and never assigned: every lookup that succeeds
+        # finds the same value.
+        return (symbol != UNDERSCORE and self.bindings[symbol] <= 1
+                and not self.assignments[symbol])
+
+    def fixpoint(self, candidates):
+        pure = set(candidates)
+        changed = True
+        while changed:
+            changed = False
+            for key in list(pure):
+                if not self.callees[key] <= pure:
+                    pure.discard(key)
+                    changed = True
+        return pure
+
+    def visit_body(self, forms, local, callees):
+        # Names defined by a form of the body are local for the forms after it.
+        local = set(local)
+        for expr in forms:
+            if not self.visit(expr, local, callees):
+                return False
+            if (isinstance(expr, List) and len(expr.elements) >= 2
+                    and isinstance(expr.elements[0], Variable) and expr.elements[0].symbol == DEFINE
+                    and isinstance(expr.elements[1], Variable)):
+                local.add(expr.elements[1].symbol)
+        return True
+
+    def visit(self, expr, local, callees):
+        """Whether `expr` is pure; adds the functions it calls to `callees`."""
+        if isinstance(expr, Literal):
+            return True
+        if isinstance(expr, Variable):
+            return expr.symbol in local or self.immutable(expr.symbol)
+        if not isinstance(expr, List) or not expr.elements:
+            return True
+
+        head, args = expr.elements[0], expr.elements[1:]
+        symbol = head.symbol if isinstance(head, Variable) else None
+        if symbol == DEFINE:
+            return all(self.visit(arg, local, callees) for arg in args[1:])
+        if symbol == SET:
+            target = args[0] if args else None
+            return (isinstance(target, Variable) and target.symbol in local
+                    and all(self.visit(arg, local, callees) for arg in args[1:]))
+        if symbol == FOR:
+            if not args or not isinstance(args[0], Variable):
+                return False
+            return (all(self.visit(arg, local, callees) for arg in args[1:3])
+                    and all(self.visit(arg, local | {args[0].symbol}, callees) for arg in args[3:]))
+        if symbol in EVALUATING_FORMS:
+            return all(self.visit(arg, local, callees) for arg in args)
+        if symbol in (FUNC, LAMBDA, READ_LINE, READ_INT, READ_INTS):
+            return False
+
+        if symbol is None or symbol in local:
+            return False
+        if symbol in self.functions:
+            callees.add(self.functions[symbol])
+        elif not (symbol in PURE_BUILTINS and self.immutable(symbol) and not self.bindings[symbol]):
+            return False
+        return all(self.visit(arg, local, callees) for arg in args)
+
+
+class MemoCache:
+    """Bounded LRU of results of pure function calls, shared by an interpreter.
+
+    Entries are keyed on the function and the types and values of the
+    arguments, so 1, 1.0 and true are different arguments. Calls with an
+    unhashable argument are not cached.
+
+    A call runs the trampoline of its tail calls here, and every memoizable
+    call along it gets the final result, so a TailCall is never cached.
+
+    Programs run one after another share the global environment, so purity
+    is worked out again over all of them each time a new one is analyzed:
+    a later program may assign a name an earlier function reads.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.programs = []
+        self.pure = set()
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, expressions):
+        self.programs.extend(expressions)
+        self.pure = PurityAnalysis(self.programs).pure
+        self.results.clear()
+
+    def call(self, function, args):
+        pending = []
+        result = TailCall(function, args)
+        while type(result) is TailCall:
+            function, args = result.function, result.args
+            key = self.key(function, args)
+            if key is not None:
+                cached = self.results.get(key, self)
+                if cached is not self:
+                    self.hits += 1
+                    self.results.move_to_end(key)
+                    result = cached
+                    break
+                self.misses += 1
+                pending.append(key)
+            result = function.interpreter.call_body(function, args)
+        for key in pending:
+            self.results[key] = result
+            if len(self.results) > self.maxsize:
+                self.results.popitem(last=False)
+        return result
+
+    def key(self, function, args):
+        # The cache key of a call, or None if it must not be cached.
+        if (not isinstance(function, MemoizedFunction) or len(args) != len(function.params)
+                or function.key not in self.pure):
+            # A missing parameter is looked up outside the function.
+            return None
+        key = (function, tuple((type(arg), arg) for arg in args))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def cache_info(self) -> MemoInfo:
+        return MemoInfo(self.hits, self.misses, self.maxsize, len(self.results))
+
+    def clear(self):
+        self.results.clear()
+        self.hits = self.misses = 0
+
+
+class MemoizedFunction(Function):
+    # A Function whose calls go through the interpreter's MemoCache, which
+    # caches those with all arguments given while its lambda is still known
+    # to be pure. Tail calls of it reach the cache when made from inside
+    # MemoCache.call.
+
+    __slots__ = ("key",)
+
+    def __init__(self, interpreter, params, body, env, key):
+        super().__init__(interpreter, params, body, env)
+        self.key = key
+
+    def __call__(self, *args):
+        return self.interpreter.memo.call(self, args)
+
+
+class MemoizingInterpreter(Interpreter):
+    """Interpreter that memoizes the functions PurityAnalysis proves pure.
+
+    Each program is analyzed as a whole before it runs, so interpret_iter
+    reads all of its expressions first. Results of all functions share one
+    LRU of `maxsize` entries; `memo.cache_info()` has the statistics.
+    """
+
+    def __init__(self, maxsize=1024, io=None, fuel=None):
+        super().__init__(io, fuel)
+        self.memo = MemoCache(maxsize)
+
+    def interpret_iter(self, expressions):
+        expressions = list(expressions)
+        self.memo.analyze(expressions)
+        return super().interpret_iter(expressions)
+
+    def eval_lambda(self, args, env):
+        key = lambda_key(args)
+        if key not in self.memo.pure:
+            return super().eval_lambda(args, env)
+        param_names = [tok.symbol for tok in args[0].elements]
+        return MemoizedFunction(self, param_names, args[1:], env, key)
@@ -0,0 +1,307 @@
+from nelox.Expr import Variable, List
+from nelox.compiler import CompilingInterpreter
+from nelox.interpreter import Interpreter, FUNC, DEFINE, LAMBDA, FOR, READ_INT, READ_INTS
+from nelox.symbols import symbol_name
+
+
+class Unset:
+    def __repr__(self):
+        return "UNSET"
+
+
+# Value of a slot whose variable has not been defined (yet) in its frame.
+UNSET = Unset()
+
+
+class Scope:
+    """Compile-time layout of a frame: the slot of every name it may define.
+
+    A scope belongs to a function body or to one iteration of a `for` loop;
+    the global scope is None and stays a dict-based Environment.
+    """
+
+    def __init__(self, parent, symbols):
+        self.parent = parent
+        self.slots = {}
+        for symbol in symbols:
+            if symbol not in self.slots:
+                self.slots[symbol] = len(self.slots)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def resolve(self, symbol):
+        """Return (depth, slot) of the innermost scope that may define `symbol`, or None."""
+        depth = 0
+        scope = self
+        while scope is not None:
+            slot = scope.slots.get(symbol)
+            if slot is not None:
+                return depth, slot
+            scope = scope.parent
+            depth += 1
+        return None
+
+
+def declarations(forms):
+    """Names that evaluating `forms` may define in the current frame.
+
+    Over-approximates: a declared name that is never defined at run time just
+    keeps an UNSET slot, and lookups continue in the enclosing frames.
+    """
+    symbols = []
+    stack = list(reversed(forms))
+    while stack:
+        expr = stack.pop()
+        if not isinstance(expr, List) or not expr.elements:
+            continue
+        head, args = expr.elements[0], expr.elements[1:]
+        symbol = head.symbol if isinstance(head, Variable) else None
+        if symbol == LAMBDA:
+            continue
+        if symbol in (DEFINE, FUNC, READ_INT, READ_INTS):
+            names = args if symbol == READ_INTS else args[:1]
+            symbols.extend(name.symbol for name in names if isinstance(name, Variable))
+            if symbol == FUNC:
+                continue
+        elif symbol == FOR:
+            # The body runs in a frame of its own; only the bounds run here.
+            stack.extend(reversed(args[1:3]))
+            continue
+        stack.extend(reversed(expr.elements))
+    return symbols
+
+
+class FrameValues:
+    # Dict-like view of the defined slots of a frame, for code written
+    # against Environment.values (the tree walker's find_env and set).
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def __contains__(self, name):
+        slot = self.frame.scope.slots.get(name)
+        return slot is not None and self.frame.slots[slot] is not UNSET
+
+    def __getitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        return self.frame.slots[self.frame.scope.slots[name]]
+
+    def __setitem__(self, name, value):
+        self.frame.slots[self.frame.scope.slots[name]] = value
+
+
+class Frame:
+    """Variables of one function call or loop iteration, in slots laid out by a Scope.
+
+    Compiled code reads and writes slots by index; Frame also offers the
+    Environment methods, by name, for the tree walker and the read forms.
+    """
+
+    __slots__ = ("scope", "parent", "slots")
+
+    def __init__(self, scope, parent, slots):
+        self.scope = scope
+        self.parent = parent
+        self.slots = slots
+
+    @property
+    def values(self):
+        return FrameValues(self)
+
+    def find_env(self, name):
+        slot = self.scope.slots.get(name)
+        if slot is not None and self.slots[slot] is not UNSET:
+            return self
+        return self.parent.find_env(name)
+
+    def get(self, name):
+        slot = self.scope.slots.get(name)
+        if slot is not None and self.slots[slot] is not UNSET:
+            return self.slots[slot]
+        return self.parent.get(name)
+
+    def define(self, name, value):
+        slot = self.scope.slots.get(name)
+        if slot is None:
+            raise RuntimeError(f"Variable '{symbol_name(name)}' has no slot in this frame")
+        if self.slots[slot] is not UNSET:
+            raise RuntimeError(f"Variable '{symbol_name(name)}' is already defined")
+        self.slots[slot] = value
+
+    def set(self, name, value):
+        slot = self.scope.slots.get(name)
+        if slot is not None and self.slots[slot] is not UNSET:
+            self.slots[slot] = value
+        else:
+            self.parent.set(name, value)
+
+
+class ResolvingInterpreter(CompilingInterpreter):
+    """CompilingInterpreter with variables resolved to frame slots at compile time.
+
+    Function calls and `for` iterations get a Frame instead of a dict-based
+    Environment, every local reference is compiled to its (depth, slot)
+    address and every other reference to a lookup in the global dict. A slot
+    that is still UNSET (a conditional `define` that did not run, a missing
+    argument) falls back to a lookup by name in the enclosing frames, which
+    is what the tree walker would have found. Like CompilingInterpreter, it
+    does not eliminate tail calls.
+    """
+
+    def __init__(self, io=None, fuel=None):
+        super().__init__(io, fuel)
+        self.scope = None
+
+    def evaluate(self, expr, env):
+        # Compiled code is only valid for the frame layout it was compiled
+        # against; nodes reached inside a frame by the tree walker fallback
+        # are walked by name.
+        if env is self.global_env:
+            return super().evaluate(expr, env)
+        return Interpreter.evaluate(self, expr, env)
+
+    def compile_in_scope(self, scope, compile_, *args):
+        outer = self.scope
+        self.scope = scope
+        try:
+            return compile_(*args)
+        finally:
+            self.scope = outer
+
+    def resolve(self, symbol):
+        return self.scope.resolve(symbol) if self.scope is not None else None
+
+    def compile_variable(self, symbol):
+        address = self.resolve(symbol)
+        if address is None:
+            global_env = self.global_env
+            values = global_env.values
+
+            def global_variable(env):
+                try:
+                    return values[symbol]
+                except KeyError:
+                    # Not a global: a library builtin, or undefined.
+                    return global_env.get(symbol)
+            return global_variable
+
+        depth, slot = address
+        if depth == 0:
+            def local_variable(env):
+                value = env.slots[slot]
+                if value is UNSET:
+                    return env.parent.get(symbol)
+                return value
+            return local_variable
+
+        def outer_variable(env):
+            for _ in range(depth):
+                env = env.parent
+            value = env.slots[slot]
+            if value is UNSET:
+                return env.parent.get(symbol)
+            return value
+        return outer_variable
+
+    def compile_set(self, args):
+        symbol = args[0].symbol
+        value_code = self.compile_node(args[1])
+        address = self.resolve(symbol)
+        if address is None:
+            global_env = self.global_env
+            values = global_env.values
+
+            def set_global(env):
+                value = value_code(env)
+                if symbol in values:
+                    values[symbol] = value
+                else:
+                    global_env.set(symbol, value)
+                return value
+            return set_global
+
+        depth, slot = address
+
+        def set_local(env):
+            value = value_code(env)
+            frame = env
+            for _ in range(depth):
+                frame = frame.parent
+            if frame.slots[slot] is UNSET:
+                frame.parent.set(symbol, value)
+            else:
+                frame.slots[slot] = value
+            return value
+        return set_local
+
+    def compile_definition(self, symbol, value_code):
+        if self.scope is None:
+            def define_global(env):
+                value = value_code(env)
+                env.define(symbol, value)
+                return value
+            return define_global
+
+        slot = self.scope.slots[symbol]
+
+        def define_local(env):
+            value = value_code(env)
+            slots = env.slots
+            if slots[slot] is not UNSET:
+                raise RuntimeError(f"Variable '{symbol_name(symbol)}' is already defined")
+            slots[slot] = value
+            return value
+        return define_local
+
+    def compile_define(self, args):
+        symbol = args[0].symbol
+        return self.compile_definition(symbol, self.compile_node(args[1]))
+
+    def compile_func(self, args):
+        lambda_args = [args[1], args[2]]
+        symbol = args[0].symbol
+        return self.compile_definition(symbol, self.compile_lambda(lambda_args))
+
+    def compile_lambda(self, args):
+        param_names = [tok.symbol for tok in args[0].elements]
+        body_exprs = args[1:]
+        scope = Scope(self.scope, param_names + declarations(body_exprs))
+        param_count = len(param_names)
+        padding = [UNSET] * (len(scope) - param_count)
+        distinct = len(set(param_names)) == param_count
+        body = None
+
+        def make_function(env):
+            def fn(*call_args):
+                nonlocal body
+                if body is None:
+                    body = self.metered(self.compile_in_scope(scope, self.compile_body, body_exprs))
+                if distinct and len(call_args) == param_count:
+                    return body(Frame(scope, env, [*call_args, *padding]))
+                # Missing arguments stay UNSET; a repeated parameter name
+                # fails like a second define, as in the tree walker.
+                frame = Frame(scope, env, [UNSET] * len(scope))
+                for pname, param_val in zip(param_names, call_args):
+                    frame.define(pname, param_val)
+                return body(frame)
+            return fn
+        return make_function
+
+    def compile_for(self, args):
+        symbol = args[0].symbol
+        start_code = self.compile_node(args[1])
+        end_code = self.compile_node(args[2])
+        scope = Scope(self.scope, [symbol] + declarations([args[3]]))
+        body = self.metered(self.compile_in_scope(scope, self.compile_node, args[3]))
+        padding = [UNSET] * (len(scope) - 1)
+
+        def for_(env):
+            start = start_code(env)
+            end = end_code(env)
+            result = None
+            for i in range(start, end):
+                result = body(Frame(scope, env, [i, *padding]))
+            return result
+        return for_
@@ -0,0 +1,230 @@
+import operator
+from collections import Counter
+
+from nelox.Expr import Literal, Variable, List
+from nelox.interpreter import (Interpreter, Specialized, FUNC, DEFINE, SET, IF, LAMBDA, WHILE,
+                               AND, OR, HEAD, TAIL, APPEND, REVERSE, PUSH, EMPTY, READ_LINE,
+                               FOR, READ_INT, READ_INTS, UNDERSCORE)
+from nelox.optimizer import bound_names
+from nelox.plist import PList
+from nelox.symbols import intern
+
+SPECIAL_FORMS = frozenset({FUNC, DEFINE, SET, IF, LAMBDA, WHILE, AND, OR, HEAD, TAIL, APPEND,
+                           REVERSE, PUSH, EMPTY, READ_LINE, FOR, READ_INT, READ_INTS})
+CONSTANTS = frozenset({intern("true"), intern("false")})
+
+
+def _get(seq, index):
+    # 'get' once the sequence and index types are known.
+    try:
+        return seq[index]
+    except IndexError:
+        raise RuntimeError("'get': index out of bounds")
+
+
+COMPARISONS = (("<", operator.lt), (">", operator.gt), ("<=", operator.le), (">=", operator.ge),
+               ("=", operator.eq), ("!=", operator.ne))
+
+# (builtin, left type, right type) -> (operation, result type)
+SPECIALIZATIONS = {}
+for _name, _operation in (("+", operator.add), ("-", operator.sub), ("*", operator.mul),
+                          ("div", operator.floordiv), ("mod", operator.mod)):
+    SPECIALIZATIONS[intern(_name), int, int] = (_operation, int)
+SPECIALIZATIONS[intern("/"), int, int] = (operator.truediv, float)
+for _name, _operation in COMPARISONS:
+    SPECIALIZATIONS[intern(_name), int, int] = (_operation, bool)
+    SPECIALIZATIONS[intern(_name), str, str] = (_operation, bool)
+SPECIALIZATIONS[intern("+"), str, str] = (operator.add, str)
+SPECIALIZATIONS[intern("+"), PList, PList] = (operator.add, PList)
+SPECIALIZATIONS[intern("="), PList, PList] = (operator.eq, bool)
+SPECIALIZATIONS[intern("!="), PList, PList] = (operator.ne, bool)
+SPECIALIZATIONS[intern("get"), PList, int] = (_get, None)
+SPECIALIZATIONS[intern("get"), str, int] = (_get, str)
+SPECIALIZABLE = frozenset(key[0] for key in SPECIALIZATIONS)
+
+# Result types of the other builtins, whatever their arguments.
+RESULT_TYPES = {intern(name): result_type for name, result_type in (
+    ("list", PList), ("to-list", PList), ("all-unique", PList), ("str", str), ("to-lower", str),
+    ("to-upper", str), ("length", int), ("get-ascii", int), ("not", bool),
+    *((name, bool) for name, _ in COMPARISONS))}
+
+
+class Unconstrained:
+    # The type of a variable no binding has been seen to constrain yet.
+    def __repr__(self):
+        return "UNCONSTRAINED"
+
+
+UNCONSTRAINED = Unconstrained()
+
+
+def join(left, right):
+    if left is UNCONSTRAINED:
+        return right
+    if right is UNCONSTRAINED:
+        return left
+    return left if left is right else None
+
+
+class Specializer:
+    """Type inference and specialization of the binary builtin calls of a program.
+
+    Variable types are inferred for the whole program, without regard to
+    scope or control flow: a name has a type when every form that binds or
+    assigns it gives it a value of that type (`for` and `read-int` give
+    ints, `read-line` strings); parameters have none. Calls of arithmetic,
+    comparisons, `+` on strings and lists, and `get`, with two operands of
+    known types that are literals, variables or specialized calls, become
+    Specialized nodes, unless the program binds the builtin's name. The
+    types are checked when the node runs, and a call whose operands have
+    other types is made as written.
+
+    `calls` counts, per builtin name, the calls of the builtins that can be
+    specialized, and `specialized` those that were.
+    """
+
+    def __init__(self, expressions):
+        self.bindings = Counter()
+        self.assignments = {}
+        self.collect(expressions)
+        self.types = self.infer()
+        self.calls = Counter()
+        self.specialized = Counter()
+
+    def collect(self, expressions):
+        stack = list(expressions)
+        while stack:
+            expr = stack.pop()
+            if not isinstance(expr, List):
+                continue
+            stack.extend(expr.elements)
+            names = bound_names(expr)
+            if not names:
+                continue
+            symbol = expr.elements[0].symbol
+            for name in names:
+                self.bindings[name.symbol] += 1
+                if symbol in (DEFINE, SET) and len(expr.elements) > 2:
+                    value = expr.elements[2]
+                elif symbol in (FOR, READ_INT, READ_INTS):
+                    value = int
+                elif symbol == READ_LINE:
+                    value = str
+                else:
+                    value = None
+                self.assignments.setdefault(name.symbol, []).append(value)
+        # Once a program defines `_`, the interpreter assigns it every form's result.
+        self.assignments[UNDERSCORE] = [None]
+
+    def infer(self):
+        # Optimistic fixpoint: types only go from UNCONSTRAINED to a type to None.
+        types = dict.fromkeys(self.assignments, UNCONSTRAINED)
+        changed = True
+        while changed:
+            changed = False
+            for symbol, values in self.assignments.items():
+                if types[symbol] is None:
+                    continue
+                inferred = UNCONSTRAINED
+                for value in values:
+                    if value is not None and not isinstance(value, type):
+                        value = self.type_of(value, types)
+                    inferred = join(inferred, value)
+                    if inferred is None:
+                        break
+                if inferred is not types[symbol]:
+                    types[symbol] = inferred
+                    changed = True
+        return {symbol: inferred for symbol, inferred in types.items()
+                if inferred is not UNCONSTRAINED and inferred is not None}
+
+    def type_of(self, expr, types):
+        """The type of every value expr can have, None if unknown."""
+        if isinstance(expr, Literal):
+            return type(expr.value)
+        if isinstance(expr, Variable):
+            if expr.symbol in types:
+                return types[expr.symbol]
+            return bool if expr.symbol in CONSTANTS and not self.bindings[expr.symbol] else None
+        if isinstance(expr, Specialized):
+            return expr.result_type
+        if not isinstance(expr, List) or not expr.elements or not isinstance(expr.elements[0], Variable):
+            return None
+        symbol, args = expr.elements[0].symbol, expr.elements[1:]
+        if symbol in (TAIL, REVERSE, PUSH):
+            return PList
+        if symbol in (EMPTY, AND, OR):
+            return bool
+        if symbol == APPEND:
+            first = self.type_of(args[0], types) if args else None
+            return first if first in (PList, str, UNCONSTRAINED) else None
+        if symbol == IF:
+            return join(self.type_of(args[1], types), self.type_of(args[2], types)) if len(args) > 2 else None
+        if symbol in (DEFINE, SET):
+            return self.type_of(args[1], types) if len(args) > 1 else None
+        if symbol in SPECIAL_FORMS or self.bindings[symbol]:
+            return None
+        if symbol in SPECIALIZABLE and len(args) == 2:
+            left, right = (self.type_of(arg, types) for arg in args)
+            if left is UNCONSTRAINED or right is UNCONSTRAINED:
+                return UNCONSTRAINED
+            specialization = SPECIALIZATIONS.get((symbol, left, right))
+            if specialization is not None:
+                return specialization[1]
+        return RESULT_TYPES.get(symbol)
+
+    def specialize_program(self, expressions):
+        return [self.specialize(expr) for expr in expressions]
+
+    def specialize(self, expr):
+        if not isinstance(expr, List) or not expr.elements:
+            return expr
+        elements = [self.specialize(element) for element in expr.elements]
+        if any(new is not old for new, old in zip(elements, expr.elements)):
+            expr = List(elements)
+        head = elements[0]
+        symbol = head.symbol if isinstance(head, Variable) else None
+        if symbol not in SPECIALIZABLE or self.bindings[symbol]:
+            return expr
+        self.calls[symbol] += 1
+        if len(elements) != 3 or not all(isinstance(operand, (Literal, Variable, Specialized))
+                                         for operand in elements[1:]):
+            return expr
+        left, right = elements[1:]
+        left_type, right_type = self.type_of(left, self.types), self.type_of(right, self.types)
+        specialization = SPECIALIZATIONS.get((symbol, left_type, right_type))
+        if specialization is None:
+            return expr
+        self.specialized[symbol] += 1
+        operation, result_type = specialization
+        return Specialized(head, left, right, operation, left_type, right_type, result_type)
+
+
+def specialize(expressions):
+    """Return a copy of a program (a list of Exprs) with its typed builtin calls specialized."""
+    expressions = list(expressions)
+    return Specializer(expressions).specialize_program(expressions)
+
+
+class SpecializingInterpreter(Interpreter):
+    """Tree walker that runs programs specialized by Specializer, which needs
+    each program whole before it starts. Programs run one after another share
+    the global environment, so each is specialized with the bindings and
+    types of all of them: an earlier program may have rebound a builtin or
+    assigned a global. `calls` and `specialized` add up the Specializer
+    counts of every program run."""
+
+    def __init__(self, io=None, fuel=None):
+        super().__init__(io, fuel)
+        self.programs = []
+        self.calls = Counter()
+        self.specialized = Counter()
+
+    def interpret_iter(self, expressions):
+        expressions = list(expressions)
+        self.programs.extend(expressions)
+        specializer = Specializer(self.programs)
+        program = specializer.specialize_program(expressions)
+        self.calls.update(specializer.calls)
+        self.specialized.update(specializer.specialized)
+        return super().interpret_iter(program)
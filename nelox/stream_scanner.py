@@ -0,0 +1,64 @@
+import codecs
+from typing import Iterator
+
+from nelox.fast_scanner import scan_chunk
+from nelox.nelox_token import Token
+from nelox.token_type import TokenType
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def stream_tokens(stream, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Token]:
+    """Lazily tokenize a text file, binary file or mmap read `chunk_size` at a time.
+
+    Yields the same tokens as Scanner(stream.read()).scan_tokens(); bytes are
+    decoded as UTF-8. Only the unscanned tail of the current chunk is kept.
+    """
+    decoder = None
+    buffer = ""
+    line = 1
+    while True:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        if isinstance(chunk, str):
+            buffer += chunk
+        else:
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+            buffer += decoder.decode(chunk, final)
+
+        tokens, pos, line = scan_chunk(buffer, 0, line, final)
+        yield from tokens
+        if final:
+            return
+        buffer = buffer[pos:]
+
+
+class StreamScanner:
+    """Token cursor over `stream_tokens`, usable wherever Parser expects a Scanner.
+
+    Only the current lookahead token is held, so the parser can start working
+    before the input has been read completely.
+    """
+
+    def __init__(self, stream, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.tokens = stream_tokens(stream, chunk_size)
+        self.current_token = None
+
+    def scan_tokens(self):
+        # Tokens are produced on demand, there is nothing to do up front.
+        pass
+
+    def advance(self) -> Token:
+        token = self.peek()
+        if token.type != TokenType.EOF:
+            self.current_token = None
+        return token
+
+    def is_at_end(self) -> bool:
+        return self.peek().type == TokenType.EOF
+
+    def peek(self) -> Token:
+        if self.current_token is None:
+            self.current_token = next(self.tokens)
+        return self.current_token
@@ -0,0 +1,17 @@
+# Global symbol table: every identifier name gets a small integer id once, so
+# environments and special-form dispatch can key on ints instead of strings.
+_ids = {}
+_names = []
+
+
+def intern(name: str) -> int:
+    symbol = _ids.get(name)
+    if symbol is None:
+        symbol = len(_names)
+        _ids[name] = symbol
+        _names.append(name)
+    return symbol
+
+
+def symbol_name(symbol: int) -> str:
+    return _names[symbol]
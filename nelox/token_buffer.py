@@ -0,0 +1,109 @@
+from array import array
+
+from nelox.fast_scanner import (TOKEN_PATTERN, GROUP_TYPES, UNICODE_GROUP,
+                                finish_unicode_token, scan_tail)
+from nelox.nelox_token import Token
+from nelox.token_type import TokenType
+
+TOKEN_TYPES = list(TokenType)
+TYPE_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+
+EOF_CODE = TYPE_CODES[TokenType.EOF]
+NUMBER_CODE = TYPE_CODES[TokenType.NUMBER]
+STRING_CODE = TYPE_CODES[TokenType.STRING]
+GROUP_CODES = [None if t is None else TYPE_CODES[t] for t in GROUP_TYPES]
+
+
+class TokenBuffer:
+    """Tokens of `source` stored column-wise in packed arrays.
+
+    Token i is described by its type code, its [start, end) span in the source
+    and its line; lexemes and literals are sliced out of the source on demand.
+    Like Scanner, a TokenBuffer is also the token cursor Parser reads from.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.types = array('B')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.lines = array('I')
+        self.token_index = 0
+        self.peeked = None
+
+    def scan_tokens(self):
+        source = self.source
+        types, starts, ends, lines = self.types, self.starts, self.ends, self.lines
+        match = TOKEN_PATTERN.match
+        count = source.count
+        group_codes = GROUP_CODES
+        pos = 0
+        line = 1
+
+        while True:
+            m = match(source, pos)
+            if m is None:
+                break
+            group = m.lastindex
+            if group == UNICODE_GROUP:
+                start = m.start(group)
+                group, end = finish_unicode_token(source, start, line + count('\n', pos, start))
+            else:
+                start, end = m.span(group)
+            line += count('\n', pos, end)
+            types.append(group_codes[group])
+            starts.append(start)
+            ends.append(end)
+            lines.append(line)
+            pos = end
+
+        eof_spans, _, line = scan_tail(source, pos, line, True)
+        for start, end in eof_spans:
+            types.append(EOF_CODE)
+            starts.append(start)
+            ends.append(end)
+            lines.append(line)
+        return self
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index) -> Token:
+        return Token(self.type(index), self.lexeme(index), self.literal(index), self.lines[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def type(self, index) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def lexeme(self, index) -> str:
+        return self.source[self.starts[index]:self.ends[index]]
+
+    def literal(self, index):
+        code = self.types[index]
+        if code == NUMBER_CODE:
+            return int(self.lexeme(index))
+        if code == STRING_CODE:
+            return self.source[self.starts[index] + 1:self.ends[index] - 1]
+        return None
+
+    def line(self, index) -> int:
+        return self.lines[index]
+
+    def advance(self) -> Token:
+        if self.is_at_end():
+            return self[len(self) - 1]
+        token = self.peek()
+        self.token_index += 1
+        self.peeked = None
+        return token
+
+    def is_at_end(self) -> bool:
+        return self.types[self.token_index] == EOF_CODE
+
+    def peek(self) -> Token:
+        if self.peeked is None:
+            self.peeked = self[self.token_index]
+        return self.peeked
@@ -0,0 +1,710 @@
+import hashlib
+import re
+from collections import OrderedDict
+
+from nelox.Expr import Literal, Variable, List
+from nelox.interpreter import (Interpreter, Environment, _define_builtins, _define_library,
+                               FUNC, DEFINE, SET, IF, LAMBDA, WHILE, AND, OR, HEAD, TAIL,
+                               APPEND, REVERSE, PUSH, EMPTY, READ_LINE, FOR, READ_INT,
+                               READ_INTS, UNDERSCORE, _head, _tail, _append, _reverse,
+                               _push, _empty)
+from nelox.symbols import intern, symbol_name
+
+# Builtins whose calls become Python operators, as long as the program never
+# assigns to them: name -> (operator, number of arguments or None for 1+).
+OPERATORS = {
+    intern("+"): ("+", None),
+    intern("-"): ("-", None),
+    intern("*"): ("*", None),
+    intern("/"): ("/", None),
+    intern("div"): ("//", None),
+    intern("mod"): ("%", 2),
+    intern("<"): ("<", 2),
+    intern(">"): (">", 2),
+    intern("<="): ("<=", 2),
+    intern(">="): (">=", 2),
+    intern("="): ("==", 2),
+    intern("!="): ("!=", 2),
+}
+NOT = intern("not")
+
+# List special forms: helper name and number of arguments.
+LIST_OPERATIONS = {
+    HEAD: ("_head", 1),
+    TAIL: ("_tail", 1),
+    REVERSE: ("_reverse", 1),
+    EMPTY: ("_empty", 1),
+    APPEND: ("_append", 2),
+    PUSH: ("_push", 2),
+}
+
+CACHE_SIZE = 256
+
+
+class Unsupported(Exception):
+    pass
+
+
+class UnboundParameter:
+    def __repr__(self):
+        return "UNBOUND"
+
+
+UNBOUND = UnboundParameter()
+
+
+def _undefined(name):
+    raise RuntimeError(f"Undefined variable '{name}'")
+
+
+def _read_int(io):
+    try:
+        return io.read_int()
+    except ValueError:
+        raise RuntimeError("'read-int' expects a single integer input")
+
+
+def _read_ints(io, count):
+    try:
+        values = io.read_ints()
+    except ValueError:
+        raise RuntimeError("'read-ints' expects integer input")
+    if len(values) != count:
+        raise RuntimeError(f"'read-ints' expected {count} values, got {len(values)}")
+    return values
+
+
+RUNTIME = {
+    "_UNBOUND": UNBOUND,
+    "_undefined": _undefined,
+    "_read_int": _read_int,
+    "_read_ints": _read_ints,
+    "_head": _head,
+    "_tail": _tail,
+    "_append": _append,
+    "_reverse": _reverse,
+    "_push": _push,
+    "_empty": _empty,
+}
+
+
+def program_key(expressions) -> str:
+    """SHA-256 of the structure of a program (names, literal types and values)."""
+    digest = hashlib.sha256()
+    stack = list(reversed(expressions))
+    while stack:
+        expr = stack.pop()
+        if isinstance(expr, List):
+            digest.update(b"(")
+            stack.append(None)
+            stack.extend(reversed(expr.elements))
+        elif expr is None:
+            digest.update(b")")
+        elif isinstance(expr, Variable):
+            digest.update(b"v" + expr.name.lexeme.encode("utf-8", "surrogatepass") + b"\0")
+        elif isinstance(expr, Literal):
+            digest.update(f"l{type(expr.value).__name__}:{expr.value!r}\0".encode("utf-8", "surrogatepass"))
+        else:
+            raise RuntimeError("Unknown expression type")
+    return digest.hexdigest()
+
+
+def _head_symbol(expr):
+    if isinstance(expr, List) and expr.elements and isinstance(expr.elements[0], Variable):
+        return expr.elements[0].symbol
+    return None
+
+
+def _identifier(prefix, symbol):
+    return prefix + "_" + re.sub(r"[^0-9A-Za-z_]", "_", symbol_name(symbol))
+
+
+class Scope:
+    # A Nelox environment as the translator sees it: `bindings` holds every
+    # name defined in it (with its Python name), `defined` the ones defined
+    # so far while its body is translated in execution order.
+
+    def __init__(self, parent, function):
+        self.parent = parent
+        self.function = function
+        self.bindings = {}
+        self.defined = set()
+
+
+class Function:
+    # A Python function being generated (or the module, for global code).
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.declarations = {}
+
+
+class Translator:
+    """Translates a Nelox program into Python source.
+
+    Every Nelox binding becomes a Python variable of its own, globals and
+    builtins become module globals and lambdas become nested `def`s.
+    Programs whose behaviour depends on run-time details that Python scoping
+    cannot express (a `define` inside a loop or branch, a name that may refer
+    to either of two bindings) raise Unsupported. A `metered` translation
+    calls _burn() on every loop iteration and function call.
+    """
+
+    def __init__(self, metered=False):
+        self.metered = metered
+        self.lines = []
+        self.indent = 0
+        self.counter = 0
+        self.names = {}
+        env = Environment(parent=Environment())
+        _define_builtins(env)
+        _define_library(env.parent, env.values)
+        # Library builtins may be defined by the program, see translate().
+        self.library = frozenset(env.parent.values)
+        self.builtins = {symbol: self.new_name("b", symbol) for symbol in [*env.values, *self.library]}
+        self.builtin_names = set(self.builtins.values())
+        self.function = Function(None)
+        self.scope = Scope(None, self.function)
+        self.assigned = set()
+
+    def new_name(self, prefix, symbol=None):
+        self.counter += 1
+        if symbol is None:
+            return f"{prefix}{self.counter}"
+        name = _identifier(f"{prefix}{self.counter}", symbol)
+        self.names[name] = symbol_name(symbol)
+        return name
+
+    def emit(self, line):
+        self.lines.append("    " * self.indent + line)
+
+    def block(self, translate):
+        # Emit an indented block, with `pass` if it came out empty.
+        self.indent += 1
+        start = len(self.lines)
+        translate()
+        if len(self.lines) == start:
+            self.emit("pass")
+        self.indent -= 1
+
+    def burn(self):
+        if self.metered:
+            self.emit("_burn()")
+
+    def store(self, target, code):
+        if target is not None:
+            self.emit(f"{target} = {code}")
+
+    # Program structure
+
+    def translate(self, expressions) -> str:
+        self.assigned = assigned_symbols(expressions)
+        if any(isinstance(e, Variable) and e.symbol == UNDERSCORE for e in subexpressions(expressions)):
+            raise Unsupported("the program reads '_'")
+        self.declare(self.scope, expressions)
+        self.emit("_result = None")
+        # A global that shadows a library builtin holds the builtin until it
+        # is defined, so references to the name always see one binding.
+        for symbol, python in self.scope.bindings.items():
+            if symbol in self.library:
+                self.emit(f"{python} = {self.builtins[symbol]}")
+                self.scope.defined.add(symbol)
+        for index, expr in enumerate(expressions):
+            self.top_level(expr, "_result" if index == len(expressions) - 1 else None)
+        return "\n".join(self.lines) + "\n"
+
+    def declare(self, scope, forms, params=()):
+        # Collect the bindings of a scope body: parameters and the names
+        # defined by its top-level forms, each defined at most once.
+        for symbol in params:
+            if symbol in scope.bindings:
+                raise Unsupported("repeated parameter")
+            scope.bindings[symbol] = self.new_name("v", symbol)
+        for expr in forms:
+            symbol = _head_symbol(expr)
+            if symbol in (DEFINE, FUNC):
+                name = expr.elements[1].symbol
+                if name in scope.bindings:
+                    raise Unsupported("name defined twice in one scope")
+                if scope.parent is None and name in self.builtins and name not in self.library:
+                    raise Unsupported("global definition of a builtin")
+                scope.bindings[name] = self.new_name("v", name)
+            elif symbol in (READ_INT, READ_INTS):
+                for arg in expr.elements[1:]:
+                    name = arg.symbol
+                    if name not in scope.bindings and not (scope.parent is None and name in self.builtins):
+                        scope.bindings[name] = self.new_name("v", name)
+
+    def top_level(self, expr, target):
+        # A form of a scope body, the only place where definitions are supported.
+        symbol = _head_symbol(expr)
+        if symbol in (DEFINE, FUNC):
+            args = expr.elements[1:]
+            name = args[0].symbol
+            if symbol == DEFINE:
+                code = self.value(args[1])
+            else:
+                code = self.function_value(args[1], [args[2]], name)
+            python = self.scope.bindings[name]
+            self.emit(f"{python} = {code}")
+            self.scope.defined.add(name)
+            self.store(target, python)
+        elif symbol in (READ_INT, READ_INTS):
+            self.read_ints(symbol, expr.elements[1:], target, top_level=True)
+        else:
+            self.statement(expr, target)
+
+    # Names
+
+    def ordered_scopes(self):
+        # Scopes whose code runs in the order it is translated: the current
+        # one out to the innermost function boundary.
+        scope = self.scope
+        while scope is not None and scope.function is self.function:
+            yield scope
+            scope = scope.parent
+
+    def resolve(self, symbol):
+        """Return (kind, python name) of the binding a reference here sees.
+
+        In the ordered scopes only names already defined are visible. Code
+        outside them runs at some other time, so a name there is bound to the
+        innermost scope that defines it anywhere, provided no outer binding
+        could be the one the interpreter finds instead.
+        """
+        scope = self.scope
+        while scope is not None and scope.function is self.function:
+            if symbol in scope.defined:
+                return self.kind(scope), scope.bindings[symbol]
+            scope = scope.parent
+        kind, python = self.resolve_outer(symbol, scope)
+        return (self.kind(kind), python) if kind != "undefined" else (kind, None)
+
+    def resolve_outer(self, symbol, scope):
+        # Returns (scope or None for builtins, python name) or ("undefined", None).
+        while scope is not None:
+            if symbol in scope.bindings:
+                shadows_library = scope.parent is None and symbol in self.library
+                if not shadows_library and self.bound_outside(scope.parent, symbol):
+                    raise Unsupported(f"'{symbol_name(symbol)}' may refer to two bindings")
+                return scope, scope.bindings[symbol]
+            scope = scope.parent
+        if symbol in self.builtins:
+            return None, self.builtins[symbol]
+        return "undefined", None
+
+    def bound_outside(self, scope, symbol):
+        while scope is not None:
+            if symbol in scope.bindings:
+                return True
+            scope = scope.parent
+        return symbol in self.builtins
+
+    def kind(self, scope):
+        if scope is None or scope.function.parent is None:
+            return "global" if self.function.parent is not None else "local"
+        return "local" if scope.function is self.function else "nonlocal"
+
+    def reference(self, symbol):
+        kind, python = self.resolve(symbol)
+        if kind == "undefined":
+            return f"_undefined({symbol_name(symbol)!r})"
+        return python
+
+    def assign(self, symbol, code):
+        # Like Environment.set: assign to the binding found, fail if there is none.
+        kind, python = self.resolve(symbol)
+        if kind == "undefined":
+            self.emit(code)
+            self.emit(f"_undefined({symbol_name(symbol)!r})")
+            return
+        if kind != "local":
+            self.function.declarations[python] = kind
+        defined = any(symbol in scope.defined for scope in self.ordered_scopes())
+        if not defined and python not in self.builtin_names:
+            # The binding is outside the ordered scopes and may not exist yet.
+            temp = self.new_name("t")
+            self.emit(f"{temp} = {code}")
+            self.emit(python)
+            code = temp
+        self.emit(f"{python} = {code}")
+
+    def builtin_operator(self, head):
+        # The builtin a call head refers to, if calls to it can be inlined.
+        if not isinstance(head, Variable) or head.symbol in self.assigned:
+            return None
+        _, python = self.resolve(head.symbol)
+        return head.symbol if python == self.builtins.get(head.symbol) else None
+
+    # Expressions
+
+    def is_simple(self, expr):
+        """Whether value(expr) is a plain Python expression (emits no statements)."""
+        if not isinstance(expr, List) or not expr.elements:
+            return True
+        symbol = _head_symbol(expr)
+        if symbol in STATEMENT_FORMS:
+            return False
+        if symbol in (IF, AND, OR) or symbol in LIST_OPERATIONS:
+            return all(self.is_simple(arg) for arg in expr.elements[1:])
+        return all(self.is_simple(element) for element in expr.elements)
+
+    def values(self, exprs):
+        # Python expressions for `exprs`, evaluated left to right: the ones
+        # before the last part that needs statements are saved in temporaries.
+        last = max((i for i, e in enumerate(exprs) if not self.is_simple(e)), default=-1)
+        codes = []
+        for index, expr in enumerate(exprs):
+            code = self.value(expr)
+            if index < last and not isinstance(expr, Literal):
+                temp = self.new_name("t")
+                self.emit(f"{temp} = {code}")
+                code = temp
+            codes.append(code)
+        return codes
+
+    def value(self, expr) -> str:
+        if isinstance(expr, Literal):
+            return repr(expr.value)
+        if isinstance(expr, Variable):
+            return self.reference(expr.symbol)
+        if not isinstance(expr, List):
+            raise RuntimeError("Unknown expression type")
+        if not expr.elements:
+            return "None"
+
+        symbol = _head_symbol(expr)
+        args = expr.elements[1:]
+        if symbol in (FUNC, DEFINE, READ_INT, READ_INTS):
+            raise Unsupported("definition outside the top level of a scope")
+        if symbol == LAMBDA:
+            return self.function_value(args[0], args[1:], None)
+        if symbol in STATEMENT_FORMS or (symbol in (IF, AND, OR) and not self.is_simple(expr)):
+            temp = self.new_name("t")
+            self.statement(expr, temp)
+            return temp
+        if symbol == IF:
+            condition, then_branch, else_branch = self.values([args[0], args[1], args[2]])
+            return f"({then_branch} if {condition} else {else_branch})"
+        if symbol in (AND, OR):
+            if not args:
+                return str(symbol == AND)
+            joined = f" {'and' if symbol == AND else 'or'} ".join(self.values(args))
+            return f"(True if ({joined}) else False)"
+        if symbol in LIST_OPERATIONS:
+            name, arity = LIST_OPERATIONS[symbol]
+            operands = self.values([args[index] for index in range(arity)])
+            return f"{name}({', '.join(operands)})"
+        return self.call(expr.elements[0], args)
+
+    def call(self, head, args):
+        builtin = self.builtin_operator(head)
+        if builtin in OPERATORS:
+            operator, arity = OPERATORS[builtin]
+            if (arity is None and args) or arity == len(args):
+                return "(" + f" {operator} ".join(self.values(args)) + ")"
+        if builtin == NOT and len(args) == 1:
+            return f"(not {self.value(args[0])})"
+        function, *arguments = self.values([head, *args])
+        return f"{function}({', '.join(arguments)})"
+
+    # Statements
+
+    def statement(self, expr, target):
+        """Emit code that evaluates `expr`, assigning its value to `target` if given."""
+        symbol = _head_symbol(expr)
+        args = expr.elements[1:] if symbol is not None else ()
+        if symbol == SET:
+            code = self.value(args[1])
+            if target is not None:
+                self.emit(f"{target} = {code}")
+                code = target
+            self.assign(args[0].symbol, code)
+        elif symbol == READ_LINE:
+            temp = target or self.new_name("t")
+            self.emit(f"{temp} = _io.read_line()")
+            self.assign(args[0].symbol, temp)
+        elif symbol in (READ_INT, READ_INTS):
+            self.read_ints(symbol, args, target, top_level=False)
+        elif symbol == IF and not self.is_simple(expr):
+            then_branch, else_branch = args[1], args[2]
+            self.emit(f"if {self.value(args[0])}:")
+            self.block(lambda: self.statement(then_branch, target))
+            self.emit("else:")
+            self.block(lambda: self.statement(else_branch, target))
+        elif symbol in (AND, OR) and not self.is_simple(expr):
+            self.short_circuit(symbol, list(args), target)
+        elif symbol == WHILE:
+            self.while_loop(args, target)
+        elif symbol == FOR:
+            self.for_loop(args, target)
+        else:
+            code = self.value(expr)
+            if target is not None:
+                self.emit(f"{target} = {code}")
+            elif not isinstance(expr, Literal):
+                self.emit(code)
+
+    def short_circuit(self, symbol, operands, target):
+        # (and a b): False as soon as an operand is falsy, else True; `or` dually.
+        decided = symbol == OR
+        if not operands:
+            self.store(target, str(not decided))
+            return
+        test = "" if decided else "not "
+        self.emit(f"if {test}{self.value(operands[0])}:")
+        self.block(lambda: self.store(target, str(decided)))
+        self.emit("else:")
+        self.block(lambda: self.short_circuit(symbol, operands[1:], target))
+
+    def while_loop(self, args, target):
+        condition, body = args[0], args[1:]
+        result = target or self.new_name("t")
+        self.emit(f"{result} = None")
+        if self.is_simple(condition):
+            def loop():
+                self.burn()
+                self.forms(body, result)
+            self.emit(f"while {self.value(condition)}:")
+            self.block(loop)
+        else:
+            def loop():
+                self.emit(f"if not {self.value(condition)}:")
+                self.block(lambda: self.emit("break"))
+                self.burn()
+                self.forms(body, result)
+            self.emit("while True:")
+            self.block(loop)
+
+    def forms(self, body, target):
+        for index, expr in enumerate(body):
+            self.statement(expr, target if index == len(body) - 1 else None)
+
+    def for_loop(self, args, target):
+        symbol = args[0].symbol
+        body = args[3]
+        if any(_head_symbol(e) in (LAMBDA, FUNC) for e in subexpressions([body])):
+            raise Unsupported("closure in a for loop body")
+        start, end = self.values([args[1], args[2]])
+        result = target or self.new_name("t")
+        self.emit(f"{result} = None")
+        scope = Scope(self.scope, self.function)
+        self.declare(scope, [body], [symbol])
+        scope.defined.add(symbol)
+        outer = self.scope
+        self.scope = scope
+        try:
+            def loop():
+                self.burn()
+                self.top_level(body, result)
+            self.emit(f"for {scope.bindings[symbol]} in range({start}, {end}):")
+            self.block(loop)
+        finally:
+            self.scope = outer
+
+    def read_ints(self, symbol, args, target, top_level):
+        if not args or (symbol == READ_INT and len(args) != 1):
+            raise Unsupported("read-int(s) with a wrong number of variables")
+        symbols = [arg.symbol for arg in args]
+        temp = self.new_name("t")
+        if symbol == READ_INT:
+            self.emit(f"{temp} = _read_int(_io)")
+            values = [temp]
+        else:
+            self.emit(f"{temp} = _read_ints(_io, {len(symbols)})")
+            values = [f"{temp}[{index}]" for index in range(len(symbols))]
+        for name, code in zip(symbols, values):
+            # Like the interpreter: assign if the name is bound, else define it here.
+            kind, python = self.resolve(name)
+            if any(name in scope.defined for scope in self.ordered_scopes()) or python in self.builtin_names:
+                self.assign(name, code)
+            elif kind == "undefined" and top_level:
+                self.emit(f"{self.scope.bindings[name]} = {code}")
+                self.scope.defined.add(name)
+            else:
+                raise Unsupported("read-int may either define or assign")
+        self.store(target, temp)
+
+    def function_value(self, params_list, body, name_symbol):
+        params = [param.symbol for param in params_list.elements]
+        function = Function(self.function)
+        scope = Scope(self.scope, function)
+        self.declare(scope, body, params)
+        python = self.new_name("f", name_symbol) if name_symbol is not None else self.new_name("f")
+        self.emit(f"def {python}({''.join(scope.bindings[p] + '=_UNBOUND, ' for p in params)}*_args):")
+
+        outer_scope, outer_function = self.scope, self.function
+        self.indent += 1
+        declarations_index = len(self.lines)
+        try:
+            self.burn()
+            for param in params:
+                self.unbound_parameter(scope, param, body)
+            self.scope, self.function = scope, function
+            scope.defined.update(params)
+            result = self.new_name("t")
+            self.emit(f"{result} = None")
+            for index, expr in enumerate(body):
+                self.top_level(expr, result if index == len(body) - 1 else None)
+            self.emit(f"return {result}")
+            for python_name, kind in sorted(function.declarations.items()):
+                self.lines.insert(declarations_index, "    " * self.indent + f"{kind} {python_name}")
+        finally:
+            self.indent -= 1
+            self.scope, self.function = outer_scope, outer_function
+        return python
+
+    def unbound_parameter(self, scope, param, body):
+        # A call with too few arguments leaves a parameter undefined, and the
+        # interpreter then looks the name up outside the function.
+        python = scope.bindings[param]
+        kind, outer = self.resolve_outer(param, scope.parent)
+        self.emit(f"if {python} is _UNBOUND:")
+        if kind == "undefined":
+            self.block(lambda: self.emit(f"del {python}"))
+            return
+        if param in assigned_symbols(body):
+            raise Unsupported("assignment to a parameter that may be unbound")
+        self.block(lambda: self.lines.extend([
+            "    " * self.indent + "try:",
+            "    " * self.indent + f"    {python} = {outer}",
+            "    " * self.indent + "except NameError:",
+            "    " * self.indent + f"    del {python}",
+        ]))
+
+
+STATEMENT_FORMS = frozenset({FUNC, DEFINE, SET, LAMBDA, WHILE, FOR, READ_LINE, READ_INT, READ_INTS})
+
+
+def subexpressions(expressions):
+    stack = list(expressions)
+    while stack:
+        expr = stack.pop()
+        yield expr
+        if isinstance(expr, List):
+            stack.extend(expr.elements)
+
+
+def assigned_symbols(expressions):
+    assigned = set()
+    for expr in subexpressions(expressions):
+        if _head_symbol(expr) in (SET, READ_LINE, READ_INT, READ_INTS, DEFINE, FUNC):
+            assigned.update(arg.symbol for arg in expr.elements[1:] if isinstance(arg, Variable))
+    return assigned
+
+
+_cache = OrderedDict()
+
+
+def translate(expressions, metered=False):
+    """Return (code object, names, builtins, globals) for a program, or None
+    if it is unsupported.
+
+    Results are cached by program_key and `metered`; `names` maps the Python
+    names of bindings back to Nelox names, `builtins` and `globals` map the
+    builtins and the program's global bindings to their Python names.
+    """
+    key = (program_key(expressions), metered)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    translator = Translator(metered)
+    try:
+        source = translator.translate(expressions)
+        translation = (compile(source, "<nelox>", "exec"), translator.names, translator.builtins,
+                       translator.scope.bindings)
+    except (Unsupported, IndexError, AttributeError, ValueError, SyntaxError, RecursionError):
+        translation = None
+    _cache[key] = translation
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return translation
+
+
+class NamespaceValues:
+    # Environment.values whose names bound by a translated program are the
+    # Python globals of its namespace; other names are kept in `values`.
+
+    def __init__(self, values, namespace, names):
+        self.values = values
+        self.namespace = namespace
+        self.names = names
+
+    def __contains__(self, name):
+        python = self.names.get(name)
+        return python in self.namespace if python is not None else name in self.values
+
+    def __getitem__(self, name):
+        python = self.names.get(name)
+        return self.namespace[python] if python is not None else self.values[name]
+
+    def __setitem__(self, name, value):
+        python = self.names.get(name)
+        if python is not None:
+            self.namespace[python] = value
+        else:
+            self.values[name] = value
+
+
+class TranslatingInterpreter(Interpreter):
+    """Runs whole programs as Python code generated by Translator.
+
+    Programs the translator does not support are run by the tree walker;
+    `translated` tells which happened in the last `interpret` call. Only
+    `interpret` translates, `interpret_iter` always walks the tree. A
+    translated program starts from the builtins alone, so a program is only
+    translated while global_env holds nothing else. Later programs, run by
+    the tree walker, share the translated program's globals through
+    NamespaceValues; only the operators its functions inlined keep their
+    builtin meaning if a later program assigns to them.
+    Translated functions are Python functions, without tail call
+    elimination.
+    """
+
+    def __init__(self, io=None, fuel=None):
+        super().__init__(io, fuel)
+        self.translated = False
+        self.library = dict(self.global_env.parent.values)
+
+    def pristine(self):
+        # Whether the global environment still holds just the builtins.
+        values, library = self.global_env.values, self.global_env.parent.values
+        return (type(values) is dict and type(library) is dict
+                and values == self.builtins and library == self.library)
+
+    def interpret(self, expressions):
+        expressions = list(expressions)
+        translation = translate(expressions, self.fuel is not None) if self.pristine() else None
+        self.translated = translation is not None
+        if translation is None:
+            return super().interpret(expressions)
+
+        code, names, builtins, bindings = translation
+        namespace = dict(RUNTIME, _io=self.io, _burn=self.burn)
+        for symbol, python in builtins.items():
+            namespace[python] = self.global_env.get(symbol)
+        try:
+            exec(code, namespace)
+        except NameError as e:
+            match = re.search(r"'([^']+)'", str(e))
+            name = names.get(match.group(1)) if match else None
+            if name is None:
+                raise
+            raise RuntimeError(f"Undefined variable '{name}'") from None
+        finally:
+            self.io.flush()
+            self.share_namespace(namespace, builtins, bindings)
+        if UNDERSCORE in self.global_env.values:
+            self.global_env.set(UNDERSCORE, namespace["_result"])
+        return namespace["_result"]
+
+    def share_namespace(self, namespace, builtins, bindings):
+        # From now on the globals and builtins the program binds live in its
+        # namespace, where its functions read and write them, and the tree
+        # walker reaches them through global_env.
+        library = self.global_env.parent
+        names = {symbol: python for symbol, python in builtins.items() if symbol not in library.values}
+        names.update(bindings)
+        self.global_env.values = NamespaceValues(self.global_env.values, namespace, names)
+        library.values = NamespaceValues(library.values, namespace, {
+            symbol: python for symbol, python in builtins.items() if symbol in library.values})
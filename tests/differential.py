@@ -0,0 +1,97 @@
+"""Differential testing of Nelox implementations against the tree-walking Interpreter."""
+import io
+import os
+import random
+import sys
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.pretty_printer import pretty_program
+from nelox.scanner import Scanner
+
+CASES_DIR = os.path.join(os.path.dirname(__file__), "cases")
+
+
+def parse(source):
+    return Parser(Scanner(source)).parse()
+
+
+def run(interpreter, source, input_data=""):
+    """Return (output, result or error) of running `source` on `interpreter`."""
+    original_stdin = sys.stdin
+    original_stdout = sys.stdout
+    sys.stdin = io.StringIO(input_data)
+    captured_output = io.StringIO()
+    sys.stdout = captured_output
+    try:
+        try:
+            result = interpreter.interpret(parse(source))
+            if callable(result):
+                result = "<function>"
+        except Exception as e:
+            result = (type(e), str(e))
+        return captured_output.getvalue(), result
+    finally:
+        sys.stdin = original_stdin
+        sys.stdout = original_stdout
+
+
+def load_cases():
+    """Yield (name, code, input, expected output) for every program in tests/cases."""
+    for name in sorted(os.listdir(CASES_DIR)):
+        if name.endswith(".code"):
+            base_path = os.path.join(CASES_DIR, name[:-len(".code")])
+            with open(base_path + ".code") as f:
+                code = f.read()
+            with open(base_path + ".input") as f:
+                input_data = f.read()
+            with open(base_path + ".output") as f:
+                expected_output = f.read()
+            yield name, code, input_data, expected_output
+
+
+# Programs run one after another on one interpreter, sharing its globals.
+PROGRAM_SEQUENCES = [
+    ["(define x 41)", "(print (+ x 1))"],
+    ["(func f (n) (* n 2))", "(print (f 21))"],
+    ["(define x 1) (func f () x) (print (f))", "(set x 2) (print (f))"],
+    ["(set + (lambda (a b) 0))", "(print (+ 1 2))"],
+    ['(set get (lambda (l i) 0))', '(print (get "ab" 1))'],
+    ["(define _ 0) (print 5) 7", "(print _)"],
+    ["(define sum 3)", "(print sum)"],
+    ["(define a 1) (print (div 1 0)) (define b 2)", "(print a)", "(print b)"],
+]
+
+
+class DifferentialTests:
+    """Mixin for a unittest.TestCase that runs the test cases, fuzzer
+    programs and program sequences on `interpreter_class` and checks that
+    output and result, or error, are those of Interpreter."""
+
+    interpreter_class = Interpreter
+
+    def assertSameBehaviour(self, source, input_data=""):
+        self.assertEqual(run(self.interpreter_class(), source, input_data),
+                         run(Interpreter(), source, input_data))
+
+    def test_program_sequences(self):
+        for sources in PROGRAM_SEQUENCES:
+            with self.subTest(programs=sources):
+                interpreter, tree_walker = self.interpreter_class(), Interpreter()
+                self.assertEqual([run(interpreter, source) for source in sources],
+                                 [run(tree_walker, source) for source in sources])
+
+    def test_test_cases(self):
+        for name, code, input_data, expected_output in load_cases():
+            with self.subTest(case=name):
+                output, _ = run(self.interpreter_class(), code, input_data)
+                self.assertEqual(output.strip(), expected_output.strip())
+                self.assertSameBehaviour(code, input_data)
+
+    def test_fuzzer_programs(self):
+        random.seed(3)
+        for _ in range(300):
+            source = pretty_program(Fuzzer().generate_program())
+            with self.subTest(program=source):
+                self.assertSameBehaviour(source)
@@ -0,0 +1,55 @@
+import unittest
+
+from nelox.compiler import CompilingInterpreter
+from tests.differential import DifferentialTests, parse
+
+
+class CompilingInterpreterTest(DifferentialTests, unittest.TestCase):
+    interpreter_class = CompilingInterpreter
+
+    def test_functions_and_closures(self):
+        self.assertSameBehaviour("""
+            (func make-adder (n) (lambda (x) (+ x n)))
+            (define add2 (make-adder 2))
+            (func fact (n) (if (< n 2) 1 (* n (fact (- n 1)))))
+            (print (add2 40) (fact 10))
+            (define l (list 3 1 2))
+            (print (head l) (tail l) (reverse l) (push 0 l) (empty? l) (append l l))
+            (for i 0 3 (print i))
+            (print (and 1 0) (or 0 2) (and) (or))
+            (print ((lambda (a b c d) (list a b c d)) 1 2 3 4))
+        """)
+
+    def test_malformed_forms_fail_like_the_tree_walker(self):
+        for source in [
+            "(if (= 1 1) 5)",
+            "(if (= 1 2) 5)",
+            "(define 5 1)",
+            "(define x)",
+            "(head)",
+            "(func f (x))",
+            "(lambda (1) 2)",
+            "(for i 0 2)",
+            "(set y 1)",
+            "(print undefined)",
+            "(define x 1) (define x 2)",
+            "(5 1 2)",
+        ]:
+            with self.subTest(source=source):
+                self.assertSameBehaviour(source)
+
+    def test_read_forms(self):
+        self.assertSameBehaviour('(read-int n) (read-ints a b) (define s "") (read-line s) (print n a b s)',
+                                 "5\n1 2\nhello\n")
+
+    def test_nodes_are_compiled_once(self):
+        interpreter = CompilingInterpreter()
+        expressions = parse("(define i 0) (while (< i 10) (set i (+ i 1)))")
+        interpreter.interpret(expressions)
+        compiled = len(interpreter.compiled)
+        interpreter.interpret(expressions[1:])
+        self.assertEqual(len(interpreter.compiled), compiled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.corpus import CorpusReader, CorpusWriter, write_corpus
+from nelox.parser import Parser
+from nelox.pretty_printer import pretty_program
+from nelox.scanner import Scanner
+
+
+def parse(source):
+    return Parser(Scanner(source)).parse()
+
+
+class CorpusTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "corpus.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        sources = [
+            '(define x 42)\n(print x "héllo")',
+            "",
+            '(if (< a 123456789012345678901234567890) (print "1") (print 1))',
+            "(())",
+        ]
+        write_corpus(self.path, [parse(source) for source in sources])
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(len(reader), len(sources))
+            for index, source in enumerate(sources):
+                with self.subTest(source=source):
+                    self.assertEqual(pretty_program(reader.expressions(index)),
+                                     pretty_program(parse(source)))
+            self.assertEqual(pretty_program(list(reader[-1])), pretty_program(parse("(())")))
+
+    def test_lines_and_literals(self):
+        write_corpus(self.path, [parse('(print\n 7 "7" seven)')])
+        with CorpusReader(self.path) as reader:
+            (root,) = reader.expressions(0)
+        head, number, string, variable = root.elements
+        self.assertEqual(head.name.lexeme, "print")
+        self.assertEqual(number.value, 7)
+        self.assertEqual(string.value, "7")
+        self.assertEqual(variable.name.line, 2)
+
+    def test_writer_returns_indices(self):
+        with CorpusWriter(self.path) as writer:
+            self.assertEqual(writer.add(parse("(a)")), 0)
+            self.assertEqual(writer.add(parse("(b)")), 1)
+        with self.assertRaises(ValueError):
+            writer.add(parse("(c)"))
+
+    def test_index_out_of_range(self):
+        write_corpus(self.path, [parse("(a)")])
+        with CorpusReader(self.path) as reader:
+            with self.assertRaises(IndexError):
+                reader[1]
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"(print 1)" * 100)
+        with self.assertRaises(ValueError):
+            CorpusReader(self.path)
+
+    def test_fuzzer_programs(self):
+        fuzzer = Fuzzer()
+        programs = []
+        for _ in range(200):
+            fuzzer.env.reset()
+            programs.append(fuzzer.generate_program())
+        write_corpus(self.path, programs)
+        with CorpusReader(self.path) as reader:
+            for index in (0, 57, 199):
+                self.assertEqual(pretty_program(reader.expressions(index)),
+                                 pretty_program(programs[index]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import unittest
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.fast_scanner import FastScanner
+from nelox.parser import Parser
+from nelox.pretty_printer import pretty_program
+from nelox.scanner import Scanner
+from nelox.token_type import TokenType
+
+
+def token_tuples(tokens):
+    return [(t.type, t.lexeme, t.literal, t.line) for t in tokens]
+
+
+class FastScannerTest(unittest.TestCase):
+    def assertSameTokens(self, source):
+        expected = token_tuples(Scanner(source).scan_tokens())
+        actual = token_tuples(FastScanner(source).scan_tokens())
+        self.assertEqual(actual, expected)
+
+    def test_simple_expression(self):
+        self.assertSameTokens("(add 2$this is comment\n 3)")
+
+    def test_line_numbers(self):
+        self.assertSameTokens('(print\n 42\n "hello\nworld")\n(foo)')
+
+    def test_number_followed_by_identifier(self):
+        self.assertSameTokens("(12abc -5 !=x a$b)")
+
+    def test_trailing_whitespace_and_comments(self):
+        self.assertSameTokens("(a) ")
+        self.assertSameTokens("(a) $ trailing comment")
+        self.assertSameTokens("(a)\n$ one\n$ two\n")
+        self.assertSameTokens("")
+
+    def test_unicode_source(self):
+        self.assertSameTokens('(print "héllo" naïve _é 12٣4 ٣a)')
+
+    def test_unicode_unexpected_character(self):
+        with self.assertRaises(SyntaxError) as actual:
+            FastScanner("(a\n ½)").scan_tokens()
+        self.assertEqual(str(actual.exception), "[line 2] Unexpected character: '½'")
+
+    def test_unterminated_string(self):
+        with self.assertRaises(SyntaxError) as expected:
+            Scanner('(a\n"hello\nworld').scan_tokens()
+        with self.assertRaises(SyntaxError) as actual:
+            FastScanner('(a\n"hello\nworld').scan_tokens()
+        self.assertEqual(str(actual.exception), str(expected.exception))
+
+    def test_unexpected_character(self):
+        with self.assertRaises(SyntaxError) as actual:
+            FastScanner("(a\n #b)").scan_tokens()
+        self.assertEqual(str(actual.exception), "[line 2] Unexpected character: '#'")
+
+    def test_test_cases(self):
+        cases = os.path.join(os.path.dirname(__file__), "cases")
+        for name in sorted(os.listdir(cases)):
+            if name.endswith(".code"):
+                with open(os.path.join(cases, name)) as f:
+                    source = f.read()
+                with self.subTest(case=name):
+                    self.assertSameTokens(source)
+
+    def test_fuzzer_programs(self):
+        fuzzer = Fuzzer()
+        for _ in range(200):
+            fuzzer.env.reset()
+            source = pretty_program(fuzzer.generate_program())
+            with self.subTest(program=source):
+                self.assertSameTokens(source)
+
+    def test_parser_accepts_fast_scanner(self):
+        exprs = Parser(FastScanner("(+ 1 2) (define x 42)")).parse()
+        self.assertEqual(len(exprs), 2)
+        self.assertEqual(exprs[1].elements[0].name.lexeme, "define")
+
+    def test_cursor_after_scan(self):
+        scanner = FastScanner("(foo 123)")
+        scanner.scan_tokens()
+        types = []
+        while not scanner.is_at_end():
+            types.append(scanner.advance().type)
+        self.assertEqual(types, [
+            TokenType.LEFT_PAREN,
+            TokenType.IDENTIFIER,
+            TokenType.NUMBER,
+            TokenType.RIGHT_PAREN
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
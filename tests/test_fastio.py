@@ -0,0 +1,128 @@
+import io
+import os
+import unittest
+
+from nelox import fastio
+from nelox.compiler import CompilingInterpreter
+from nelox.fastio import FastIO
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.purity import MemoizingInterpreter
+from nelox.resolver import ResolvingInterpreter
+from nelox.scanner import Scanner
+from nelox.translator import TranslatingInterpreter
+
+CASES_DIR = os.path.join(os.path.dirname(__file__), "cases")
+INTERPRETERS = (Interpreter, CompilingInterpreter, ResolvingInterpreter,
+                TranslatingInterpreter, MemoizingInterpreter)
+
+
+def binary_stdin(data):
+    # Like sys.stdin: a text stream with the bytes under it in .buffer.
+    return io.TextIOWrapper(io.BytesIO(data.encode()))
+
+
+def run(interpreter_class, source, input_data):
+    """Return (output, result or error) of running `source` with a FastIO."""
+    output = io.StringIO()
+    interpreter = interpreter_class(io=FastIO(binary_stdin(input_data), output))
+    try:
+        result = interpreter.interpret(Parser(Scanner(source)).parse())
+    except Exception as e:
+        result = (type(e), str(e))
+    return output.getvalue(), result
+
+
+class FastIOTest(unittest.TestCase):
+    def test_reads_lines_and_integers(self):
+        fast = FastIO(binary_stdin("hello world\n42\n 1 -2  3 \r\nlast"))
+        self.assertEqual(fast.read_line(), "hello world")
+        self.assertEqual(fast.read_int(), 42)
+        self.assertEqual(fast.read_ints(), [1, -2, 3])
+        self.assertEqual(fast.read_line(), "last")
+        with self.assertRaises(EOFError):
+            fast.read_line()
+
+    def test_text_streams(self):
+        fast = FastIO(io.StringIO("a\r\n7\nb"))
+        self.assertEqual(fast.read_line(), "a\r")
+        self.assertEqual(fast.read_int(), 7)
+        self.assertEqual(fast.read_line(), "b")
+
+    def test_invalid_integers(self):
+        fast = FastIO(binary_stdin("x\n1 2\n"))
+        with self.assertRaises(ValueError):
+            fast.read_int()
+        with self.assertRaises(ValueError):
+            fast.read_int()
+
+    def test_output_is_buffered(self):
+        output = io.StringIO()
+        fast = FastIO(stdout=output)
+        fast.print(1, "a", [2])
+        fast.print()
+        self.assertEqual(output.getvalue(), "")
+        fast.flush()
+        self.assertEqual(output.getvalue(), "1 a [2]\n\n")
+
+    def test_output_is_written_in_chunks(self):
+        output = io.StringIO()
+        fast = FastIO(stdout=output)
+        for i in range(fastio.FLUSH_LINES + 1):
+            fast.print(i)
+        self.assertEqual(output.getvalue().count("\n"), fastio.FLUSH_LINES)
+        fast.flush()
+        self.assertEqual(output.getvalue().count("\n"), fastio.FLUSH_LINES + 1)
+
+
+class FastIOInterpreterTest(unittest.TestCase):
+    def test_test_cases(self):
+        for name in sorted(os.listdir(CASES_DIR)):
+            if not name.endswith(".code"):
+                continue
+            base_path = os.path.join(CASES_DIR, name[:-len(".code")])
+            with open(base_path + ".code") as f:
+                code = f.read()
+            with open(base_path + ".input") as f:
+                input_data = f.read()
+            with open(base_path + ".output") as f:
+                expected_output = f.read().strip()
+            for interpreter_class in INTERPRETERS:
+                with self.subTest(case=name, interpreter=interpreter_class.__name__):
+                    output, _ = run(interpreter_class, code, input_data)
+                    self.assertEqual(output.strip(), expected_output)
+
+    def test_output_is_flushed_on_errors(self):
+        source = """
+            (print "before")
+            (read-int n)
+        """
+        for interpreter_class in INTERPRETERS:
+            with self.subTest(interpreter=interpreter_class.__name__):
+                self.assertEqual(run(interpreter_class, source, "x\n"),
+                                 ("before\n", (RuntimeError, "'read-int' expects a single integer input")))
+                output, (error, _) = run(interpreter_class, source, "")
+                self.assertEqual((output, error), ("before\n", EOFError))
+
+    def test_interpret_iter_flushes(self):
+        source = '(print "a") (print "b") (+ 1 2)'
+        for interpreter_class in INTERPRETERS:
+            with self.subTest(interpreter=interpreter_class.__name__):
+                output = io.StringIO()
+                interpreter = interpreter_class(io=FastIO(binary_stdin(""), output))
+                results = interpreter.interpret_iter(Parser(Scanner(source)).parse_iter())
+                self.assertEqual(next(results), None)
+                self.assertEqual(output.getvalue(), "")
+                self.assertEqual(list(results), [None, 3])
+                self.assertEqual(output.getvalue(), "a\nb\n")
+                # Stopping early flushes what was printed so far.
+                output = io.StringIO()
+                interpreter = interpreter_class(io=FastIO(binary_stdin(""), output))
+                results = interpreter.interpret_iter(Parser(Scanner(source)).parse_iter())
+                next(results)
+                results.close()
+                self.assertEqual(output.getvalue(), "a\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
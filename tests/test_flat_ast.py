@@ -0,0 +1,95 @@
+import io
+import os
+import sys
+import unittest
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.Expr import Literal, Variable, List
+from nelox.flat_ast import flatten, unflatten, FlatList, FlatVariable
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.pretty_printer import pretty_program
+from nelox.scanner import Scanner
+
+
+def parse(source):
+    return Parser(Scanner(source)).parse()
+
+
+class FlatAstTest(unittest.TestCase):
+    def test_round_trip(self):
+        exprs = parse('(define x (list 1 "two" (foo)))\n(print x)\n()')
+        program = flatten(exprs)
+        self.assertEqual(len(program), 3)
+        self.assertEqual(pretty_program(unflatten(program)), pretty_program(exprs))
+
+    def test_views(self):
+        root = flatten(parse('(print\n 42 "hi" x)'))[0]
+        self.assertIsInstance(root, FlatList)
+        self.assertIsInstance(root, List)
+        head, number, string, variable = root.elements
+        self.assertIsInstance(head, FlatVariable)
+        self.assertEqual(head.name.lexeme, "print")
+        self.assertEqual(head.name.line, 1)
+        self.assertIsInstance(number, Literal)
+        self.assertEqual(number.value, 42)
+        self.assertEqual(string.value, "hi")
+        self.assertIsInstance(variable, Variable)
+        self.assertEqual(variable.name.line, 2)
+
+    def test_views_are_read_only(self):
+        root = flatten(parse("(a 1)"))[0]
+        with self.assertRaises(TypeError):
+            root.elements[0] = None
+        with self.assertRaises(AttributeError):
+            root.elements[1].value = 2
+
+    def test_constants_are_shared(self):
+        program = flatten(parse('(a 1 1 "1" "1" 1)'))
+        self.assertEqual(program.constants, [1, "1"])
+
+    def test_deep_nesting(self):
+        deep = List([])
+        for _ in range(5000):
+            deep = List([deep])
+        program = flatten([deep])
+        self.assertEqual(len(program.kinds), 5001)
+        self.assertEqual(len(unflatten(program)), 1)
+
+    def test_interpreter_runs_views(self):
+        base_path = os.path.join(os.path.dirname(__file__), "cases", "problem3")
+        with open(base_path + ".code") as f:
+            code = f.read()
+        with open(base_path + ".input") as f:
+            input_data = f.read()
+        with open(base_path + ".output") as f:
+            expected_output = f.read().strip()
+
+        original_stdin = sys.stdin
+        original_stdout = sys.stdout
+        sys.stdin = io.StringIO(input_data)
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        try:
+            Interpreter().interpret(list(flatten(parse(code))))
+            result = captured_output.getvalue().strip()
+        finally:
+            sys.stdin = original_stdin
+            sys.stdout = original_stdout
+
+        self.assertEqual(result, expected_output)
+
+    def test_fuzzer_programs(self):
+        fuzzer = Fuzzer()
+        for _ in range(200):
+            fuzzer.env.reset()
+            exprs = fuzzer.generate_program()
+            expected = pretty_program(exprs)
+            program = flatten(exprs)
+            with self.subTest(program=expected):
+                self.assertEqual(pretty_program(list(program)), expected)
+                self.assertEqual(pretty_program(unflatten(program)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
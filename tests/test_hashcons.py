@@ -0,0 +1,66 @@
+import random
+import unittest
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.hashcons import HashConsFactory
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser, IterativeParser
+from nelox.pretty_printer import pretty_program
+from nelox.scanner import Scanner
+
+
+class HashConsTest(unittest.TestCase):
+    def test_parser_shares_subtrees(self):
+        factory = HashConsFactory()
+        first, second, third = Parser(Scanner("(+ x 1) (+ x 1) (+ x 2)"), factory).parse()
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertIs(first.elements[0], third.elements[0])
+        self.assertIs(first.elements[1], third.elements[1])
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+
+    def test_literals_keep_their_type(self):
+        factory = HashConsFactory()
+        number, string = Parser(Scanner('1 "1"'), factory).parse()
+        self.assertIsNot(number, string)
+        self.assertEqual(number.value, 1)
+        self.assertEqual(string.value, "1")
+
+    def test_shared_lists_are_immutable(self):
+        (expr,) = Parser(Scanner("(a b)"), HashConsFactory()).parse()
+        with self.assertRaises(TypeError):
+            expr.elements[0] = expr
+
+    def test_iterative_parser(self):
+        factory = HashConsFactory()
+        source = "(define x (+ 1 2)) (print (+ 1 2))"
+        exprs = IterativeParser(Scanner(source), factory).parse()
+        self.assertIs(exprs[0].elements[2], exprs[1].elements[1])
+        self.assertEqual(pretty_program(exprs), pretty_program(Parser(Scanner(source)).parse()))
+
+    def test_share_existing_tree(self):
+        factory = HashConsFactory()
+        exprs = Parser(Scanner("(f (g 1) (g 1))")).parse()
+        shared = factory.share(exprs[0])
+        self.assertIs(shared.elements[1], shared.elements[2])
+        self.assertIs(factory.share(exprs[0]), shared)
+        self.assertEqual(pretty_program([shared]), pretty_program(exprs))
+
+    def test_interpreter_runs_shared_program(self):
+        source = "(define x 1) (set x (+ x 1)) (set x (+ x 1)) x"
+        exprs = Parser(Scanner(source), HashConsFactory()).parse()
+        self.assertIs(exprs[1], exprs[2])
+        self.assertEqual(Interpreter().interpret(exprs), 3)
+
+    def test_fuzzer_output_unchanged(self):
+        random.seed(7)
+        plain = [pretty_program(Fuzzer().generate_program()) for _ in range(100)]
+        random.seed(7)
+        factory = HashConsFactory()
+        shared = [pretty_program(Fuzzer(factory).generate_program()) for _ in range(100)]
+        self.assertEqual(shared, plain)
+
+
+if __name__ == "__main__":
+    unittest.main()
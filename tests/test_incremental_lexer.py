@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.incremental_lexer import IncrementalLexer
+from nelox.pretty_printer import pretty_program
+from nelox.scanner import Scanner
+
+
+def token_tuples(tokens):
+    return [(t.type, t.lexeme, t.literal, t.line) for t in tokens]
+
+
+class IncrementalLexerTest(unittest.TestCase):
+    def assertMatchesFullScan(self, lexer):
+        expected = token_tuples(Scanner(lexer.source).scan_tokens())
+        self.assertEqual(token_tuples(lexer.tokens()), expected)
+
+    def test_initial_scan(self):
+        lexer = IncrementalLexer('(print "hi" 42) $ comment\n')
+        self.assertMatchesFullScan(lexer)
+
+    def test_edit_inside_identifier(self):
+        lexer = IncrementalLexer("(define count 0)\n(print count)")
+        first, removed, added = lexer.edit(13, 0, "er")
+        self.assertEqual(lexer.source, "(define counter 0)\n(print count)")
+        self.assertEqual((first, removed, added), (2, 1, 1))
+        self.assertMatchesFullScan(lexer)
+
+    def test_inserted_newline_shifts_lines(self):
+        lexer = IncrementalLexer("(a b)\n(c d)\n(e f)")
+        lexer.edit(3, 0, "\n\n")
+        self.assertMatchesFullScan(lexer)
+        tokens = lexer.tokens()
+        self.assertEqual(tokens[-2].lexeme, ")")
+        self.assertEqual(tokens[-2].line, 5)
+
+    def test_comment_swallows_rest_of_line(self):
+        lexer = IncrementalLexer("(a b c)\n(d)")
+        lexer.edit(3, 0, "$")
+        self.assertMatchesFullScan(lexer)
+        lexer.edit(3, 1, "")
+        self.assertMatchesFullScan(lexer)
+
+    def test_appending_at_end(self):
+        lexer = IncrementalLexer("")
+        for c in "(define x (+ 1 2)) $ done":
+            lexer.edit(len(lexer.source), 0, c)
+            self.assertMatchesFullScan(lexer)
+
+    def test_error_then_recovery(self):
+        lexer = IncrementalLexer("(print x)")
+        with self.assertRaises(SyntaxError):
+            lexer.edit(7, 0, '"')
+        self.assertEqual(lexer.source, '(print "x)')
+        lexer.edit(9, 0, '"')
+        self.assertMatchesFullScan(lexer)
+
+    def test_random_edits(self):
+        rng = random.Random(7)
+        fuzzer = Fuzzer()
+        alphabet = '()"$ \nab1+'
+        for _ in range(20):
+            fuzzer.env.reset()
+            lexer = IncrementalLexer(pretty_program(fuzzer.generate_program()))
+            for _ in range(20):
+                offset = rng.randint(0, len(lexer.source))
+                deleted = rng.randint(0, min(3, len(lexer.source) - offset))
+                inserted = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3)))
+                try:
+                    lexer.edit(offset, deleted, inserted)
+                except SyntaxError:
+                    with self.assertRaises(SyntaxError):
+                        Scanner(lexer.source).scan_tokens()
+                    continue
+                self.assertMatchesFullScan(lexer)
+
+    def test_out_of_range_edit(self):
+        with self.assertRaises(ValueError):
+            IncrementalLexer("(a)").edit(2, 5, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
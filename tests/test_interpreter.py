@@ -1,9 +1,13 @@
 import unittest
 import io
 import sys
+from contextlib import redirect_stdout
 from nelox.scanner import Scanner
 from nelox.parser import Parser
-from nelox.interpreter import Interpreter
+from nelox.compiler import CompilingInterpreter
+from nelox.interpreter import Interpreter, FuelExhausted
+from nelox.resolver import ResolvingInterpreter
+from nelox.translator import TranslatingInterpreter
 
 
 class InterpreterTest(unittest.TestCase):
@@ -310,5 +314,137 @@ class InterpreterTest(unittest.TestCase):
         self.assertEqual(result, 5)
 
 
+    def test_tail_recursion_runs_in_constant_stack(self):
+        result = self.run_code("""
+            (func sum-to (n acc) (if (= n 0) acc (sum-to (- n 1) (+ acc n))))
+            (sum-to 20000 0)
+        """)
+        self.assertEqual(result, 200010000)
+
+    def test_mutual_tail_recursion(self):
+        result = self.run_code("""
+            (func even? (n) (if (= n 0) true (odd? (- n 1))))
+            (func odd? (n) (if (= n 0) false (even? (- n 1))))
+            (list (even? 10001) (odd? 10001))
+        """)
+        self.assertEqual(result, [False, True])
+
+    def test_other_backends_do_not_eliminate_tail_calls(self):
+        # A known divergence from the tree walker: compiled, resolved and
+        # translated functions recurse on the Python stack.
+        source = "(func loop (n acc) (if (= n 0) acc (loop (- n 1) (+ acc 1)))) (loop 20000 0)"
+        self.assertEqual(self.run_code(source), 20000)
+        for interpreter_class in (CompilingInterpreter, ResolvingInterpreter, TranslatingInterpreter):
+            with self.subTest(interpreter=interpreter_class.__name__):
+                with self.assertRaises(RecursionError):
+                    interpreter_class().interpret(Parser(Scanner(source)).parse())
+
+    def test_tail_call_in_lambda_body(self):
+        result = self.run_code("""
+            (define loop (lambda (l acc) (set acc (+ acc 1)) (if (empty? l) acc (loop (tail l) acc))))
+            (define l (list))
+            (for i 0 3000 (set l (push i l)))
+            (loop l 0)
+        """)
+        self.assertEqual(result, 3001)
+
+    def test_for_loop_closures_capture_each_iteration(self):
+        result = self.run_code("""
+            (define fs (list))
+            (for i 0 3 (set fs (push (lambda () i) fs)))
+            (list ((head fs)) ((head (tail fs))) ((head (tail (tail fs)))))
+        """)
+        self.assertEqual(result, [2, 1, 0])
+
+    def test_for_loop_defines_in_each_iteration(self):
+        result = self.run_code("""
+            (define total 0)
+            (for i 0 4 (define sq (* i i)))
+            (for i 0 4 (set total (+ total i)))
+            total
+        """)
+        self.assertEqual(result, 6)
+
+    def test_loop_invariants(self):
+        result = self.run_code("""
+            (define k 0)
+            (define i 0)
+            (define total 0)
+            (while (< k 3)
+                (set i 0)
+                (while (< i 2) (set total (+ total (* k 10))) (set i (+ i 1)))
+                (set k (+ k 1)))
+            total
+        """)
+        self.assertEqual(result, 60)
+        # An invariant that would fail is not evaluated before the loop needs it.
+        self.assertEqual(self.run_code("(define n 0) (while (> n 0) (/ 1 n)) n"), 0)
+        # Calls that do not reach the builtins are not hoisted.
+        result = self.run_code("""
+            (define f (lambda (*)
+                (define i 0)
+                (define t 0)
+                (while (< i 3) (set t (* 2 3)) (set i (+ i 1)))
+                t))
+            (f +)
+        """)
+        self.assertEqual(result, 5)
+
+    def test_loop_plans(self):
+        interpreter = Interpreter()
+        source = """
+            (define l (list 1 2 3))
+            (define i 0)
+            (while (< i (length l)) (set i (+ i 1)))
+            (for j 0 2 (print j))
+            (for j 0 2 (define x j))
+        """
+        with redirect_stdout(io.StringIO()):
+            interpreter.interpret(Parser(Scanner(source)).parse())
+        plans = list(interpreter.loop_plans.values())
+        self.assertEqual([len(plan.hoisted) for plan in plans], [1, 0, 0])
+        self.assertEqual([plan.reuse_frame for plan in plans[1:]], [True, False])
+
+
+class FuelTest(unittest.TestCase):
+    INTERPRETERS = (Interpreter, CompilingInterpreter, ResolvingInterpreter, TranslatingInterpreter)
+
+    def run_with_fuel(self, interpreter_class, source, fuel):
+        interpreter = interpreter_class(fuel=fuel)
+        with redirect_stdout(io.StringIO()):
+            result = interpreter.interpret(Parser(Scanner(source)).parse())
+        return result, interpreter.fuel
+
+    def test_infinite_programs_run_out(self):
+        for source in [
+            "(while true)",
+            "(define i 0) (while true (set i (+ i 1)))",
+            "(func f (n) (f (+ n 1))) (f 0)",
+            "(define g (lambda () (for i 0 2 (g)))) (g)",
+        ]:
+            for interpreter_class in self.INTERPRETERS:
+                with self.subTest(source=source, interpreter=interpreter_class.__name__):
+                    with self.assertRaises(FuelExhausted):
+                        self.run_with_fuel(interpreter_class, source, 50)
+
+    def test_loop_iterations_and_calls_are_counted(self):
+        source = """
+            (func square (x) (* x x))
+            (define total 0)
+            (for i 0 10 (set total (+ total (square i))))
+            (define i 0)
+            (while (< i 5) (set i (+ i 1)))
+            (+ total (sum (map square (list 1 2))))
+        """
+        for interpreter_class in self.INTERPRETERS:
+            with self.subTest(interpreter=interpreter_class.__name__):
+                # 10 + 10 + 5 + 2 units.
+                self.assertEqual(self.run_with_fuel(interpreter_class, source, 100), (290, 73))
+                self.assertEqual(self.run_with_fuel(interpreter_class, source, 27), (290, 0))
+                with self.assertRaisesRegex(RuntimeError, "Out of fuel"):
+                    self.run_with_fuel(interpreter_class, source, 26)
+                self.assertEqual(self.run_with_fuel(interpreter_class, source, None), (290, None))
+
+
 if __name__ == "__main__":
     unittest.main()
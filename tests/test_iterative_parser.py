@@ -0,0 +1,59 @@
+import unittest
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.Expr import List, Literal, Variable
+from nelox.parser import Parser, IterativeParser
+from nelox.pretty_printer import pretty_program
+from nelox.scanner import Scanner
+
+
+def shape(expr):
+    if isinstance(expr, Literal):
+        return "literal", expr.value
+    if isinstance(expr, Variable):
+        return "variable", expr.name.lexeme, expr.name.line
+    return "list", [shape(e) for e in expr.elements]
+
+
+def parse_error(parser_class, source):
+    try:
+        parser_class(Scanner(source)).parse()
+    except Exception as e:
+        return str(e)
+    return None
+
+
+class IterativeParserTest(unittest.TestCase):
+    def assertSameTrees(self, source):
+        expected = [shape(e) for e in Parser(Scanner(source)).parse()]
+        actual = [shape(e) for e in IterativeParser(Scanner(source)).parse()]
+        self.assertEqual(actual, expected)
+
+    def test_simple_programs(self):
+        self.assertSameTrees("(+ 1 2)")
+        self.assertSameTrees('(define x 42) x "str" (f)')
+        self.assertSameTrees("(+ 1 ($comment\n* 2 3)) (() (()))")
+
+    def test_fuzzer_programs(self):
+        fuzzer = Fuzzer()
+        for _ in range(100):
+            fuzzer.env.reset()
+            self.assertSameTrees(pretty_program(fuzzer.generate_program()))
+
+    def test_same_errors(self):
+        for source in ["(", "(a", "(a (b)", ")", "(a))", "((("]:
+            with self.subTest(source=source):
+                self.assertEqual(parse_error(IterativeParser, source), parse_error(Parser, source))
+
+    def test_deep_nesting(self):
+        depth = 100000
+        source = "(f " * depth + "1" + ")" * depth
+        expr = IterativeParser(Scanner(source)).parse()[0]
+        for _ in range(depth):
+            self.assertIsInstance(expr, List)
+            expr = expr.elements[1]
+        self.assertEqual(expr.value, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
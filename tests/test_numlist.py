@@ -0,0 +1,154 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from nelox.compiler import CompilingInterpreter
+from nelox.interpreter import Interpreter
+from nelox.numlist import NumList, compact
+from nelox.parser import Parser
+from nelox.plist import PList
+from nelox.purity import MemoizingInterpreter
+from nelox.resolver import ResolvingInterpreter
+from nelox.scanner import Scanner
+from nelox.translator import TranslatingInterpreter, translate
+
+INTERPRETERS = (Interpreter, CompilingInterpreter, ResolvingInterpreter,
+                TranslatingInterpreter, MemoizingInterpreter)
+
+
+def parse(source):
+    return Parser(Scanner(source)).parse()
+
+
+def run(interpreter_class, source):
+    """Return (output, result or error) of running `source`."""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        try:
+            result = interpreter_class().interpret(parse(source))
+            if callable(result):
+                result = "<function>"
+        except Exception as e:
+            result = (type(e), str(e))
+    return output.getvalue(), result
+
+
+class NumListTest(unittest.TestCase):
+    def test_behaves_like_a_list(self):
+        numbers = NumList([1, 2, 3])
+        self.assertEqual(len(numbers), 3)
+        self.assertEqual(list(numbers), [1, 2, 3])
+        self.assertEqual((numbers[0], numbers[-1]), (1, 3))
+        self.assertEqual(repr(numbers), "[1, 2, 3]")
+        with self.assertRaises(IndexError):
+            numbers[3]
+
+    def test_equality_and_ordering(self):
+        numbers = NumList([1, 2, 3])
+        for other in (NumList([1, 2, 3]), PList([1, 2, 3]), [1, 2, 3]):
+            self.assertTrue(numbers == other and other == numbers)
+        self.assertNotEqual(numbers, NumList([1, 2]))
+        self.assertNotEqual(numbers, PList([1, 2, 4]))
+        self.assertTrue(numbers < NumList([1, 3]) and numbers < PList([2]) and [0] < numbers)
+        self.assertTrue(numbers >= [1, 2] and PList([1, 2]) <= numbers)
+
+    def test_concatenation(self):
+        numbers = NumList([1, 2])
+        self.assertIsInstance(numbers + NumList([3]), NumList)
+        self.assertEqual(numbers + NumList([3]), [1, 2, 3])
+        self.assertEqual(numbers + PList(["a"]), [1, 2, "a"])
+        self.assertEqual(PList(["a"]) + numbers, ["a", 1, 2])
+        self.assertEqual(["a"] + numbers, ["a", 1, 2])
+        self.assertEqual(numbers * 2, [1, 2, 1, 2])
+
+    def test_compact(self):
+        self.assertIsInstance(compact([1, 2, 3]), NumList)
+        self.assertIsInstance(compact([]), NumList)
+        for values in ([1, 2.0], [1, True], [1, "a"], [2 ** 70]):
+            with self.subTest(values=values):
+                result = compact(values)
+                self.assertIsInstance(result, PList)
+                self.assertEqual(list(result), values)
+
+
+class BulkBuiltinsTest(unittest.TestCase):
+    def evaluate(self, source):
+        with redirect_stdout(io.StringIO()):
+            return Interpreter().interpret(parse(source))
+
+    def test_range_and_sum(self):
+        self.assertEqual(self.evaluate("(range 5)"), [0, 1, 2, 3, 4])
+        self.assertEqual(self.evaluate("(range 2 5)"), [2, 3, 4])
+        self.assertIsInstance(self.evaluate("(range 3)"), NumList)
+        self.assertEqual(self.evaluate("(sum (range 101))"), 5050)
+        self.assertEqual(self.evaluate("(sum (list 1 (/ 5 2)))"), 3.5)
+        self.assertEqual(self.evaluate("(sum (list))"), 0)
+
+    def test_map_filter_fold(self):
+        self.assertEqual(self.evaluate("(map (lambda (x) (* x x)) (range 4))"), [0, 1, 4, 9])
+        self.assertEqual(self.evaluate("(map + (range 3) (list 10 20 30))"), [10, 21, 32])
+        self.assertEqual(self.evaluate("(map - (list 5 5) (list 1 2 3))"), [4, 3])
+        self.assertEqual(self.evaluate("(map str (list 1 2))"), ["(1,)", "(2,)"])
+        self.assertEqual(self.evaluate("(filter (lambda (x) (= (mod x 2) 0)) (range 7))"), [0, 2, 4, 6])
+        self.assertEqual(self.evaluate("(fold + 0 (range 5))"), 10)
+        self.assertEqual(self.evaluate("(fold - 100 (list 1 2))"), 97)
+        self.assertEqual(self.evaluate("(fold (lambda (m x) (if (> x m) x m)) 0 (list 3 9 2))"), 9)
+        self.assertEqual(self.evaluate("(fold + \"\" (to-list \"abc\"))"), "abc")
+
+    def test_sort(self):
+        self.assertEqual(self.evaluate("(sort (list 3 1 2))"), [1, 2, 3])
+        self.assertIsInstance(self.evaluate("(sort (list 3 1 2))"), NumList)
+        self.assertEqual(self.evaluate("(sort (to-list \"cab\"))"), ["a", "b", "c"])
+
+    def test_results_work_with_list_forms(self):
+        source = """
+            (define l (range 3))
+            (list (head l) (tail l) (push 9 l) (append l l) (reverse l) (get l 2)
+                  (length l) (empty? l) (= l (list 0 1 2)))
+        """
+        self.assertEqual(self.evaluate(source),
+                         [0, [1, 2], [9, 0, 1, 2], [0, 1, 2, 0, 1, 2], [2, 1, 0], 2, 3, False, True])
+
+    def test_errors(self):
+        for source, message in [
+            ("(sum 5)", "'sum' expects a list"),
+            ("(sum (list 1 \"a\"))", "'sum' expects a list of numbers"),
+            ("(range \"a\")", "'range' expects one or two integers"),
+            ("(map +)", "'map' expects a function and at least one list"),
+            ("(sort (list 1 \"a\"))", "'sort' expects a list of comparable values"),
+        ]:
+            with self.subTest(source=source):
+                with self.assertRaisesRegex(RuntimeError, message):
+                    self.evaluate(source)
+
+    def test_names_can_be_defined_by_programs(self):
+        source = """
+            (print (sum (range 4)))
+            (define total (sum (list 1 2)))
+            (define sum 0)
+            (for i 0 4 (set sum (+ sum i)))
+            (print sum total)
+            (func map (x) (* x 2))
+            (print (map 21))
+        """
+        self.assertIsNotNone(translate(parse(source)))
+        for interpreter_class in INTERPRETERS:
+            with self.subTest(interpreter=interpreter_class.__name__):
+                self.assertEqual(run(interpreter_class, source), ("6\n6 3\n42\n", None))
+
+    def test_same_behaviour_in_all_interpreters(self):
+        source = """
+            (func square (x) (* x x))
+            (define l (map square (range 1 6)))
+            (print l (sum l) (sort (reverse l)) (map * l l))
+            (print (filter (lambda (x) (> x 5)) l) (fold + 0 l))
+            (print (map + l (list (/ 1 2) (/ 1 2))))
+        """
+        expected = run(Interpreter, source)
+        for interpreter_class in INTERPRETERS[1:]:
+            with self.subTest(interpreter=interpreter_class.__name__):
+                self.assertEqual(run(interpreter_class, source), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+from nelox.interpreter import Interpreter
+from nelox.optimizer import optimize, binding_counts
+from nelox.pretty_printer import pretty_program
+from nelox.symbols import intern
+from tests.differential import DifferentialTests, parse
+
+
+class OptimizingInterpreter(Interpreter):
+    # Runs each program optimized, for comparison with Interpreter.
+    def interpret(self, expressions):
+        return super().interpret(optimize(expressions))
+
+
+class OptimizerTest(DifferentialTests, unittest.TestCase):
+    interpreter_class = OptimizingInterpreter
+
+    @unittest.skip("optimize() takes a whole program, not one of several sharing globals")
+    def test_program_sequences(self):
+        pass
+
+    def assertOptimizesTo(self, source, expected):
+        self.assertEqual(pretty_program(optimize(parse(source))), pretty_program(parse(expected)))
+        self.assertSameBehaviour(source)
+
+    def test_folding(self):
+        self.assertOptimizesTo("(print (+ (* 12 7) 33) (mod 7 (div 9 2)) (- 5))", "(print 117 3 5)")
+        self.assertOptimizesTo('(print (+ "a" "b"))', "(print ab)")
+        folded = optimize(parse("(< 1 2) (not 0) (= 1 2)"))
+        self.assertEqual([expr.value for expr in folded], [True, True, False])
+
+    def test_errors_are_not_folded(self):
+        for source in ["(print (/ 1 0))", "(print (div 1 0))", '(+ 1 "a")', "(mod 1 2 3)", "(not)", "(+)"]:
+            with self.subTest(source=source):
+                self.assertOptimizesTo(source, source)
+
+    def test_side_effects_are_kept(self):
+        for source in ["(print (+ 1 2))", "(read-int x) (+ x 1)", "(define x 0) (+ (set x 1) 2)"]:
+            with self.subTest(source=source):
+                self.assertEqual(len(optimize(parse(source))), len(parse(source)))
+                self.assertSameBehaviour(source, "4\n")
+        self.assertOptimizesTo("(define x 0) (+ (set x 1) 2)", "(define x 0) (+ (set x 1) 2)")
+
+    def test_rebound_builtins_are_not_folded(self):
+        for source in ["(set + -) (+ 5 2)", "(func f (*) (* 2 3)) (f +)", "(for not 0 2 (not 1))"]:
+            with self.subTest(source=source):
+                self.assertOptimizesTo(source, source)
+
+    def test_if_pruning(self):
+        self.assertOptimizesTo("(if (> 2 1) (print 1) (print 2))", "(print 1)")
+        self.assertOptimizesTo("(if 0 (print 1) (print 2))", "(print 2)")
+        self.assertOptimizesTo("(if true 1 2)", "1")
+        self.assertOptimizesTo("(if 0 1)", "(if 0 1)")
+        self.assertOptimizesTo("(read-int x) (if x 1 2)", "(read-int x) (if x 1 2)")
+
+    def test_constant_propagation(self):
+        self.assertOptimizesTo("(define n (* 4 5)) (print (+ n 1)) (func f (x) (< x n))",
+                               "(define n 20) (print 21) (func f (x) (< x 20))")
+        self.assertOptimizesTo("(define n 3) (if (> n 2) (print n) 0)", "(define n 3) (print 3)")
+
+    def test_reassigned_names_are_not_propagated(self):
+        for source in [
+            "(define n 1) (set n 2) (print n)",
+            "(define n 1) (func f () (set n 2)) (f) (print n)",
+            "(define n 1) (func f (n) n) (print (f 2))",
+            "(define n 1) (for n 0 2 (print n))",
+            "(define n 1) (read-int n) (print n)",
+            "(func f () n) (define n 1) (func g () (define n 2)) (print (f))",
+            "(define print 1) (print 2)",
+        ]:
+            with self.subTest(source=source):
+                self.assertOptimizesTo(source, source)
+
+    def test_input_is_not_modified(self):
+        expressions = parse("(define n 2) (print (+ n 1))")
+        before = pretty_program(expressions)
+        optimized = optimize(expressions)
+        self.assertEqual(pretty_program(expressions), before)
+        self.assertIs(optimized[0], expressions[0])
+
+    def test_binding_counts(self):
+        counts = binding_counts(parse("(define a 1) (set a 2) (func f (x y) (read-ints b c)) (lambda (x) 1)"))
+        self.assertEqual(counts[intern("a")], 2)
+        self.assertEqual(counts[intern("x")], 2)
+        self.assertEqual((counts[intern("f")], counts[intern("c")], counts[intern("z")]), (1, 1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
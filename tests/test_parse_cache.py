@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from nelox.parse_cache import ParseCache
+from nelox.pretty_printer import pretty_program
+from nelox.Expr import Literal
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+
+SOURCE = '(define x 42)\n(print x "hi")'
+EXPECTED = pretty_program(Parser(Scanner(SOURCE)).parse())
+
+
+class ParseCacheTest(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = ParseCache()
+        first = cache.parse(SOURCE)
+        second = cache.parse(SOURCE)
+        cache.parse("(other)")
+        self.assertEqual(pretty_program(first), pretty_program(second))
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.disk_hits, info.misses, info.currsize), (1, 0, 2, 2))
+
+    def test_results_are_independent(self):
+        cache = ParseCache()
+        first = cache.parse(SOURCE)
+        first[0].elements[2] = Literal(0)
+        first.pop()
+        second = cache.parse(SOURCE)
+        self.assertEqual(pretty_program(second), EXPECTED)
+        self.assertIsNot(first[0], second[0])
+
+    def test_lru_eviction(self):
+        cache = ParseCache(maxsize=2)
+        cache.parse("(a)")
+        cache.parse("(b)")
+        cache.parse("(a)")
+        cache.parse("(c)")
+        cache.parse("(a)")
+        self.assertEqual(cache.cache_info().hits, 2)
+        cache.parse("(b)")
+        self.assertEqual(cache.cache_info().misses, 4)
+        self.assertEqual(cache.cache_info().currsize, 2)
+
+    def test_errors_are_not_cached(self):
+        cache = ParseCache()
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                cache.parse("(a")
+        self.assertEqual(cache.cache_info().currsize, 0)
+
+    def test_disk_tier(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ParseCache(directory=directory).parse(SOURCE)
+            cache = ParseCache(directory=directory)
+            exprs = cache.parse(SOURCE)
+            self.assertEqual(pretty_program(exprs), EXPECTED)
+            self.assertEqual(cache.cache_info().disk_hits, 1)
+            self.assertEqual(cache.cache_info().misses, 0)
+            cache.parse(SOURCE)
+            self.assertEqual(cache.cache_info().hits, 1)
+
+    def test_damaged_disk_entry(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ParseCache(directory=directory).parse(SOURCE)
+            for name in os.listdir(directory):
+                with open(os.path.join(directory, name), "wb") as f:
+                    f.write(b"garbage")
+            cache = ParseCache(directory=directory)
+            self.assertEqual(pretty_program(cache.parse(SOURCE)), EXPECTED)
+            self.assertEqual(cache.cache_info().misses, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
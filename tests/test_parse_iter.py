@@ -0,0 +1,60 @@
+import contextlib
+import io
+import unittest
+
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+from nelox.stream_scanner import StreamScanner
+
+
+class RecordingStream(io.StringIO):
+    def __init__(self, source):
+        super().__init__(source)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+class ParseIterTest(unittest.TestCase):
+    def test_parse_iter_yields_forms(self):
+        forms = Parser(Scanner("(define x 1) x (+ x 1)")).parse_iter()
+        self.assertEqual(next(forms).elements[0].name.lexeme, "define")
+        self.assertEqual(next(forms).name.lexeme, "x")
+        self.assertEqual(len(next(forms).elements), 3)
+        with self.assertRaises(StopIteration):
+            next(forms)
+
+    def test_parse_iter_reads_lazily(self):
+        stream = RecordingStream("(print 1) " * 1000)
+        forms = Parser(StreamScanner(stream, 64)).parse_iter()
+        next(forms)
+        self.assertLess(stream.consumed, 200)
+        self.assertEqual(sum(1 for _ in forms), 999)
+
+    def test_interpret_iter_yields_results(self):
+        forms = Parser(Scanner("(define x 2) (* x 3) (+ _ 1)")).parse_iter()
+        self.assertEqual(list(Interpreter().interpret_iter(forms)), [2, 6, 7])
+
+    def test_execution_starts_before_input_is_read(self):
+        stream = RecordingStream('(print "first")\n' + "(+ 1 2)\n" * 1000 + "(+ 1 #)")
+        output = io.StringIO()
+        results = Interpreter().interpret_iter(Parser(StreamScanner(stream, 64)).parse_iter())
+        with contextlib.redirect_stdout(output):
+            next(results)
+        self.assertEqual(output.getvalue(), "first\n")
+        self.assertLess(stream.consumed, 200)
+        with self.assertRaises(SyntaxError):
+            for _ in results:
+                pass
+
+    def test_interpret_accepts_iterator(self):
+        forms = Parser(StreamScanner(io.StringIO("(define x 4) (* x x)"))).parse_iter()
+        self.assertEqual(Interpreter().interpret(forms), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.plist import PList
+from nelox.scanner import Scanner
+
+
+class PListTest(unittest.TestCase):
+    def test_behaves_like_a_list(self):
+        plist = PList([1, "a", [2]])
+        self.assertEqual(len(plist), 3)
+        self.assertEqual(list(plist), [1, "a", [2]])
+        self.assertEqual((plist[0], plist[2], plist[-1]), (1, [2], [2]))
+        self.assertEqual(repr(plist), repr([1, "a", [2]]))
+        self.assertEqual(str(PList([PList(["x"]), 1.5])), str([["x"], 1.5]))
+        self.assertFalse(PList())
+        self.assertTrue(plist)
+        with self.assertRaises(IndexError):
+            plist[3]
+        with self.assertRaises(IndexError):
+            plist[-4]
+        with self.assertRaises(TypeError):
+            hash(plist)
+
+    def test_tail_and_push_share_storage(self):
+        base = PList([1, 2, 3])
+        tail = base.tail()
+        self.assertEqual(tail, [2, 3])
+        self.assertIs(tail._items, base._items)
+        pushed = tail.push(0)
+        pushed_again = tail.push(9)
+        self.assertEqual((base, tail, pushed, pushed_again), ([1, 2, 3], [2, 3], [0, 2, 3], [9, 2, 3]))
+        self.assertEqual(PList().tail(), [])
+        grown = PList()
+        for i in range(5):
+            grown = grown.push(i)
+        self.assertEqual(grown, [4, 3, 2, 1, 0])
+
+    def test_reverse_and_concatenation(self):
+        plist = PList([1, 2, 3])
+        self.assertEqual(plist.reverse(), [3, 2, 1])
+        self.assertEqual(plist + PList([4]), [1, 2, 3, 4])
+        self.assertEqual(plist + [4], [1, 2, 3, 4])
+        self.assertEqual([0] + plist, [0, 1, 2, 3])
+        self.assertIsInstance([0] + plist, PList)
+        self.assertEqual(plist * 2, [1, 2, 3, 1, 2, 3])
+        self.assertEqual(0 * plist, [])
+        with self.assertRaises(TypeError):
+            plist + 1
+
+    def test_equality_and_ordering(self):
+        self.assertEqual(PList([1, 2]), PList([1, 2]))
+        self.assertEqual(PList([1, 2]), [1, 2])
+        self.assertEqual([1, 2], PList([1, 2]))
+        self.assertNotEqual(PList([1, 2]), [2, 1])
+        self.assertNotEqual(PList([1]), "1")
+        self.assertLess(PList([1, 2]), PList([1, 3]))
+        self.assertLess(PList([1]), [1, 0])
+        self.assertGreaterEqual([2], PList([1, 5]))
+
+    def test_interpreter_lists(self):
+        source = """
+            (define l (list 1 2 3))
+            (print l (tail l) (push 0 l) (append l (list 4)) (reverse l) (get l 1) (length l))
+            (print (head (list)) (tail (list)) (empty? (tail (list 1))) (= l (list 1 2 3)))
+            (print (push 0 (tail (to-list "abc"))))
+        """
+        output = io.StringIO()
+        with redirect_stdout(output):
+            Interpreter().interpret(Parser(Scanner(source)).parse())
+        self.assertEqual(output.getvalue(), "\n".join([
+            "[1, 2, 3] [2, 3] [0, 1, 2, 3] [1, 2, 3, 4] [3, 2, 1] 2 3",
+            "None [] True True",
+            "[0, 'b', 'c']",
+            "",
+        ]))
+
+
+if __name__ == "__main__":
+    unittest.main()
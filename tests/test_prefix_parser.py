@@ -0,0 +1,102 @@
+import random
+import unittest
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.parser import Parser
+from nelox.prefix_parser import PrefixParser
+from nelox.pretty_printer import pretty_program
+from nelox.scanner import Scanner
+from nelox.token_type import TokenType
+
+
+def parses(source):
+    try:
+        Parser(Scanner(source)).parse()
+    except Exception:
+        return False
+    return True
+
+
+def prefix_verdict(source):
+    state = PrefixParser()
+    try:
+        state.feed(source)
+    except SyntaxError:
+        return False
+    return state.can_end()
+
+
+class PrefixParserTest(unittest.TestCase):
+    def test_complete_programs(self):
+        fuzzer = Fuzzer()
+        for _ in range(50):
+            fuzzer.env.reset()
+            source = pretty_program(fuzzer.generate_program())
+            state = PrefixParser()
+            for c in source:
+                self.assertTrue(state.accepts_char(c))
+                state.feed(c)
+            self.assertTrue(state.can_end())
+
+    def test_agrees_with_parser(self):
+        rng = random.Random(5)
+        alphabet = '()"$ \n\tab1+#²'
+        for _ in range(3000):
+            source = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            with self.subTest(source=source):
+                self.assertEqual(prefix_verdict(source), parses(source))
+
+    def test_right_paren_and_eof(self):
+        state = PrefixParser()
+        self.assertFalse(state.accepts_char(")"))
+        self.assertTrue(state.can_end())
+        state.feed("(print x")
+        self.assertTrue(state.accepts_char(")"))
+        self.assertFalse(state.can_end())
+        state.feed(")")
+        self.assertFalse(state.accepts_char(")"))
+        self.assertTrue(state.can_end())
+
+    def test_inside_string_and_comment(self):
+        state = PrefixParser()
+        state.feed('(print "a)')
+        self.assertFalse(state.can_end())
+        self.assertEqual(state.expected_tokens(), frozenset())
+        state.feed('" $ )))')
+        self.assertTrue(state.accepts_char(")"))
+        self.assertFalse(state.accepts("\n))"))
+        self.assertTrue(state.accepts("\n)"))
+
+    def test_invalid_prefix_raises(self):
+        state = PrefixParser()
+        with self.assertRaisesRegex(SyntaxError, "Unexpected character: '#'"):
+            state.feed("(a\n #")
+        with self.assertRaisesRegex(SyntaxError, "Unexpected token"):
+            PrefixParser().feed("(a))")
+
+    def test_copy_is_independent(self):
+        state = PrefixParser()
+        state.feed("(define x")
+        clone = state.copy()
+        clone.feed(" 1)")
+        self.assertTrue(clone.can_end())
+        self.assertFalse(state.can_end())
+
+    def test_tokens(self):
+        state = PrefixParser()
+        self.assertIn(TokenType.EOF, state.expected_tokens())
+        self.assertNotIn(TokenType.RIGHT_PAREN, state.expected_tokens())
+        state.feed_token(TokenType.LEFT_PAREN)
+        state.feed_token(TokenType.IDENTIFIER)
+        self.assertEqual(state.expected_tokens(), {
+            TokenType.LEFT_PAREN, TokenType.RIGHT_PAREN,
+            TokenType.IDENTIFIER, TokenType.NUMBER, TokenType.STRING
+        })
+        with self.assertRaises(SyntaxError):
+            state.feed_token(TokenType.EOF)
+        state.feed_token(TokenType.RIGHT_PAREN)
+        state.feed_token(TokenType.EOF)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import io
+import re
+import unittest
+from contextlib import redirect_stdout
+
+from nelox.hashcons import HashConsFactory
+from nelox.interpreter import Interpreter
+from nelox.parser import Parser
+from nelox.profiler import PROGRAM, ProfilingInterpreter, line_of
+from nelox.scanner import Scanner
+
+SOURCE = """(func fact (n)
+    (if (< n 2) 1 (* n (fact (- n 1)))))
+(define square (lambda (x) (* x x)))
+(define l (list))
+(for i 0 10
+    (set l (push (+ (fact 5) (square i)) l)))
+(print (length l))
+(map (lambda (x) (+ x 1)) (list 1 2 3))
+"""
+
+
+def profile(source, factory=None):
+    interpreter = ProfilingInterpreter()
+    with redirect_stdout(io.StringIO()):
+        result = interpreter.interpret(Parser(Scanner(source), factory).parse())
+    return interpreter, result
+
+
+class ProfilingInterpreterTest(unittest.TestCase):
+    def test_results_are_unchanged(self):
+        _, result = profile(SOURCE)
+        with redirect_stdout(io.StringIO()):
+            expected = Interpreter().interpret(Parser(Scanner(SOURCE)).parse())
+        self.assertEqual(result, expected)
+
+    def test_functions(self):
+        interpreter, _ = profile(SOURCE)
+        functions = interpreter.by_function
+        self.assertEqual(set(functions), {PROGRAM, "fact", "square", "<lambda:8>"})
+        self.assertEqual(functions["fact"].calls, 50)
+        self.assertEqual(functions["square"].calls, 10)
+        self.assertEqual(functions["<lambda:8>"].calls, 3)
+        self.assertEqual(functions[PROGRAM].calls, 1)
+        # Recursive calls are inside the outermost one's total time.
+        self.assertLessEqual(functions["fact"].total_ns, functions[PROGRAM].total_ns)
+        self.assertGreaterEqual(functions["fact"].total_ns, functions["fact"].self_ns)
+        self.assertEqual(sum(stats.self_ns for stats in functions.values()), functions[PROGRAM].total_ns)
+
+    def test_lines_and_allocations(self):
+        interpreter, _ = profile(SOURCE)
+        lines = interpreter.by_line
+        self.assertLessEqual(set(lines), set(range(1, 9)))
+        self.assertEqual(lines[6].allocations, 10)
+        self.assertEqual(lines[5].calls, 1)
+        # A frame per call; func, lambda, list, ten pushes, and map with its list and lambda.
+        self.assertEqual(interpreter.by_function["fact"].allocations, 50)
+        self.assertEqual(interpreter.by_function[PROGRAM].allocations, 3 + 10 + 3)
+
+    def test_names(self):
+        interpreter, _ = profile("""
+            (define f 0)
+            (set f (lambda () 1))
+            (define g f)
+            (f) (g)
+            ((lambda () 2))
+        """)
+        self.assertEqual(interpreter.by_function["f"].calls, 2)
+        self.assertIn("<lambda:6>", interpreter.by_function)
+
+    def test_functions_with_shared_nodes(self):
+        # Hash-consed forms, empty bodies and closures of one lambda form
+        # are still told apart.
+        source = """
+            (func f (x) (+ x 1)) (func g (x) (+ x 1))
+            (define h (lambda ())) (define k (lambda ()))
+            (func adder (n) (lambda (x) (+ x n)))
+            (define add1 (adder 1)) (define add2 (adder 2))
+            (f 1) (g 2) (g 3) (h) (k) (k) (add1 1) (add2 1) (add2 2)
+        """
+        for factory in (None, HashConsFactory()):
+            with self.subTest(factory=factory):
+                functions = profile(source, factory)[0].by_function
+                calls = {name: stats.calls for name, stats in functions.items() if name != PROGRAM}
+                self.assertEqual(calls, {"f": 1, "g": 2, "h": 1, "k": 2, "adder": 2, "add1": 1, "add2": 2})
+
+    def test_deep_tail_recursion(self):
+        source = "(func loop (n acc) (if (= n 0) acc (loop (- n 1) (+ acc 1)))) (loop 1000 0)"
+        interpreter, result = profile(source)
+        self.assertEqual(result, 1000)
+        # Every bounce of the trampoline is a call, charged to the caller's node.
+        self.assertEqual(interpreter.by_function["loop"].calls, 1001)
+        self.assertEqual(set(interpreter.root.children), {"loop"})
+        self.assertEqual(interpreter.root.children["loop"].children, {})
+
+    def test_reports(self):
+        interpreter, _ = profile(SOURCE)
+        report = interpreter.report()
+        self.assertRegex(report, r"\nfact +50 ")
+        self.assertIn("\nline ", report)
+        stacks = interpreter.collapsed_stacks().splitlines()
+        self.assertTrue(all(re.fullmatch(r"<program>(;\S+)* \d+", row) for row in stacks))
+        paths = {row.rsplit(" ", 1)[0] for row in stacks}
+        self.assertIn("<program>;fact;fact", paths)
+        self.assertFalse(any(path.startswith("<program>;square;") for path in paths))
+
+    def test_line_of(self):
+        expressions = Parser(Scanner("(print\n 1)\n(1 2 (f x))")).parse()
+        self.assertEqual([line_of(expr) for expr in expressions], [1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+from nelox.interpreter import Interpreter
+from nelox.purity import MemoizingInterpreter, PurityAnalysis
+from nelox.symbols import intern
+from tests.differential import DifferentialTests, parse, run
+
+
+def pure_functions(source):
+    analysis = PurityAnalysis(parse(source))
+    return sorted(name for name, key in analysis.functions.items() if key in analysis.pure)
+
+
+class PurityAnalysisTest(unittest.TestCase):
+    def assertPure(self, source, *names):
+        self.assertEqual(pure_functions(source), sorted(intern(name) for name in names))
+
+    def test_pure_functions(self):
+        self.assertPure("(func fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))", "fib")
+        self.assertPure("(define sq (lambda (x) (* x x))) (func f (x) (sq (+ x 1)))", "sq", "f")
+        self.assertPure("(func even? (n) (if (= n 0) true (odd? (- n 1))))"
+                        "(func odd? (n) (if (= n 0) false (even? (- n 1))))", "even?", "odd?")
+        self.assertPure("(define k 10) (func f (x) (define y (* x k)) (set y (+ y 1)) y)", "f")
+        self.assertPure("(func sum (l) (define total 0)"
+                        " (for i 0 (length l) (set total (+ total (get l i)))))", "sum")
+
+    def test_impure_functions(self):
+        self.assertPure("(func f (x) (print x))")
+        self.assertPure("(func f (x) (read-int x))")
+        self.assertPure("(define k 0) (func f (x) (+ x k)) (set k 1)")
+        self.assertPure("(define k 0) (func f (x) (set k x))")
+        self.assertPure("(func f (g x) (g x))")
+        self.assertPure("(func f (x) (lambda (y) (+ x y)))")
+        self.assertPure("(func f (x) (g x)) (func g (x) (print x))")
+        self.assertPure("(func f (x) (+ x 1)) (set + -)")
+        self.assertPure("(func f (x) (set y 1) (define y 2))")
+        self.assertPure("(func f (x) _)")
+        self.assertPure("(func f (x) (+ x 1)) (func f (x) x)")
+
+
+class MemoizingInterpreterTest(DifferentialTests, unittest.TestCase):
+    interpreter_class = MemoizingInterpreter
+
+    def test_memoized_fibonacci(self):
+        interpreter = MemoizingInterpreter()
+        output, _ = run(interpreter, "(func fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2))))) (print (fib 80))")
+        self.assertEqual(output, "23416728348467685\n")
+        info = interpreter.memo.cache_info()
+        self.assertEqual((info.misses, info.hits, info.currsize), (81, 78, 81))
+
+    def test_cache_is_bounded(self):
+        interpreter = MemoizingInterpreter(maxsize=10)
+        run(interpreter, "(func sq (x) (* x x)) (for i 0 50 (sq i)) (sq 49) (sq 0)")
+        self.assertEqual(interpreter.memo.cache_info(), (1, 51, 10, 10))
+
+    def test_arguments_are_keyed_by_type_and_value(self):
+        self.assertSameBehaviour("(func id (x) x) (print (id 1) (id true) (id 1.0) (id (/ 2 2)))")
+
+    def test_unhashable_and_missing_arguments(self):
+        interpreter = MemoizingInterpreter()
+        source = "(define y 5) (func f (x y) (list x y)) (print (f (list 1) 2) (f 1) (f 1))"
+        self.assertEqual(run(interpreter, source), run(Interpreter(), source))
+        self.assertEqual(interpreter.memo.cache_info().currsize, 0)
+
+    def test_errors_are_not_cached(self):
+        self.assertSameBehaviour("(func inv (x) (/ 1 x)) (print (inv 2)) (inv 0)")
+        interpreter = MemoizingInterpreter()
+        run(interpreter, "(func inv (x) (/ 1 x)) (inv 0)")
+        self.assertEqual(interpreter.memo.cache_info().currsize, 0)
+
+    def test_impure_calls_run_every_time(self):
+        self.assertSameBehaviour("(func f (x) (print x) x) (f 1) (f 1)")
+        self.assertSameBehaviour("(define k 1) (func f (x) (+ x k)) (print (f 1)) (set k 2) (print (f 1))")
+
+    def test_tail_recursion(self):
+        self.assertSameBehaviour("(func loop (n) (if (= n 0) 0 (loop (- n 1)))) (print (loop 300))")
+        self.assertSameBehaviour("(func sum-to (n acc) (if (= n 0) acc (sum-to (- n 1) (+ acc n))))"
+                                 "(print (sum-to 20000 0))")
+        self.assertSameBehaviour("(func even? (n) (if (= n 0) true (odd? (- n 1))))"
+                                 "(func odd? (n) (if (= n 0) false (even? (- n 1))))"
+                                 "(print (even? 10001) (odd? 10001))")
+
+    def test_tail_calls_are_cached_with_the_final_result(self):
+        interpreter = MemoizingInterpreter()
+        source = "(func loop (n) (if (= n 0) 0 (loop (- n 1)))) (loop 5)"
+        self.assertEqual(run(interpreter, source)[1], 0)
+        self.assertEqual(interpreter.memo.cache_info(), (0, 6, 1024, 6))
+        self.assertTrue(all(result == 0 for result in interpreter.memo.results.values()))
+        interpreter = MemoizingInterpreter()
+        run(interpreter, source + " (loop 7)")
+        self.assertEqual(interpreter.memo.cache_info(), (1, 8, 1024, 8))
+
+    def test_later_programs_assign_earlier_globals(self):
+        interpreter = MemoizingInterpreter()
+        self.assertEqual(run(interpreter, "(define x 1) (func f () x) (f)")[1], 1)
+        self.assertEqual(run(interpreter, "(set x 2) (f)")[1], 2)
+        self.assertEqual(run(interpreter, "(func g (n) (* n 2)) (g 3) (g 3)")[1], 6)
+        self.assertEqual(interpreter.memo.cache_info().currsize, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+from nelox.resolver import ResolvingInterpreter, Scope, declarations
+from nelox.symbols import intern, symbol_name
+from tests.differential import DifferentialTests, parse
+
+
+class ResolvingInterpreterTest(DifferentialTests, unittest.TestCase):
+    interpreter_class = ResolvingInterpreter
+
+    def test_functions_and_closures(self):
+        self.assertSameBehaviour("""
+            (func make-adder (n) (lambda (x) (+ x n)))
+            (define add2 (make-adder 2))
+            (func fact (n) (if (< n 2) 1 (* n (fact (- n 1)))))
+            (print (add2 40) (fact 10))
+            (define l (list 3 1 2))
+            (print (head l) (tail l) (reverse l) (push 0 l) (empty? l) (append l l))
+            (for i 0 3 (print i))
+            (print (and 1 0) (or 0 2) (and) (or))
+            (print ((lambda (a b c d) (list a b c d)) 1 2 3 4))
+        """)
+
+    def test_malformed_forms_fail_like_the_tree_walker(self):
+        for source in [
+            "(if (= 1 1) 5)",
+            "(if (= 1 2) 5)",
+            "(define 5 1)",
+            "(define x)",
+            "(head)",
+            "(func f (x))",
+            "(lambda (1) 2)",
+            "(for i 0 2)",
+            "(set y 1)",
+            "(print undefined)",
+            "(define x 1) (define x 2)",
+            "(5 1 2)",
+        ]:
+            with self.subTest(source=source):
+                self.assertSameBehaviour(source)
+
+    def test_read_forms(self):
+        self.assertSameBehaviour('(read-int n) (read-ints a b) (define s "") (read-line s) (print n a b s)',
+                                 "5\n1 2\nhello\n")
+
+    def test_nodes_are_compiled_once(self):
+        interpreter = ResolvingInterpreter()
+        expressions = parse("(define i 0) (while (< i 10) (set i (+ i 1)))")
+        interpreter.interpret(expressions)
+        compiled = len(interpreter.compiled)
+        interpreter.interpret(expressions[1:])
+        self.assertEqual(len(interpreter.compiled), compiled)
+
+    def test_scoping_corner_cases(self):
+        for source in [
+            # A define that does not run leaves the outer variable visible.
+            "(define x 1) (func f (c) (if c (define x 2) 0)) (print (f 0) x) (func g (c) x) (print (g 0))",
+            "(define x 1) (func f (c) (while c (define x 2) (set c 0)) x) (print (f 0) (f 1) x)",
+            # Missing arguments fall through to globals of the same name.
+            "(define y 5) (define f (lambda (x y) (+ x y))) (print (f 1))",
+            "(define f (lambda (x x) x)) (f 1 2)",
+            "(define f (lambda (x) (define x 2) x)) (f 1)",
+            "(func counter (n) (lambda () (set n (+ n 1)))) (define c (counter 0)) (c) (c) (print (c))",
+            "(func f (n) (read-int n) (read-int m) (+ n m)) (print (f 0))",
+            "(define total 0) (for i 0 3 (for j 0 i (define k (* i j)) (set total (+ total k)))) (print total)",
+            "(for i 0 3 (define f (lambda () i)) (print (f)))",
+            "(func f (x) (if (> x 0) (f (- x 1)) (g))) (func g (z) y) (f 3)",
+            "(func f (x) (if (> x 0) (list 1)) 3) (f 1)",
+        ]:
+            with self.subTest(source=source):
+                self.assertSameBehaviour(source, "3\n4\n5\n6\n")
+
+    def test_declarations(self):
+        forms = parse(
+            "(define a 1) (if a (define b 2) (read-ints c d)) (func e (f) (define g 1))"
+            "(lambda (h) (define i 1)) (for j 0 (define k 3) (define l 4))"
+            "(define m n) (define o (define p q)) (read-int r)")
+        self.assertEqual([symbol_name(s) for s in declarations(forms)],
+                         ["a", "b", "c", "d", "e", "k", "m", "o", "p", "r"])
+
+    def test_scope_resolution(self):
+        outer = Scope(None, [intern("x"), intern("y")])
+        inner = Scope(outer, [intern("y")])
+        self.assertEqual(inner.resolve(intern("x")), (1, 0))
+        self.assertEqual(inner.resolve(intern("y")), (0, 0))
+        self.assertIsNone(inner.resolve(intern("z")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+
+from nelox.Expr import List
+from nelox.interpreter import Interpreter, Specialized
+from nelox.plist import PList
+from nelox.pretty_printer import pretty_program
+from nelox.specializer import Specializer, SpecializingInterpreter, specialize
+from nelox.symbols import intern, symbol_name
+from tests.differential import DifferentialTests, parse, run
+
+
+def specialized_counts(source):
+    expressions = parse(source)
+    specializer = Specializer(expressions)
+    specializer.specialize_program(expressions)
+    return ({symbol_name(symbol): count for symbol, count in specializer.calls.items()},
+            {symbol_name(symbol): count for symbol, count in specializer.specialized.items()})
+
+
+class SpecializerTest(DifferentialTests, unittest.TestCase):
+    interpreter_class = SpecializingInterpreter
+
+    def test_typed_calls(self):
+        calls, specialized = specialized_counts("""
+            (define total 0)
+            (define s "a")
+            (define l (list 1 2))
+            (for i 0 10 (set total (+ total (* i (mod i 3)))))
+            (read-line t)
+            (print (< s t) (+ s "b") (get l 1) (get s 0) (/ 5 2) (= l (reverse l)) (= l l))
+        """)
+        self.assertEqual(calls, {"+": 2, "*": 1, "mod": 1, "<": 1, "get": 2, "/": 1, "=": 2})
+        self.assertEqual(specialized, {"+": 2, "*": 1, "mod": 1, "<": 1, "get": 2, "/": 1, "=": 1})
+
+    def test_untyped_calls(self):
+        # Parameters, names bound to values of several types and non-binary calls.
+        _, specialized = specialized_counts("""
+            (func f (x) (+ x 1))
+            (define y 1)
+            (set y "a")
+            (define z (f 2))
+            (print (+ y 1) (+ z 1) (+ 1 2 3) (- 4))
+        """)
+        self.assertEqual(specialized, {})
+
+    def test_inferred_through_definitions(self):
+        program = specialize(parse("""
+            (define a (+ 1 2))
+            (define b (if (< a 3) a (* a 2)))
+            (define c (get (list "x") 0))
+            (print (+ b a) (+ c c))
+        """))
+        arguments = program[-1].elements[1:]
+        self.assertIsInstance(arguments[0], Specialized)
+        self.assertIs(arguments[0].result_type, int)
+        self.assertIsInstance(arguments[1], List)
+
+    def test_guard_falls_back(self):
+        program = specialize(parse("(define x 1) (+ x 1)"))
+        self.assertIsInstance(program[1], Specialized)
+        interpreter = Interpreter()
+        interpreter.interpret(program[:1])
+        self.assertEqual(interpreter.interpret(program[1:]), 2)
+        # Types the inference did not foresee go through the builtin.
+        interpreter.global_env.set(intern("x"), 2.5)
+        self.assertEqual(interpreter.interpret(program[1:]), 3.5)
+        interpreter.global_env.set(intern("x"), "a")
+        with self.assertRaises(TypeError):
+            interpreter.interpret(program[1:])
+
+    def test_errors_are_unchanged(self):
+        for source in ["(print (div 1 0))", "(print (/ 1 0))", '(+ 1 "a")', "(get (list 1) 5)",
+                       '(get "ab" 2)', "(define l (list 1)) (get l 1)"]:
+            with self.subTest(source=source):
+                self.assertSameBehaviour(source)
+
+    def test_rebound_builtins_are_not_specialized(self):
+        for source in ["(set + -) (print (+ 5 2))", "(func f (*) (* 2 3)) (print (f +))",
+                       "(define get 1) (print 1)"]:
+            with self.subTest(source=source):
+                self.assertEqual(specialized_counts(source)[1], {})
+                self.assertSameBehaviour(source)
+
+    def test_earlier_programs_rebind_builtins(self):
+        for name, rebinding in [("+", "(set + (lambda (a b) 0))"), ("get", "(set get (lambda (l i) 0))")]:
+            with self.subTest(rebinding=rebinding):
+                interpreter = SpecializingInterpreter()
+                tree_walker = Interpreter()
+                for source in [rebinding, '(print (+ 1 2) (get "ab" 1))']:
+                    self.assertEqual(run(interpreter, source), run(tree_walker, source))
+                self.assertEqual(interpreter.specialized[intern(name)], 0)
+
+    def test_earlier_programs_assign_globals(self):
+        interpreter = SpecializingInterpreter()
+        run(interpreter, '(define x 1) (set x "a")')
+        self.assertEqual(run(interpreter, '(print (+ x "b"))')[0], "ab\n")
+        self.assertEqual(interpreter.specialized, {})
+
+    def test_hoisted_in_loops(self):
+        source = "(define k 3) (define t 0) (for i 0 5 (set t (+ t (* k k)))) (print t)"
+        self.assertSameBehaviour(source)
+        self.assertEqual(run(SpecializingInterpreter(), source)[0], "45\n")
+
+    def test_input_is_not_modified(self):
+        expressions = parse("(define n 2) (print (+ n 1))")
+        before = pretty_program(expressions)
+        specialized = specialize(expressions)
+        self.assertEqual(pretty_program(expressions), before)
+        self.assertIs(specialized[0], expressions[0])
+
+    def test_interpreter_counts(self):
+        interpreter = SpecializingInterpreter()
+        for _ in range(2):
+            run(interpreter, "(define l (list 1)) (print (+ 1 2) (+ l (list 2)) (+ l l))")
+        self.assertEqual(interpreter.calls[intern("+")], 6)
+        self.assertEqual(interpreter.specialized[intern("+")], 4)
+        self.assertEqual(run(interpreter, "(define m (list 1)) (+ m m)")[1], PList([1, 1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import io
+import mmap
+import os
+import tempfile
+import unittest
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.parser import Parser
+from nelox.pretty_printer import pretty_program
+from nelox.scanner import Scanner
+from nelox.stream_scanner import StreamScanner, stream_tokens
+from nelox.token_type import TokenType
+
+
+def token_tuples(tokens):
+    return [(t.type, t.lexeme, t.literal, t.line) for t in tokens]
+
+
+class StreamScannerTest(unittest.TestCase):
+    def assertSameTokens(self, source, chunk_size):
+        expected = token_tuples(Scanner(source).scan_tokens())
+        from_text = token_tuples(stream_tokens(io.StringIO(source), chunk_size))
+        from_bytes = token_tuples(stream_tokens(io.BytesIO(source.encode("utf-8")), chunk_size))
+        self.assertEqual(from_text, expected)
+        self.assertEqual(from_bytes, expected)
+
+    def test_small_chunks(self):
+        source = '(define x 42) $ comment\n(print\n "multi\nline" x)\n\n$ tail'
+        for chunk_size in (1, 2, 3, 5, 8, 1024):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertSameTokens(source, chunk_size)
+
+    def test_multibyte_characters_split_across_chunks(self):
+        for chunk_size in (1, 2, 3):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertSameTokens('(print "héllo" naïve ٣٣)', chunk_size)
+
+    def test_fuzzer_programs(self):
+        fuzzer = Fuzzer()
+        programs = []
+        for _ in range(50):
+            fuzzer.env.reset()
+            programs.append(pretty_program(fuzzer.generate_program()))
+        self.assertSameTokens("\n".join(programs), 37)
+
+    def test_mmap(self):
+        source = "(define x 1)\n(print (+ x 2))\n"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "program.nelox")
+            with open(path, "wb") as f:
+                f.write(source.encode("utf-8"))
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                tokens = token_tuples(stream_tokens(mm, 4))
+        self.assertEqual(tokens, token_tuples(Scanner(source).scan_tokens()))
+
+    def test_unterminated_string(self):
+        with self.assertRaises(SyntaxError):
+            list(stream_tokens(io.StringIO('(print "hello'), 4))
+
+    def test_unexpected_character_fails_early(self):
+        class EndlessStream:
+            def read(self, size):
+                return "(a #" + " " * size
+
+        with self.assertRaises(SyntaxError):
+            list(stream_tokens(EndlessStream(), 8))
+
+    def test_parser_reads_lazily(self):
+        reads = []
+
+        class RecordingStream(io.StringIO):
+            def read(self, size=-1):
+                chunk = super().read(size)
+                reads.append(chunk)
+                return chunk
+
+        source = "(define x 1) " * 100
+        parser = Parser(StreamScanner(RecordingStream(source), 16))
+        first = parser.expression()
+        self.assertEqual(first.elements[1].name.lexeme, "x")
+        self.assertLess(sum(map(len, reads)), len(source))
+
+        rest = parser.parse()
+        self.assertEqual(len(rest), 99)
+        self.assertEqual(parser.peek().type, TokenType.EOF)
+
+
+if __name__ == "__main__":
+    unittest.main()
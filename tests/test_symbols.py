@@ -0,0 +1,40 @@
+import unittest
+
+from nelox.Expr import Variable
+from nelox.interpreter import Environment, Interpreter
+from nelox.nelox_token import Token
+from nelox.parser import Parser
+from nelox.scanner import Scanner
+from nelox.symbols import intern, symbol_name
+from nelox.token_type import TokenType
+
+
+class SymbolTest(unittest.TestCase):
+    def test_intern_is_stable(self):
+        self.assertEqual(intern("some-name"), intern("some-name"))
+        self.assertNotEqual(intern("some-name"), intern("other-name"))
+        self.assertEqual(symbol_name(intern("some-name")), "some-name")
+
+    def test_variables_carry_symbols(self):
+        expr = Parser(Scanner("(define x x)")).parse()[0]
+        self.assertEqual(expr.elements[0].symbol, intern("define"))
+        self.assertEqual(expr.elements[1].symbol, expr.elements[2].symbol)
+
+        variable = Variable(Token(TokenType.IDENTIFIER, "y", None, 0))
+        self.assertEqual(symbol_name(variable.symbol), "y")
+
+    def test_environment_errors_use_names(self):
+        env = Environment()
+        with self.assertRaisesRegex(RuntimeError, "Undefined variable 'missing'"):
+            env.get(intern("missing"))
+        env.define(intern("x"), 1)
+        with self.assertRaisesRegex(RuntimeError, "Variable 'x' is already defined"):
+            env.define(intern("x"), 2)
+
+    def test_undefined_variable_in_program(self):
+        with self.assertRaisesRegex(RuntimeError, "Undefined variable 'nope'"):
+            Interpreter().interpret(Parser(Scanner("(+ nope 1)")).parse())
+
+
+if __name__ == "__main__":
+    unittest.main()
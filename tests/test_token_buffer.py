@@ -0,0 +1,62 @@
+import unittest
+
+from dataset_generator.Fuzzer import Fuzzer
+from nelox.Expr import List, Literal, Variable
+from nelox.parser import Parser
+from nelox.pretty_printer import pretty_program
+from nelox.scanner import Scanner
+from nelox.token_buffer import TokenBuffer
+from nelox.token_type import TokenType
+
+
+def token_tuples(tokens):
+    return [(t.type, t.lexeme, t.literal, t.line) for t in tokens]
+
+
+class TokenBufferTest(unittest.TestCase):
+    def assertSameTokens(self, source):
+        expected = token_tuples(Scanner(source).scan_tokens())
+        self.assertEqual(token_tuples(TokenBuffer(source).scan_tokens()), expected)
+
+    def test_columns(self):
+        tokens = TokenBuffer('(print\n 42 "hi")').scan_tokens()
+        self.assertEqual(len(tokens), 6)
+        self.assertEqual(tokens.type(2), TokenType.NUMBER)
+        self.assertEqual(tokens.lexeme(2), "42")
+        self.assertEqual(tokens.literal(2), 42)
+        self.assertEqual(tokens.literal(3), "hi")
+        self.assertEqual(tokens.line(3), 2)
+        self.assertEqual((tokens.starts[3], tokens.ends[3]), (11, 15))
+
+    def test_same_tokens_as_scanner(self):
+        self.assertSameTokens('(add 2$comment\n 3 "multi\nline")')
+        self.assertSameTokens("(a) $ trailing\n")
+        self.assertSameTokens('(print "héllo" naïve)')
+        self.assertSameTokens("")
+
+    def test_fuzzer_programs(self):
+        fuzzer = Fuzzer()
+        for _ in range(100):
+            fuzzer.env.reset()
+            self.assertSameTokens(pretty_program(fuzzer.generate_program()))
+
+    def test_errors(self):
+        with self.assertRaises(SyntaxError):
+            TokenBuffer('"hello').scan_tokens()
+        with self.assertRaises(SyntaxError):
+            TokenBuffer('(a #)').scan_tokens()
+
+    def test_parser_consumes_buffer(self):
+        exprs = Parser(TokenBuffer("(+ 1 ($comment\n* 2 3)) (define x 42)")).parse()
+        self.assertEqual(len(exprs), 2)
+        self.assertIsInstance(exprs[0], List)
+        inner = exprs[0].elements[2]
+        self.assertIsInstance(inner.elements[0], Variable)
+        self.assertEqual(inner.elements[0].name.lexeme, "*")
+        self.assertEqual(inner.elements[0].name.line, 2)
+        self.assertIsInstance(exprs[1].elements[2], Literal)
+        self.assertEqual(exprs[1].elements[2].value, 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
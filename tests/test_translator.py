@@ -0,0 +1,111 @@
+import unittest
+
+from nelox.translator import TranslatingInterpreter, Translator, program_key, translate
+from tests.differential import DifferentialTests, load_cases, parse, run
+
+
+def is_translated(source):
+    return translate(parse(source)) is not None
+
+
+class TranslatingInterpreterTest(DifferentialTests, unittest.TestCase):
+    interpreter_class = TranslatingInterpreter
+
+    def test_test_cases_are_translated(self):
+        for name, code, _, _ in load_cases():
+            with self.subTest(case=name):
+                self.assertTrue(is_translated(code))
+
+    def test_functions_and_closures(self):
+        source = """
+            (func make-adder (n) (lambda (x) (+ x n)))
+            (define add2 (make-adder 2))
+            (func fact (n) (if (< n 2) 1 (* n (fact (- n 1)))))
+            (print (add2 40) (fact 10))
+            (define l (list 3 1 2))
+            (print (head l) (tail l) (reverse l) (push 0 l) (empty? l) (append l l))
+            (for i 0 3 (print i))
+            (print (and 1 0) (or 0 2) (and) (or))
+            (print ((lambda (a b c d) (list a b c d)) 1 2 3 4))
+            (func counter (n) (lambda () (set n (+ n 1))))
+            (define c (counter 0))
+            (c) (c)
+            (print (c))
+        """
+        self.assertTrue(is_translated(source))
+        self.assertSameBehaviour(source)
+
+    def test_evaluation_order(self):
+        source = """
+            (define x 1)
+            (print (+ x (set x 10) x) (list x (if (set x 2) x 0) x))
+            (define s 0)
+            (print (and (set s (+ s 1)) 0 (set s 100)) s (or 0 (set s 7) (set s 8)) s)
+        """
+        self.assertTrue(is_translated(source))
+        self.assertSameBehaviour(source)
+
+    def test_errors(self):
+        for source in [
+            "(print undefined)",
+            "(set y 1)",
+            "(func f () z) (f)",
+            "(func f () (set z 1)) (f)",
+            "(define f (lambda (x y) (+ x y))) (f 1)",
+            "(define y 5) (define f (lambda (x y) (+ x y))) (print (f 1))",
+            "(print (/ 1 0))",
+            "(head (list))",
+            "(read-int n)",
+        ]:
+            with self.subTest(source=source):
+                self.assertSameBehaviour(source, "x\n")
+
+    def test_unsupported_programs_fall_back(self):
+        for source in [
+            "(define x 1) (func f (c) (if c (define x 2) 0)) (print (f 0) x)",
+            "(define x 1) (define x 2)",
+            "(define print 1)",
+            "(for i 0 3 (define f (lambda () i)) (print (f)))",
+            "(define x 1) (print _)",
+            "(func f (x) (define x 2) x) (f 1)",
+        ]:
+            with self.subTest(source=source):
+                self.assertFalse(is_translated(source))
+                interpreter = TranslatingInterpreter()
+                run(interpreter, source)
+                self.assertFalse(interpreter.translated)
+                self.assertSameBehaviour(source)
+
+    def test_operators_are_inlined_unless_shadowed(self):
+        self.assertIn("(1 + 2)", Translator().translate(parse("(print (+ 1 2))")))
+        source = "(func f (+) (+ 1 2)) (print (f -))"
+        self.assertNotIn("(1 + 2)", Translator().translate(parse(source)))
+        self.assertSameBehaviour(source)
+        source = "(set + -) (print (+ 5 2))"
+        self.assertSameBehaviour(source)
+
+    def test_translations_are_cached(self):
+        first = parse("(define x 1) (print (+ x 1))")
+        second = parse("(define x 1)  (print (+ x 1))")
+        self.assertEqual(program_key(first), program_key(second))
+        self.assertNotEqual(program_key(first), program_key(parse("(define x 1) (print (+ x 2))")))
+        self.assertIs(translate(first), translate(second))
+
+    def test_later_programs_share_globals(self):
+        interpreter = TranslatingInterpreter()
+        run(interpreter, "(define x 1) (func f () (set x (+ x 1)) x)")
+        self.assertTrue(interpreter.translated)
+        self.assertEqual(run(interpreter, "(print (f) x) (set x 10) (print (f))"), ("2 2\n11\n", None))
+        self.assertFalse(interpreter.translated)
+        # A known divergence: f inlined +, which a later assignment does not reach.
+        self.assertEqual(run(interpreter, "(set + -) (f)")[1], 12)
+
+    def test_deep_recursion(self):
+        self.assertEqual(run(TranslatingInterpreter(), """
+            (func count (n) (if (= n 0) 0 (+ 1 (count (- n 1)))))
+            (print (count 500))
+        """)[0], "500\n")
+
+
+if __name__ == "__main__":
+    unittest.main()